@@ -1,12 +1,13 @@
 # api/auth_route.py
 
-from fastapi import APIRouter, Response, Request, HTTPException, status
+from fastapi import APIRouter, Depends, Response, Request, HTTPException, status
 from models.login import UserSignup, UserLogin, UserResponse
-from security import get_password_hash, verify_password
+from security import get_password_hash, verify_and_update_password
 from auth_token import create_access_token, create_refresh_token
-from db.user_crud import get_user_by_email, create_user
+from db.user_crud import get_user_by_email, create_user, update_password_hash
 from db.database import tokens_collection
 from utils.getuser import get_current_user
+from utils.auth_cache import auth_cache
 from config import settings
 from datetime import datetime, timedelta
 
@@ -14,10 +15,10 @@ router = APIRouter()
 
 @router.post("/signup", status_code=status.HTTP_201_CREATED)
 async def signup(user: UserSignup, response: Response):
-    if get_user_by_email(user.email):
+    if await get_user_by_email(user.email):
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash(user.password)
     user_doc = {
         "email":          user.email,
         "name":           user.name,
@@ -25,13 +26,13 @@ async def signup(user: UserSignup, response: Response):
         "created_at":     datetime.utcnow(),
         "is_active":      True
     }
-    user_id = create_user(user_doc)
+    user_id = await create_user(user_doc)
 
     access_token  = create_access_token(
         {"sub": user.email},
         timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
-    refresh_token = create_refresh_token(user.email)
+    refresh_token = await create_refresh_token(user.email)
 
     # set cookies
     response.set_cookie(
@@ -64,15 +65,20 @@ async def signup(user: UserSignup, response: Response):
 
 @router.post("/login")
 async def login(user: UserLogin, response: Response):
-    db_user = get_user_by_email(user.email)
-    if not db_user or not verify_password(user.password, db_user["hashed_password"]):
+    db_user = await get_user_by_email(user.email)
+    if not db_user:
         raise HTTPException(status_code=401, detail="Incorrect email or password")
+    valid, new_hash = await verify_and_update_password(user.password, db_user["hashed_password"])
+    if not valid:
+        raise HTTPException(status_code=401, detail="Incorrect email or password")
+    if new_hash:
+        await update_password_hash(user.email, new_hash)
 
     access_token  = create_access_token(
         {"sub": user.email},
         timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
-    refresh_token = create_refresh_token(user.email)
+    refresh_token = await create_refresh_token(user.email)
 
     response.set_cookie(
         key="access_token",
@@ -108,10 +114,10 @@ async def refresh_token(response: Response, request: Request):
     if not refresh_token:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    token_doc = tokens_collection.find_one({"token": refresh_token})
+    token_doc = await tokens_collection.find_one({"token": refresh_token})
     if not token_doc or token_doc["expires_at"] < datetime.utcnow():
         # if expired you can also delete it here
-        tokens_collection.delete_one({"token": refresh_token})
+        await tokens_collection.delete_one({"token": refresh_token})
         raise HTTPException(status_code=401, detail="Refresh token invalid or expired")
 
     # issue new access token
@@ -135,7 +141,12 @@ async def logout(response: Response, request: Request):
     # delete refresh token from database
     refresh_token = request.cookies.get("refresh_token")
     if refresh_token:
-        tokens_collection.delete_one({"token": refresh_token})
+        await tokens_collection.delete_one({"token": refresh_token})
+
+    # stop accepting the access token still held by this client
+    access_token = request.cookies.get("access_token")
+    if access_token:
+        auth_cache.revoke(access_token)
 
     # clear cookies
     response.delete_cookie("access_token")
@@ -144,8 +155,7 @@ async def logout(response: Response, request: Request):
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(request: Request):
-    user = get_current_user(request)   # this will raise 401 if no/invalid access_token
+async def get_current_user_info(user: dict = Depends(get_current_user)):
     return UserResponse(
         id=str(user["_id"]),
         email=user["email"],
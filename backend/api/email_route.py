@@ -45,7 +45,10 @@ async def send_invites(
     job_id:     str        = Body(..., embed=True),
     resume_ids: List[str] = Body(..., embed=True),
 ):
-    job = job_profiles.find_one({"_id": ObjectId(job_id)})
+    job = await job_profiles.find_one(
+        {"_id": ObjectId(job_id)},
+        {"scoredResumes.resumeId": 1, "scoredResumes.name": 1, "scoredResumes.email": 1},
+    )
     if not job:
         raise HTTPException(404, "Job not found")
     if not resume_ids:
@@ -114,7 +117,7 @@ class ScheduleRequest(BaseModel):
 @router.post("/schedule-interview")
 async def schedule_interview(req: ScheduleRequest):
     # 1. validate job exists
-    job = job_profiles.find_one({"_id": ObjectId(req.job_id)})
+    job = await job_profiles.find_one({"_id": ObjectId(req.job_id)}, {"_id": 1})
     if not job:
         raise HTTPException(404, "Job not found")
 
@@ -123,7 +126,7 @@ async def schedule_interview(req: ScheduleRequest):
         raise HTTPException(400, "start_time must be before end_time")
 
     # 3. update each scoredResume entry with an interview_schedule sub-doc
-    result = job_profiles.update_one(
+    result = await job_profiles.update_one(
         {"_id": ObjectId(req.job_id)},
         {
             "$set": {
@@ -1,15 +1,24 @@
 # app/api/interview.py
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, Query
+from starlette.websockets import WebSocketState
 from datetime import datetime
 from bson import ObjectId
 import asyncio
 import logging
+from typing import Awaitable, Callable
 
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
 
-from db.database import job_profiles, interview_scores, interview_sessions
+from db.database import job_profiles, interview_sessions
+from db.resume_store import get_resume_text
 from utils.getuser import get_current_user
+from utils.llm_provider import get_chat_model
+from utils.llm import estimate_tokens
+from utils.interview_context import InterviewContext, clip_tokens
+from utils.session_writer import SessionWriter
+from utils.telemetry import TELEMETRY_TYPES, TelemetryBuffer
+from utils.proctoring import ProctoringAggregator
+from config import settings
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -65,7 +74,19 @@ class InterviewSession:
         ]
         
         self.current_stage = 0
-        self.llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0.7)
+        self.pending: list[asyncio.Task] = []
+        self.finalizer: asyncio.Task | None = None
+        self.llm = get_chat_model(temperature=0.7)
+        self.context = InterviewContext(
+            budget=settings.INTERVIEW_PROMPT_BUDGET,
+            keep_turns=settings.INTERVIEW_VERBATIM_TURNS,
+            summary_tokens=settings.INTERVIEW_SUMMARY_TOKENS,
+        )
+        self.proctoring = ProctoringAggregator(
+            grid=settings.PROCTORING_HEATMAP_GRID,
+            window_ms=settings.PROCTORING_FIXATION_WINDOW_MS,
+            fixation_px=settings.PROCTORING_FIXATION_PX,
+        )
 
     def build_enhanced_prompt(self) -> list[HumanMessage | SystemMessage]:
         current_stage_info = self.interview_stages[self.current_stage]
@@ -79,18 +100,21 @@ class InterviewSession:
         if self.conversation_history:
             last_qa = self.conversation_history[-1]
             recent_context = f"\nLast Q&A for context:\nQ: {last_qa['question']}\nA: {last_qa['answer'][:200]}..."
+
+        # The job description and resume may take a quarter of the budget each
+        doc_tokens = settings.INTERVIEW_PROMPT_BUDGET // 4
         
-        context_msg = SystemMessage(content=f"""
+        context = f"""
 INTERVIEW CONTEXT:
 Progress: {progress} questions completed
 Current Stage: {stage_name} ({stage_purpose})
 Question Style: {question_style}
 
 JOB REQUIREMENTS:
-{self.job_description}
+{clip_tokens(self.job_description, doc_tokens)}
 
 CANDIDATE BACKGROUND:
-{self.resume_text}
+{clip_tokens(self.resume_text, doc_tokens)}
 
 GUIDELINES:
 - Ask ONE focused question that builds on previous answers
@@ -103,20 +127,29 @@ GUIDELINES:
 - Avoid yes/no questions - seek detailed responses
 
 {recent_context}
-""")
-        
-        msgs = [SYSTEM_MESSAGE, context_msg]
-        
-        for i, turn in enumerate(self.conversation_history):
-            msgs.append(HumanMessage(content=f"Previous Question {i+1}: {turn['question']}"))
-            msgs.append(HumanMessage(content=f"Candidate Response {i+1}: {turn['answer']}"))
+"""
         
         instruction = f"""
 Based on the {stage_name} stage focus and the conversation so far, ask your next question.
 If this is a follow-up, reference something specific from their last answer.
 Question {self.question_count + 1} of {self.max_questions}:
 """
+
+        # Older turns come in as a running summary, recent ones verbatim
+        used = sum(estimate_tokens(t) for t in (SYSTEM_MESSAGE.content, context, instruction))
+        summary, turns = self.context.compose(self.conversation_history, used)
+        if summary:
+            context += f"\nEARLIER IN THIS INTERVIEW (summary):\n{summary}\n"
+
+        msgs = [SYSTEM_MESSAGE, SystemMessage(content=context)]
+        
+        first = len(self.conversation_history) - len(turns)
+        for i, turn in enumerate(turns, start=first):
+            msgs.append(HumanMessage(content=f"Previous Question {i+1}: {turn['question']}"))
+            msgs.append(HumanMessage(content=f"Candidate Response {i+1}: {turn['answer']}"))
+        
         msgs.append(HumanMessage(content=instruction))
+        self.context.record(sum(estimate_tokens(m.content) for m in msgs))
         return msgs
 
     def create_personalized_opening(self) -> str:
@@ -159,15 +192,32 @@ Question {self.question_count + 1} of {self.max_questions}:
         )
         self.current_stage = expected_stage
 
-    async def get_response(self, candidate_input: str = None) -> str:
+    async def get_response(
+        self,
+        candidate_input: str = None,
+        on_delta: Callable[[str], Awaitable[None]] | None = None,
+    ) -> str:
+        """
+        Generate the next question. With `on_delta`, the LLM reply is
+        streamed and each text fragment is passed to it as it arrives; the
+        returned (refined) question is the authoritative final text.
+        """
         if self.question_count == 0:
             opening = self.create_personalized_opening()
             self.question_count += 1
             return opening
         
         try:
-            llm_out = await self.llm.ainvoke(self.build_enhanced_prompt())
-            question = self.refine_question(llm_out.content.strip(), candidate_input)
+            if on_delta:
+                parts = []
+                async for chunk in self.llm.astream(self.build_enhanced_prompt()):
+                    if chunk.content:
+                        parts.append(chunk.content)
+                        await on_delta(chunk.content)
+                raw = "".join(parts)
+            else:
+                raw = (await self.llm.ainvoke(self.build_enhanced_prompt())).content
+            question = self.refine_question(raw.strip(), candidate_input)
         except Exception as e:
             logger.error(f"LLM error: {e}")
             question = self.get_fallback_question()
@@ -176,8 +226,8 @@ Question {self.question_count + 1} of {self.max_questions}:
         self.advance_stage()
         return question
 
-    async def score_answer(self, question: str, answer: str) -> int | None:
-        current_stage_info = self.interview_stages[self.current_stage]
+    async def score_answer(self, question: str, answer: str, stage: int | None = None) -> int | None:
+        current_stage_info = self.interview_stages[self.current_stage if stage is None else stage]
         scoring_prompt = f"""
 You are evaluating a candidate's interview response. Consider the following:
 
@@ -208,28 +258,123 @@ Respond with only the number.
             logger.warning(f"Scoring failed: {e}")
             return None
 
-    def add_to_history(self, question: str, answer: str, score: int | None):
-        self.conversation_history.append({
+    def add_to_history(self, question: str, answer: str, score: int | None) -> dict:
+        turn = {
             "question": question,
             "answer": answer,
             "score": score,
             "stage": self.interview_stages[self.current_stage]["name"],
             "question_number": self.question_count
-        })
+        }
+        self.conversation_history.append(turn)
+        self.context.update(self.conversation_history)
+        return turn
+
+    def track(self, task: asyncio.Task) -> asyncio.Task:
+        """Remember background turn work that must land before finalization."""
+        self.pending.append(task)
+        return task
+
+    async def settle(self):
+        """Wait for every background scoring/persistence task."""
+        while self.pending:
+            tasks, self.pending = self.pending, []
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _is_open(websocket: WebSocket) -> bool:
+    return (websocket.client_state == WebSocketState.CONNECTED
+            and websocket.application_state == WebSocketState.CONNECTED)
+
+
+async def _claim_finalization(session_id) -> bool:
+    """
+    Atomically mark the session as finalizing; False if it already was.
+    `ended_at` is only written with the results, so a session never looks
+    finished without them.
+    """
+    result = await interview_sessions.update_one(
+        {"_id": session_id, "finalizing": {"$exists": False}},
+        {"$set": {"finalizing": datetime.utcnow()}}
+    )
+    return result.modified_count == 1
+
+
+async def _release_finalization(session_id) -> None:
+    """Drop a failed claim so a later finalization can retry."""
+    await interview_sessions.update_one(
+        {"_id": session_id, "finalized_at": {"$exists": False}},
+        {"$unset": {"finalizing": ""}}
+    )
 
 
 async def finalize_interview(session: InterviewSession,
-                             session_id,
+                             writer: SessionWriter,
                              websocket: WebSocket):
-    """Compute final score & summary, persist, send wrap-up, and close WS."""
-    doc = interview_sessions.find_one({"_id": session_id})
-    scores = [h["score"] for h in doc.get("history", []) if h.get("score") is not None]
+    """Compute final score & summary, persist, and send them if the WS is still open."""
+    # Every turn is scored and flushed first; the results below come from
+    # the in-memory history rather than a re-read of the session.
+    await session.settle()
+    await writer.close()
+
+    session_id = writer.session_id
+    ended_at   = datetime.utcnow()
+    if not await _claim_finalization(session_id):
+        logger.info(f"Interview session {session_id} is already finalized")
+        return
+    try:
+        await writer.write_scores(session.conversation_history)
+        results = await _final_results(session)
+        # Persist final results in interview_sessions
+        await interview_sessions.update_one(
+            {"_id": session_id},
+            {"$set": {
+                **results,
+                "proctoring":      session.proctoring.summary(),
+                "ended_at":        ended_at,
+                "finalized_at":    datetime.utcnow()
+            }}
+        )
+    except Exception:
+        await _release_finalization(session_id)
+        raise
+
+    # Mark the resume as interviewed
+    await job_profiles.update_one(
+        {"_id": ObjectId(writer.job_id), "scoredResumes.resumeId": writer.resume_id},
+        {"$set": {
+            "scoredResumes.$.interviewDone": True,
+            "scoredResumes.$.sessionId":     session_id
+        }}
+    )
+
+    # Send the assessment if the candidate is still connected
+    if _is_open(websocket):
+        try:
+            await websocket.send_json({
+                "type":            "assessment",
+                "text":            "Here's your comprehensive assessment:",
+                **results,
+            })
+            await websocket.close()
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+
+
+async def _final_results(session: InterviewSession) -> dict:
+    """
+    Average score, stage breakdown, summary and recommendation of a
+    finished interview. A failed LLM call yields fallback text rather than
+    an exception, so the results can always be written.
+    """
+    history = session.conversation_history
+    scores = [h["score"] for h in history if h.get("score") is not None]
     avg = sum(scores) / len(scores) if scores else None
 
     if avg is not None:
         # Build stage-by-stage breakdown
         stage_breakdown: dict[str, list[int]] = {}
-        for item in doc.get("history", []):
+        for item in history:
             stage = item.get("stage", "unknown")
             if item.get("score") is not None:
                 stage_breakdown.setdefault(stage, []).append(item["score"])
@@ -239,7 +384,6 @@ async def finalize_interview(session: InterviewSession,
             if stg_scores:
                 s_avg = sum(stg_scores) / len(stg_scores)
                 stage_summary += f"{stg}: {s_avg:.1f}/10, "
-        # Generate summary
         summary_prompt = f"""
 The candidate completed an interview with an overall average score of {avg:.1f}/10.
 
@@ -254,63 +398,93 @@ Please provide a comprehensive but concise summary covering:
 
 Keep it professional and constructive.
 """
-        summary = (await session.llm.ainvoke(summary_prompt)).content
-    else:
-        summary = "Not enough scored answers to generate a comprehensive summary."
-        stage_breakdown = None
+        rec_prompt = f"""
+The candidate's overall average interview score is {avg:.1f}/10.
+
+Stage-by-stage performance:
+{stage_summary}
 
-    # === New: Ask the LLM for a direct recommendation ===
-    rec_prompt = f"""
-Based on the candidate’s overall average score of {avg:.1f}/10 and the stage-by-stage
-summary provided, would you recommend advancing this candidate to the next stage?
+Would you recommend advancing this candidate to the next stage?
 Respond with EXACTLY one word: “Yes” or “No”, and then in 1–2 sentences justify your choice.
 """
-    recommendation = (await session.llm.ainvoke(rec_prompt)).content.strip()
-
-    # Persist final results in interview_sessions
-    interview_sessions.update_one(
-        {"_id": session_id},
-        {"$set": {
-            "ended_at":        datetime.utcnow(),
-            "average_score":   avg,
-            "summary":         summary,
-            "stage_breakdown": stage_breakdown,
-            "recommendation":  recommendation
-        }}
-    )
-
-    # Mark the resume as interviewed
-    job_profiles.update_one(
-        {"_id": ObjectId(doc["job_id"]), "scoredResumes.resumeId": doc["resume_id"]},
-        {"$set": {
-            "scoredResumes.$.interviewDone": True,
-            "scoredResumes.$.sessionId":     session_id
-        }}
-    )
+        # Summary and recommendation are independent; generate them together
+        summary_reply, rec_reply = await asyncio.gather(
+            session.llm.ainvoke(summary_prompt),
+            session.llm.ainvoke(rec_prompt),
+            return_exceptions=True,
+        )
+        if isinstance(summary_reply, Exception):
+            logger.warning(f"Interview summary failed: {summary_reply}")
+            summary = f"Summary unavailable. Average score {avg:.1f}/10; by stage: {stage_summary.rstrip(', ')}."
+        else:
+            summary = summary_reply.content
+        if isinstance(rec_reply, Exception):
+            logger.warning(f"Interview recommendation failed: {rec_reply}")
+            recommendation = "No recommendation: the assessment could not be generated."
+        else:
+            recommendation = rec_reply.content.strip()
+    else:
+        summary = "Not enough scored answers to generate a comprehensive summary."
+        recommendation = "No recommendation: not enough scored answers."
+        stage_breakdown = None
 
-    # Send wrap-up over WebSocket
-    await websocket.send_json({
-        "text":            "⏰ Interview completed! Here's your comprehensive assessment:",
-        "summary":         summary,
+    return {
         "average_score":   avg,
+        "summary":         summary,
         "stage_breakdown": stage_breakdown,
-        "recommendation":  recommendation
-    })
-    await websocket.close()
+        "recommendation":  recommendation,
+    }
 
 
-async def finalize_after_10min(session, session_id, websocket):
+async def _run_finalization(session: InterviewSession, writer: SessionWriter, websocket: WebSocket):
+    try:
+        await finalize_interview(session, writer, websocket)
+    except Exception:
+        logger.exception(f"Finalizing interview session {writer.session_id} failed")
+
+
+async def end_interview(session: InterviewSession,
+                        writer: SessionWriter,
+                        websocket: WebSocket) -> asyncio.Task:
+    """
+    Tell the candidate the interview is over and start its finalization in
+    the background. Safe to call any number of times: the first call
+    starts the task and later ones return it.
+    """
+    if session.finalizer is None:
+        session.finalizer = asyncio.create_task(_run_finalization(session, writer, websocket))
+        if _is_open(websocket):
+            try:
+                await websocket.send_json({
+                    "type": "complete",
+                    "text": "⏰ Interview complete! Thank you. Your assessment is being prepared.",
+                })
+            except (WebSocketDisconnect, RuntimeError):
+                pass
+    return session.finalizer
+
+
+async def finalize_after_10min(session, writer, websocket):
     try:
         await asyncio.sleep(600)  # 10 minutes
-        await finalize_interview(session, session_id, websocket)
+        await end_interview(session, writer, websocket)
     except asyncio.CancelledError:
         pass
 
 
 @router.websocket("/ws/interview/{job_id}/{resume_id}")
-async def interview_ws(websocket: WebSocket, job_id: str, resume_id: str):
+async def interview_ws(websocket: WebSocket, job_id: str, resume_id: str, stream: bool = False):
+    """
+    Interview protocol: the server sends one final frame per question
+    ({text, question_count, ...}). Clients connecting with ?stream=1 also
+    get {type: "question_delta", delta, question_number} frames while a
+    question is generated; the final frame still carries the full text.
+    """
     # 1) Fetch job & candidate entry
-    job = job_profiles.find_one({"_id": ObjectId(job_id)})
+    job = await job_profiles.find_one(
+        {"_id": ObjectId(job_id)},
+        {"description": 1, "scoredResumes": {"$elemMatch": {"resumeId": resume_id}}},
+    )
     if not job:
         await websocket.accept()
         await websocket.send_json({"error": "Job not found"})
@@ -350,6 +524,13 @@ async def interview_ws(websocket: WebSocket, job_id: str, resume_id: str):
         await websocket.close()
         return
 
+    resume_text = await get_resume_text(resume_id)
+    if resume_text is None:
+        await websocket.accept()
+        await websocket.send_json({"error": "Resume text not found"})
+        await websocket.close()
+        return
+
     # 3) Accept WS and create session doc
     await websocket.accept()
     sess_doc = {
@@ -361,14 +542,43 @@ async def interview_ws(websocket: WebSocket, job_id: str, resume_id: str):
         "history":          [],
         "stage_progression": []
     }
-    session_id = interview_sessions.insert_one(sess_doc).inserted_id
-    session = InterviewSession(job["description"], entry["text"], max_questions=8)
+    session_id = (await interview_sessions.insert_one(sess_doc)).inserted_id
+    session = InterviewSession(job["description"], resume_text, max_questions=8)
+    writer = SessionWriter(session_id, job_id, resume_id, settings.INTERVIEW_FLUSH_INTERVAL)
+    writer.start()
+    telemetry = TelemetryBuffer(
+        session_id,
+        settings.TELEMETRY_BUCKET_SECONDS,
+        settings.TELEMETRY_FLUSH_INTERVAL,
+        settings.TELEMETRY_MAX_BUFFER,
+        aggregator=session.proctoring,
+    )
+    telemetry.start()
 
     # 4) Auto-finalize timer
-    auto_task = asyncio.create_task(finalize_after_10min(session, session_id, websocket))
+    auto_task = asyncio.create_task(finalize_after_10min(session, writer, websocket))
+
+    async def record_turn(turn: dict, stage: int, previous: asyncio.Task | None):
+        turn["score"] = await session.score_answer(turn["question"], turn["answer"], stage)
+        if previous:
+            # keep history writes in turn order
+            await asyncio.gather(previous, return_exceptions=True)
+        # one write per turn: history and stage_progression together
+        writer.add_turn(turn)
+        await writer.flush()
+
+    persisted: asyncio.Task | None = None
+
+    async def send_delta(delta: str):
+        await websocket.send_json({
+            "type":            "question_delta",
+            "delta":           delta,
+            "question_number": session.question_count + 1,
+        })
 
     async def send_response(text: str):
         await websocket.send_json({
+            "type":            "question",
             "text":            text,
             "question_count":  session.question_count,
             "max_questions":   session.max_questions,
@@ -384,19 +594,18 @@ async def interview_ws(websocket: WebSocket, job_id: str, resume_id: str):
         # Main loop
         while True:
             msg = await websocket.receive_json()
+            if session.finalizer:
+                # time limit reached; the assessment is on its way
+                break
 
-            # Telemetry events
-            if msg.get("type") in {"tab-switch", "gaze", "object-detect", "not-looking"}:
-                field = {
-                    "tab-switch": "tabEvents",
-                    "gaze": "gazeData",
-                    "object-detect": "objectEvents",
-                    "not-looking": "warningEvents"
-                }[msg["type"]]
-                interview_sessions.update_one(
-                    {"_id": session_id},
-                    {"$push": {field: {**msg, "timestamp": datetime.utcnow()}}}
-                )
+            # Telemetry: buffered and bulk-written to proctoring_telemetry
+            if msg.get("type") in TELEMETRY_TYPES:
+                telemetry.add(msg)
+                if telemetry.full:
+                    try:
+                        await telemetry.flush()
+                    except Exception as e:
+                        logger.warning(f"Telemetry flush of session {session_id} failed: {e}")
                 continue
 
             answer = msg.get("answer", "").strip()
@@ -406,44 +615,19 @@ async def interview_ws(websocket: WebSocket, job_id: str, resume_id: str):
             if answer.lower() in {"quit", "exit", "end interview"}:
                 break
 
-            # Score & record
-            score = await session.score_answer(last_q, answer)
-            interview_scores.insert_one({
-                "job_id":         job_id,
-                "resume_id":      resume_id,
-                "question_number":session.question_count,
-                "question":       last_q,
-                "answer":         answer,
-                "score":          score,
-                "timestamp":      datetime.utcnow(),
-                "stage":          session.interview_stages[session.current_stage]["name"]
-            })
-            session.add_to_history(last_q, answer, score)
-            interview_sessions.update_one(
-                {"_id": session_id},
-                {"$push": {"history": {
-                    "question_number":session.question_count,
-                    "question":       last_q,
-                    "answer":         answer,
-                    "score":          score,
-                    "timestamp":      datetime.utcnow(),
-                    "stage":          session.interview_stages[session.current_stage]["name"]
-                }}}
-            )
-            interview_sessions.update_one(
-                {"_id": session_id},
-                {"$push": {"stage_progression": {
-                    "stage":          session.interview_stages[session.current_stage]["name"],
-                    "question_number":session.question_count,
-                    "timestamp":      datetime.utcnow()
-                }}}
-            )
+            # Record the turn now; score & persist it in the background
+            # while the next question is generated
+            turn = session.add_to_history(last_q, answer, None)
+            turn["timestamp"] = datetime.utcnow()
+            persisted = session.track(asyncio.create_task(
+                record_turn(turn, session.current_stage, persisted)
+            ))
 
             # Next question with retry
             backoff = 1
             for attempt in range(3):
                 try:
-                    last_q = await session.get_response(answer)
+                    last_q = await session.get_response(answer, send_delta if stream else None)
                     break
                 except Exception as e:
                     logger.error(f"Error generating question: {e}")
@@ -460,16 +644,26 @@ async def interview_ws(websocket: WebSocket, job_id: str, resume_id: str):
     except WebSocketDisconnect:
         return
     finally:
+        await session.context.aclose()
+        try:
+            await telemetry.close()
+        except Exception as e:
+            logger.warning(f"Final telemetry flush of session {session_id} failed: {e}")
         if not auto_task.done():
             auto_task.cancel()
-            await finalize_interview(session, session_id, websocket)
-        await websocket.close()
+        finalizer = await end_interview(session, writer, websocket)
+        if _is_open(websocket):
+            # Keep the socket up until the assessment has been sent; the
+            # finalizer itself is not cancelled if this handler is.
+            await asyncio.wait([finalizer])
+        if _is_open(websocket):
+            await websocket.close()
 
 
 @router.get("/session/{session_id}")
 async def get_interview_session(session_id: str):
     """Fetch the full interview session document by its ID."""
-    doc = interview_sessions.find_one({"_id": ObjectId(session_id)})
+    doc = await interview_sessions.find_one({"_id": ObjectId(session_id)})
     if not doc:
         raise HTTPException(status_code=404, detail="Interview session not found")
     doc["_id"] = str(doc["_id"])
@@ -478,6 +672,25 @@ async def get_interview_session(session_id: str):
     return {"session": doc}
 
 
+@router.get("/session/{session_id}/proctoring")
+async def get_proctoring_summary(session_id: str):
+    """
+    Proctoring summary of a finished session (off-screen ratio, fixation
+    dispersion, events per minute, gaze heatmap), without its history or
+    raw telemetry. `proctoring` is null while the interview is running.
+    """
+    doc = await interview_sessions.find_one(
+        {"_id": ObjectId(session_id)}, {"proctoring": 1, "ended_at": 1}
+    )
+    if not doc:
+        raise HTTPException(status_code=404, detail="Interview session not found")
+    return {
+        "session_id": session_id,
+        "ended_at":   doc.get("ended_at"),
+        "proctoring": doc.get("proctoring"),
+    }
+
+
 @router.post("/admin/reset-interview/{session_id}")
 async def reset_interview(
     session_id: str,
@@ -487,8 +700,8 @@ async def reset_interview(
     Deletes the in-flight session and clears the interviewDone flag
     so the candidate can be re-interviewed.
     """
-    interview_sessions.delete_one({"_id": ObjectId(session_id)})
-    job_profiles.update_one(
+    await interview_sessions.delete_one({"_id": ObjectId(session_id)})
+    await job_profiles.update_one(
         { "scoredResumes.sessionId": ObjectId(session_id) },
         { "$unset": {
             "scoredResumes.$.interviewDone": "",
@@ -512,7 +725,7 @@ async def get_interview_analytics(job_id: str):
         }},
         {"$sort": {"_id": 1}}
     ]
-    stage_analytics = list(interview_sessions.aggregate(pipeline))
+    stage_analytics = await interview_sessions.aggregate(pipeline).to_list(None)
     overall_pipeline = [
         {"$match": {"job_id": job_id}},
         {"$group": {
@@ -522,25 +735,26 @@ async def get_interview_analytics(job_id: str):
             "completion_rate": {"$avg": {"$cond": [{"$ne": ["$ended_at", None]}, 1, 0]}}
         }}
     ]
-    overall_stats = list(interview_sessions.aggregate(overall_pipeline))
+    overall_stats = await interview_sessions.aggregate(overall_pipeline).to_list(None)
     return {
         "stage_analytics": stage_analytics,
         "overall_stats": overall_stats[0] if overall_stats else None,
         "job_id": job_id
     }
 @router.get("/session/by-resume/{resume_id}")
-async def get_full_session_by_resume(resume_id: str):
+async def get_full_session_by_resume(resume_id: str, job_id: str = Query(...)):
     """
-    Fetch the latest interview session for a given resume_id,
+    Fetch the latest interview session for a given resume_id in job_id,
     including the full Q&A history, average score, recommendation, and summary.
+    Identical uploads share one resume_id across jobs, so the job is required.
     """
-    # Find the most recent session for this resume
-    doc = interview_sessions.find_one(
-        {"resume_id": resume_id},
+    # Find the most recent session for this resume in this job
+    doc = await interview_sessions.find_one(
+        {"resume_id": resume_id, "job_id": job_id},
         sort=[("started_at", -1)]
     )
     if not doc:
-        raise HTTPException(status_code=404, detail="No interview session found for that resume_id")
+        raise HTTPException(status_code=404, detail="No interview session found for that resume_id and job_id")
 
     # Convert ObjectId timestamps to ISO strings
     # and ensure all fields are JSON-serializable
@@ -556,6 +770,7 @@ async def get_full_session_by_resume(resume_id: str):
         "recommendation":   doc.get("recommendation"),
         "summary":          doc.get("summary"),
         "stage_breakdown":  doc.get("stage_breakdown"),
+        "proctoring":       doc.get("proctoring"),
         "history": [
             {
                 "question_number": h["question_number"],
@@ -1,73 +1,130 @@
 # api/jobs_route.py
 
-import re
-import fitz                      # PyMuPDF
-from typing        import Dict, Any, List, Tuple, Optional
+import json
+import base64
+import asyncio
+from typing        import Callable, Dict, Any, List, Optional, Tuple
 from datetime      import datetime
-from fastapi       import APIRouter, Depends, Form, File, UploadFile, HTTPException, status
-from models.jobs     import JobSummary, ResumeSummary
-from utils.pdf_parser import extract_pdf_text
+from fastapi       import APIRouter, Depends, Form, File, UploadFile, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from config          import settings
+from models.jobs     import JobSummary, ResumeSummary, CandidateSummary, CandidatePage
 from utils.getuser    import get_current_user
-from utils.llm        import llm_score
-from db.vector_db     import index_resume_chunks, index_job_description_chunks
-from db.database      import fs, job_profiles
+from utils.ingest     import stage_upload
+from utils.ingest_worker import wake_worker
+from db.ingest_queue  import enqueue_resumes, enqueue_description, job_progress
+from db.database      import job_profiles
+from db.resume_store  import get_evaluations
 from bson import ObjectId
 
 router = APIRouter()
 
-# plain-text email regex
-EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
 
-async def read_and_parse(file: UploadFile) -> Tuple[str, str, bytes, Optional[str]]:
-    """
-    Returns:
-      filename:         the original filename
-      text:             visible text from the PDF
-      raw:              raw PDF bytes
-      embedded_email:   email from link annotation OR from visible-text OR None
-    """
-    raw = await file.read()
-    if not raw:
-        raise HTTPException(status.HTTP_400_BAD_REQUEST, f"'{file.filename}' is empty")
+async def _get_owned_job(job_id: str, current_user: dict, projection: Optional[dict] = None) -> dict:
+    try:
+        job_obj_id = ObjectId(job_id)
+    except Exception:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid job ID")
+
+    job = await job_profiles.find_one({"_id": job_obj_id}, projection)
+    if not job:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Job not found")
+
+    if job["recruiterId"] != current_user["_id"]:
+        raise HTTPException(status.HTTP_403_FORBIDDEN, "Not authorized to access this job")
+    return job
+
+
+def _cascade_config(top_k: Optional[int], threshold: Optional[float]) -> Optional[Dict[str, Any]]:
+    """Per-job cascade scoring settings from the form fields, if any were sent."""
+    if top_k is not None and top_k < 0:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "cascade_top_k must be >= 0")
+    if threshold is not None and not -1.0 <= threshold <= 1.0:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "cascade_threshold must be between -1 and 1")
+    config = {}
+    if top_k is not None:
+        config["topK"] = top_k
+    if threshold is not None:
+        config["threshold"] = threshold
+    return config or None
+
+
+# scoredResumes fields served by the listing endpoints
+_RESUME_FIELDS = (
+    "resumeId", "filename", "name", "email", "score",
+    "similarity", "preScreened", "interviewDone", "sessionId",
+)
+
+# per-job resume count and mean score, as projection expressions;
+# pre-screened resumes have no score yet and $avg skips them
+_RESUME_STATS = {
+    "resumeCount":  {"$size": {"$ifNull": ["$scoredResumes", []]}},
+    "averageScore": {"$avg": "$scoredResumes.score"},
+}
+
+
+def _resume_summary(r: dict) -> ResumeSummary:
+    return ResumeSummary(
+        resumeId=r["resumeId"],
+        filename=r["filename"],
+        name=r["name"],
+        email=r["email"],
+        score=r.get("score"),
+        similarity=r.get("similarity"),
+        preScreened=r.get("preScreened", False),
+        interviewDone= r.get("interviewDone", False),
+        sessionId    = str(r["sessionId"]) if r.get("sessionId") else None,
+    )
 
-    # 1) Try to grab mailto: from any link annotation via PyMuPDF
-    embedded_email: Optional[str] = None
+
+def _encode_cursor(*values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _decode_cursor(cursor: str, convert: Callable[[list], tuple]) -> tuple:
+    """Decode an opaque keyset cursor; `convert` restores the typed sort keys."""
     try:
-        doc = fitz.open(stream=raw, filetype="pdf")
-        for page in doc:
-            for link in page.get_links():
-                uri = link.get("uri", "")
-                if uri.lower().startswith("mailto:"):
-                    embedded_email = uri.split("mailto:", 1)[1]
-                    break
-            if embedded_email:
-                break
+        return convert(json.loads(base64.urlsafe_b64decode(cursor.encode())))
     except Exception:
-        embedded_email = None
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid cursor")
 
-    # 2) Extract visible text
-    text = await extract_pdf_text(raw, file.filename)
 
-    # 3) If no annotation email, scan the text itself
-    if not embedded_email:
-        m = EMAIL_RE.search(text)
-        if m:
-            embedded_email = m.group(0)
+async def _stage_files(files: List[UploadFile]) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+    """Stream each upload into GridFS; returns (staged, rejected)."""
+    staged, rejected = [], []
+    for f in files:
+        try:
+            staged.append(await stage_upload(f))
+        except HTTPException as e:
+            rejected.append({"filename": f.filename, "error": e.detail})
+        finally:
+            await f.close()
+    return staged, rejected
 
-    return file.filename, text, raw, embedded_email
 
-@router.post("/jobs", status_code=status.HTTP_201_CREATED)
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
 async def create_job(
     description: str              = Form(...),
     files:       List[UploadFile] = File(...),
+    cascade_top_k:     Optional[int]   = Form(None),
+    cascade_threshold: Optional[float] = Form(None),
     current_user: dict            = Depends(get_current_user),
 ) -> Dict[str, Any]:
     if not files:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "At least one file must be uploaded")
 
+    # A) Store the PDFs first: a job whose every upload is rejected is
+    #    never created
+    staged, rejected = await _stage_files(files)
+    if not staged:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            {"message": "None of the uploaded files could be accepted", "rejectedFiles": rejected},
+        )
+
     recruiter_id = current_user["_id"]
 
-    # A) Insert minimal job to get its ID
+    # B) Insert minimal job to get its ID
     job_doc = {
         "recruiterId":   recruiter_id,
         "description":   description,
@@ -75,77 +132,26 @@ async def create_job(
         "scoredResumes": [],
         "createdAt":     datetime.utcnow(),
     }
-    job_insert = job_profiles.insert_one(job_doc)
+    cascade = _cascade_config(cascade_top_k, cascade_threshold)
+    if cascade:
+        job_doc["cascade"] = cascade
+    job_insert = await job_profiles.insert_one(job_doc)
     job_id      = str(job_insert.inserted_id)
 
-    # B) Index JD in Qdrant
-    index_job_description_chunks(job_id, description)
-
-    stored_files   = []
-    scored_resumes = []
+    # C) Queue the description and the PDFs; the ingestion worker parses,
+    #    indexes and scores them in the background
+    await enqueue_description(job_id)
+    await enqueue_resumes(job_id, staged)
+    wake_worker()
 
-    for file in files:
-        filename, text, raw, embedded_email = await read_and_parse(file)
-
-        # 1) Store PDF in GridFS
-        try:
-            file_id = fs.put(
-                raw,
-                filename=filename,
-                content_type=file.content_type,
-                uploadDate=datetime.utcnow()
-            )
-        except Exception as e:
-            raise HTTPException(
-                status.HTTP_500_INTERNAL_SERVER_ERROR,
-                f"GridFS error for '{filename}': {e}"
-            )
-
-        resume_id = str(file_id)
-        stored_files.append({
-            "fileId":   file_id,
-            "filename": filename,
-            "fileType": file.content_type,
-        })
-
-        # 2) Vector‐index the resume text
-        index_resume_chunks(resume_id, text)
-
-        # 3) Score + extract name/email (using embedded_email as override)
-        score_result = await llm_score(
-            resume_id=resume_id,
-            filename=filename,
-            resume_text=text,
-            job_desc=description,
-            override_email=embedded_email
-        )
-
-        # 4) Build out the scoredResumes entry
-        scored_resumes.append({
-            "resumeId":  resume_id,
-            "filename":  filename,
-            "name":      score_result["name"],
-            "email":     score_result["email"],
-            "score":     score_result["score"],
-            "reasoning": score_result["reasoning"],
-            "text":      text,
-            "interviewDone": False,
-            "sessionId":     None,
-        })
-
-    # D) Patch the full arrays back into MongoDB
-    job_profiles.update_one(
-        {"_id": job_insert.inserted_id},
-        {"$set": {
-            "files":         stored_files,
-            "scoredResumes": scored_resumes,
-        }}
-    )
-
-    # E) Return the enriched response
     return {
         "jobId":         job_id,
-        "scoredResumes": scored_resumes,
+        "description":   description,
+        "status":        "queued",
+        "queuedFiles":   len(staged),
+        "rejectedFiles": rejected,
+        "scoredResumes": [],
+        "progressUrl":   f"/jobs/{job_id}/progress",
         "createdAt":     job_doc["createdAt"].isoformat(),
     }
 
@@ -154,130 +160,199 @@ async def create_job(
     response_model=List[JobSummary],
     summary="List all jobs created by the current user"
 )
-async def list_my_jobs(current_user: dict = Depends(get_current_user)):
+async def list_my_jobs(
+    response: Response,
+    limit:  int           = Query(settings.PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    include_resumes: bool = Query(True),
+    current_user: dict    = Depends(get_current_user),
+):
     """
-    Returns all job profiles where recruiterId == current_user['_id'].
+    Returns the job profiles where recruiterId == current_user['_id'],
+    newest first, `limit` per page. When there are more, the X-Next-Cursor
+    response header holds the `cursor` of the next page. With
+    include_resumes=false only each job's resume count and average score
+    are returned.
     """
-    user_id = current_user["_id"]
-    # Fetch all matching jobs
-    jobs_cursor = job_profiles.find({"recruiterId": user_id})
-    jobs = []
-    for job in jobs_cursor:
-        jobs.append(
-            JobSummary(
-                jobId=str(job["_id"]),
-                description=job["description"],
-                createdAt=job["createdAt"],
-                scoredResumes=[
-                    ResumeSummary(
-                        resumeId=r["resumeId"],
-                        filename=r["filename"],
-                        name=r["name"],
-                        email=r["email"],
-                        score=r["score"],
-                        interviewDone= r.get("interviewDone", False),
-                        sessionId    = str(r["sessionId"]) if r.get("sessionId") else None,
-                    )
-                    for r in job.get("scoredResumes", [])
-                ],
-            )
+    query: Dict[str, Any] = {"recruiterId": current_user["_id"]}
+    if cursor:
+        created_at, last_id = _decode_cursor(cursor, lambda c: (datetime.fromisoformat(c[0]), ObjectId(c[1])))
+        query["$or"] = [
+            {"createdAt": {"$lt": created_at}},
+            {"createdAt": created_at, "_id": {"$lt": last_id}},
+        ]
+
+    fields: Dict[str, Any] = {
+        "description": 1,
+        "createdAt":   1,
+        **_RESUME_STATS,
+    }
+    if include_resumes:
+        fields.update({f"scoredResumes.{f}": 1 for f in _RESUME_FIELDS})
+
+    jobs = await job_profiles.aggregate([
+        {"$match": query},
+        {"$sort": {"createdAt": -1, "_id": -1}},
+        {"$limit": limit + 1},
+        {"$project": fields},
+    ]).to_list(None)
+
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        last = jobs[-1]
+        response.headers["X-Next-Cursor"] = _encode_cursor(last["createdAt"].isoformat(), str(last["_id"]))
+
+    return [
+        JobSummary(
+            jobId=str(job["_id"]),
+            description=job["description"],
+            createdAt=job["createdAt"],
+            resumeCount=job["resumeCount"],
+            averageScore=job.get("averageScore"),
+            scoredResumes=[_resume_summary(r) for r in job.get("scoredResumes", [])],
         )
-    return jobs
+        for job in jobs
+    ]
 
 
+@router.get(
+    "/jobs/{job_id}/candidates",
+    response_model=CandidatePage,
+    summary="Page through a job's candidates, best score first, pre-screened last"
+)
+async def list_candidates(
+    job_id: str,
+    limit:  int           = Query(settings.PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    include_reasoning: bool = Query(False),
+    current_user: dict    = Depends(get_current_user),
+):
+    job = await _get_owned_job(job_id, current_user, {"recruiterId": 1, **_RESUME_STATS})
+
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": {"_id": ObjectId(job_id)}},
+        {"$unwind": "$scoredResumes"},
+        {"$replaceRoot": {"newRoot": "$scoredResumes"}},
+    ]
+    # LLM-scored candidates by score, then pre-screened ones by similarity:
+    # the two are on different scales and never ranked against each other
+    pipeline.append({"$addFields": {
+        "tier": {"$cond": [{"$eq": ["$preScreened", True]}, 0, 1]},
+        "rank": {"$ifNull": [
+            {"$cond": [{"$eq": ["$preScreened", True]}, "$similarity", "$score"]}, -1,
+        ]},
+    }})
+    if cursor:
+        tier, rank, resume_id = _decode_cursor(cursor, lambda c: (int(c[0]), float(c[1]), str(c[2])))
+        pipeline.append({"$match": {"$or": [
+            {"tier": {"$lt": tier}},
+            {"tier": tier, "rank": {"$lt": rank}},
+            {"tier": tier, "rank": rank, "resumeId": {"$gt": resume_id}},
+        ]}})
+    pipeline += [
+        {"$sort": {"tier": -1, "rank": -1, "resumeId": 1}},
+        {"$limit": limit + 1},
+        {"$project": {"tier": 1, "rank": 1, **{f: 1 for f in _RESUME_FIELDS}}},
+    ]
+    rows = await job_profiles.aggregate(pipeline).to_list(None)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1]["tier"], rows[-1]["rank"], rows[-1]["resumeId"])
+
+    reasons = {}
+    if include_reasoning:
+        reasons = await get_evaluations(job_id, [r["resumeId"] for r in rows])
+
+    return CandidatePage(
+        jobId=job_id,
+        resumeCount=job["resumeCount"],
+        averageScore=job.get("averageScore"),
+        candidates=[
+            CandidateSummary(**_resume_summary(r).dict(), reasoning=reasons.get(r["resumeId"]))
+            for r in rows
+        ],
+        nextCursor=next_cursor,
+    )
+
 
-@router.patch("/jobs/{job_id}", status_code=status.HTTP_200_OK)
+@router.patch("/jobs/{job_id}", status_code=status.HTTP_202_ACCEPTED)
 async def update_job(
     job_id: str,
     description: Optional[str] = Form(None),
     files: Optional[List[UploadFile]] = File(None),
+    cascade_top_k: Optional[int] = Form(None),
+    cascade_threshold: Optional[float] = Form(None),
     current_user: dict = Depends(get_current_user),
 ) -> Dict[str, Any]:
     """
     PATCH endpoint to update job description and/or add more resumes to an existing job.
+    New resumes are queued for background ingestion.
     """
-    try:
-        job_obj_id = ObjectId(job_id)
-    except Exception:
-        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid job ID")
+    await _get_owned_job(job_id, current_user, {"recruiterId": 1})
 
-    job = job_profiles.find_one({"_id": job_obj_id})
-    if not job:
-        raise HTTPException(status.HTTP_404_NOT_FOUND, "Job not found")
+    update_fields = []
 
-    if job["recruiterId"] != current_user["_id"]:
-        raise HTTPException(status.HTTP_403_FORBIDDEN, "Not authorized to update this job")
-
-    update_fields = {}
-
-    # Update the description if provided
+    # Update the description if provided; new resumes are scored against it
     if description:
-        update_fields["description"] = description
-        index_job_description_chunks(job_id, description)
-
-    new_files = []
-    new_scored_resumes = []
+        await job_profiles.update_one({"_id": ObjectId(job_id)}, {"$set": {"description": description}})
+        await enqueue_description(job_id)
+        update_fields.append("description")
+
+    cascade = _cascade_config(cascade_top_k, cascade_threshold)
+    if cascade:
+        await job_profiles.update_one(
+            {"_id": ObjectId(job_id)},
+            {"$set": {f"cascade.{k}": v for k, v in cascade.items()}}
+        )
+        update_fields.append("cascade")
 
+    staged, rejected = [], []
     if files:
-        for file in files:
-            filename, text, raw, embedded_email = await read_and_parse(file)
-
-            # Store PDF in GridFS
-            try:
-                file_id = fs.put(
-                    raw,
-                    filename=filename,
-                    content_type=file.content_type,
-                    uploadDate=datetime.utcnow()
-                )
-            except Exception as e:
-                raise HTTPException(
-                    status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    f"GridFS error for '{filename}': {e}"
-                )
-
-            resume_id = str(file_id)
-
-            # Index resume and score
-            index_resume_chunks(resume_id, text)
-            score_result = await llm_score(
-                resume_id=resume_id,
-                filename=filename,
-                resume_text=text,
-                job_desc=description or job["description"],
-                override_email=embedded_email
-            )
-
-            new_files.append({
-                "fileId":   file_id,
-                "filename": filename,
-                "fileType": file.content_type,
-            })
-
-            new_scored_resumes.append({
-                "resumeId":  resume_id,
-                "filename":  filename,
-                "name":      score_result["name"],
-                "email":     score_result["email"],
-                "score":     score_result["score"],
-                "reasoning": score_result["reasoning"],
-                "text":      text,
-                "interviewDone":False,
-                "sessionId"    :None
-            })
-
-    # Combine existing and new files/resumes
-    if new_files:
-        update_fields["files"] = job.get("files", []) + new_files
-    if new_scored_resumes:
-        update_fields["scoredResumes"] = job.get("scoredResumes", []) + new_scored_resumes
-
-    # Apply update
-    if update_fields:
-        job_profiles.update_one({"_id": job_obj_id}, {"$set": update_fields})
+        staged, rejected = await _stage_files(files)
+        await enqueue_resumes(job_id, staged)
+        update_fields.append("scoredResumes")
+
+    wake_worker()
 
     return {
         "message": "Job updated successfully",
-        "updatedFields": list(update_fields.keys()),
-        "newScoredResumes": new_scored_resumes,
-    }
\ No newline at end of file
+        "updatedFields": update_fields,
+        "queuedFiles": len(staged),
+        "rejectedFiles": rejected,
+        "progressUrl": f"/jobs/{job_id}/progress",
+    }
+
+
+@router.get("/jobs/{job_id}/progress", summary="Per-file ingestion progress of a job")
+async def get_job_progress(job_id: str, current_user: dict = Depends(get_current_user)):
+    await _get_owned_job(job_id, current_user, {"recruiterId": 1})
+    return await job_progress(job_id)
+
+
+@router.get("/jobs/{job_id}/progress/stream", summary="Server-sent events of ingestion progress")
+async def stream_job_progress(job_id: str, current_user: dict = Depends(get_current_user)):
+    """
+    Emits a `data:` frame with the job_progress payload whenever it changes,
+    and a final `event: done` once no file is queued or processing.
+    """
+    await _get_owned_job(job_id, current_user, {"recruiterId": 1})
+
+    async def events():
+        last = None
+        while True:
+            progress = await job_progress(job_id)
+            if progress != last:
+                yield f"data: {json.dumps(progress)}\n\n"
+                last = progress
+            if progress["finished"]:
+                yield "event: done\ndata: {}\n\n"
+                return
+            await asyncio.sleep(settings.INGEST_PROGRESS_INTERVAL)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
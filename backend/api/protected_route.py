@@ -1,29 +1,25 @@
-from fastapi import APIRouter, Request, HTTPException
-from config import settings
-from db.user_crud import get_user_by_email
-from jose import jwt, JWTError
-from models.login import UserResponse
+from fastapi import APIRouter, Depends
+from utils.getuser import get_current_user
+from utils.auth_cache import auth_cache
+from utils.score_cache import score_cache
+from utils.llm_provider import provider_stats
+from utils.llm import batch_stats
+from db.vector_db import embedding_stats
 
 router = APIRouter()
 
-def get_current_user(request: Request):
-    token = request.cookies.get("access_token")
-    if not token:
-        raise HTTPException(status_code=401, detail="No authentication token provided")
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email = payload.get("sub")
-        if email is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    user = get_user_by_email(email)
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-    return user
-
 @router.get("/protected")
-async def protected_route(request: Request):
-    user = get_current_user(request)
+async def protected_route(user: dict = Depends(get_current_user)):
     return {"message": f"Hello {user['name']}, this is a protected route!"}
+
+
+@router.get("/cache-stats")
+async def cache_stats(user: dict = Depends(get_current_user)):
+    """Hit/miss counters of the in-process caches, and LLM batching savings."""
+    return {
+        "auth":       auth_cache.stats,
+        "scoreCache": score_cache.stats,
+        "embeddings": embedding_stats,
+        "llm":        provider_stats(),
+        "batching":   batch_stats,
+    }
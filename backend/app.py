@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from config import settings
@@ -6,10 +8,29 @@ from api.jobs_route import router as jobs_router
 from api.email_route import router as email_router
 from api.protected_route import router as protected_router
 from api.interview_route import router as interview_router
+from utils.pdf_parser import shutdown_pdf_pool
+from security import shutdown_password_pool
+from utils.ingest_worker import run_worker
+from db.vector_db import ensure_collection
+from db.indexes import ensure_indexes
+from db.database import close_client
 from dotenv import load_dotenv
 
 
-app = FastAPI(title="Secure Auth API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await ensure_indexes()
+    await asyncio.to_thread(ensure_collection)
+    worker = asyncio.create_task(run_worker()) if settings.INGEST_WORKER_IN_PROCESS else None
+    yield
+    if worker:
+        worker.cancel()
+    shutdown_pdf_pool()
+    shutdown_password_pool()
+    close_client()
+
+
+app = FastAPI(title="Secure Auth API", lifespan=lifespan)
 load_dotenv() 
 app.add_middleware(
     CORSMiddleware,
@@ -17,6 +38,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
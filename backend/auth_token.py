@@ -11,10 +11,10 @@ def create_access_token(data: dict, expires_delta: timedelta):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def create_refresh_token(email: str):
+async def create_refresh_token(email: str):
     token = secrets.token_urlsafe(32)
     expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    tokens_collection.insert_one({
+    await tokens_collection.insert_one({
         "token": token,
         "email": email,
         "expires_at": expires_at,
@@ -0,0 +1,199 @@
+# benchmarks/mongo_latency.py
+#
+# Interview turn latency under a concurrent resume-ingestion load, with
+# the blocking pymongo driver (how every route called Mongo before the
+# motor migration) versus the motor collections in db/database.py.
+#
+# Both modes share one event loop with an in-process ingestion worker
+# (utils.ingest_worker.run_worker, as the API runs it) while a feeder
+# keeps streaming generated PDFs into GridFS and queueing them. Each
+# simulated turn does what a turn writes: one $push of the Q&A onto the
+# session document (SessionWriter.flush). The ingestion load is motor in
+# both modes; only the turn path changes driver.
+#
+# Needs a reachable mongod; it writes to its own database and drops it.
+# Resumes are scored by the fake LLM. Indexing needs Qdrant (QDRANT_URL):
+# without it resume tasks still read GridFS and parse, then fail at the
+# index stage.
+#
+#     MONGODB_URL=mongodb://localhost:27017 python -m benchmarks.mongo_latency \
+#         --turns 2000 --concurrency 50 --upload-batch 10 --upload-interval 0.5
+
+import os
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("APP_DB_NAME", "bench_mongo_latency")
+
+import time
+import asyncio
+import hashlib
+import argparse
+import statistics
+from datetime import datetime
+from typing import Awaitable, Callable, List
+
+import fitz                      # PyMuPDF
+import pymongo
+
+from config import settings
+from db import ingest_queue
+from db.database import app_db, get_fs, close_client, interview_sessions
+from db.indexes import ensure_indexes
+from utils.ingest_worker import run_worker, wake_worker
+
+RECRUITER = "bench-recruiter"
+
+
+def _percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def _resume_pdf(n: int) -> bytes:
+    doc  = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), f"Candidate {n}  candidate{n}@example.com", fontsize=12)
+    for line in range(30):
+        page.insert_text((72, 100 + line * 20), f"Built Python services on MongoDB, project {n}.{line}.", fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+async def _seed(sessions: int) -> tuple:
+    job = await app_db["job_profiles"].insert_one({
+        "recruiterId":   RECRUITER,
+        "description":   "Backend engineer, Python, MongoDB. " * 20,
+        "files":         [],
+        "scoredResumes": [],
+        "createdAt":     datetime.utcnow(),
+    })
+    result = await interview_sessions.insert_many([
+        {"job_id": str(job.inserted_id), "resume_id": f"r{n}", "history": [], "stage_progression": []}
+        for n in range(sessions)
+    ])
+    return str(job.inserted_id), result.inserted_ids
+
+
+async def _feed(job_id: str, batch: int, interval: float, stop: asyncio.Event, uploaded: List[int]) -> None:
+    """Keep the ingestion queue busy: stream `batch` PDFs into GridFS and queue them every `interval` s."""
+    pdfs = [_resume_pdf(n) for n in range(batch)]
+    fs   = get_fs()
+    n    = 0
+    while not stop.is_set():
+        staged = []
+        for data in pdfs:
+            # unique bytes per upload, so content dedup does not short-circuit parsing
+            data    = data + f"%{n}\n".encode()
+            file_id = await fs.upload_from_stream(f"cv{n}.pdf", data, metadata={"contentType": "application/pdf"})
+            staged.append({
+                "fileId":      file_id,
+                "filename":    f"cv{n}.pdf",
+                "contentType": "application/pdf",
+                "sha256":      hashlib.sha256(data).hexdigest(),
+                "size":        len(data),
+            })
+            n += 1
+        await ingest_queue.enqueue_resumes(job_id, staged)
+        uploaded[0] += len(staged)
+        wake_worker()
+        await asyncio.sleep(interval)
+
+
+async def _run(request: Callable[[int], Awaitable[None]], requests: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    lag: List[float] = []
+    done = asyncio.Event()
+
+    async def probe():
+        # how late a 10ms timer fires: the time the loop was blocked
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag.append(time.perf_counter() - started - 0.01)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for n in range(requests):
+        queue.put_nowait(n)
+
+    async def client():
+        while not queue.empty():
+            n = queue.get_nowait()
+            started = time.perf_counter()
+            await request(n)
+            latencies.append(time.perf_counter() - started)
+
+    prober  = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await prober
+
+    ms = [l * 1000 for l in latencies]
+    return {
+        "rps":        round(requests / elapsed, 1),
+        "p50 ms":     round(statistics.median(ms), 2),
+        "p95 ms":     round(_percentile(ms, 0.95), 2),
+        "p99 ms":     round(_percentile(ms, 0.99), 2),
+        "max lag ms": round(max(lag, default=0) * 1000, 2),
+    }
+
+
+async def main(args) -> None:
+    await ensure_indexes()
+    job_id, session_ids = await _seed(args.concurrency)
+    sync_db       = pymongo.MongoClient(settings.MONGODB_URL)[settings.APP_DB_NAME]
+    sync_sessions = sync_db["interview_sessions"]
+
+    def turn(n: int) -> tuple:
+        session_id = session_ids[n % len(session_ids)]
+        entry = {
+            "question_number": n,
+            "question":        f"Question {n}?",
+            "answer":          "I designed the ingestion service and halved its latency. " * 5,
+            "score":           n % 10,
+            "timestamp":       datetime.utcnow(),
+            "stage":           "technical",
+        }
+        push = {"$push": {
+            "history":           {"$each": [entry]},
+            "stage_progression": {"$each": [{"stage": entry["stage"], "question_number": n,
+                                             "timestamp": entry["timestamp"]}]},
+        }}
+        return session_id, push
+
+    async def blocking(n: int) -> None:
+        session_id, push = turn(n)
+        sync_sessions.update_one({"_id": session_id}, push)
+
+    async def non_blocking(n: int) -> None:
+        session_id, push = turn(n)
+        await interview_sessions.update_one({"_id": session_id}, push)
+
+    stop     = asyncio.Event()
+    uploaded = [0]
+    worker   = asyncio.create_task(run_worker(stop))
+    feeder   = asyncio.create_task(_feed(job_id, args.upload_batch, args.upload_interval, stop, uploaded))
+    try:
+        for name, request in (("pymongo (before)", blocking), ("motor (after)", non_blocking)):
+            await request(0)    # warm up connections
+            before = uploaded[0]
+            result = await _run(request, args.turns, args.concurrency)
+            result["uploads"] = uploaded[0] - before
+            print(f"{name:<18}", "  ".join(f"{k}={v}" for k, v in result.items()))
+    finally:
+        stop.set()
+        wake_worker()
+        await asyncio.gather(worker, feeder, return_exceptions=True)
+        await app_db.client.drop_database(settings.APP_DB_NAME)
+        close_client()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--upload-batch", type=int, default=10)
+    parser.add_argument("--upload-interval", type=float, default=0.5)
+    asyncio.run(main(parser.parse_args()))
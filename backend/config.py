@@ -11,7 +11,24 @@ class Settings:
     ALGORITHM = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES = 30
     REFRESH_TOKEN_EXPIRE_DAYS = 7
+    # get_current_user caches (utils/auth_cache.py): verified tokens live
+    # until they expire; user records for AUTH_USER_CACHE_TTL seconds
+    AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+    AUTH_USER_CACHE_SIZE  = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
+    AUTH_USER_CACHE_TTL   = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+    # Password hashing (security.py): bcrypt work factor, hashing threads,
+    # and how many logins may queue (and for how long, seconds) for one
+    BCRYPT_ROUNDS        = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    BCRYPT_WORKERS       = int(os.getenv("BCRYPT_WORKERS", "2"))
+    BCRYPT_MAX_PENDING   = int(os.getenv("BCRYPT_MAX_PENDING", "64"))
+    BCRYPT_QUEUE_TIMEOUT = float(os.getenv("BCRYPT_QUEUE_TIMEOUT", "10"))
     MONGODB_URL= os.getenv("MONGODB_URL")
+    # Connection pool of the shared async Mongo client (db/database.py)
+    MONGO_MAX_POOL_SIZE               = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+    MONGO_MIN_POOL_SIZE               = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+    MONGO_MAX_IDLE_MS                 = int(os.getenv("MONGO_MAX_IDLE_MS", "300000"))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS       = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "10000"))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000"))
     FRONTEND_URL= os.getenv("FRONTEND_URL", "http://localhost:3000")
     AUTH_DB_NAME= os.getenv("AUTH_DB_NAME", "auth_db")
     APP_DB_NAME= os.getenv("APP_DB_NAME", "app_db")
@@ -29,5 +46,96 @@ class Settings:
     MAILJET_SECRET_KEY = os.getenv("MAILJET_SECRET_KEY")
        
     QDRANT_COLLECTION="resumes"
+    QDRANT_VECTOR_SIZE  = 768
+    QDRANT_UPSERT_BATCH = int(os.getenv("QDRANT_UPSERT_BATCH", "256"))
+
+    # Chat models (utils/llm_provider.py): backend ("gemini" or "fake"),
+    # calls in flight per model profile, request timeout (seconds),
+    # retries, and transport ("grpc"/"rest"; the library default if unset)
+    LLM_BACKEND         = os.getenv("LLM_BACKEND", "gemini")
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+    LLM_TIMEOUT         = float(os.getenv("LLM_TIMEOUT", "60"))
+    LLM_MAX_RETRIES     = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    LLM_TRANSPORT       = os.getenv("LLM_TRANSPORT") or None
+    # JSON list of canned replies the fake backend cycles through
+    LLM_FAKE_RESPONSES  = os.getenv(
+        "LLM_FAKE_RESPONSES",
+        '["Score: 50\\nName: Test Candidate\\nEmail: candidate@example.com\\nReason: Fake backend reply."]',
+    )
+
+    # Interview prompts (utils/interview_context.py): token budget per
+    # question prompt, Q&A turns kept verbatim, and size of the running
+    # summary older turns are folded into
+    INTERVIEW_PROMPT_BUDGET  = int(os.getenv("INTERVIEW_PROMPT_BUDGET", "6000"))
+    INTERVIEW_VERBATIM_TURNS = int(os.getenv("INTERVIEW_VERBATIM_TURNS", "3"))
+    INTERVIEW_SUMMARY_TOKENS = int(os.getenv("INTERVIEW_SUMMARY_TOKENS", "400"))
+    # seconds between write-behind flushes of interview session records
+    INTERVIEW_FLUSH_INTERVAL = float(os.getenv("INTERVIEW_FLUSH_INTERVAL", "2"))
+
+    # Proctoring telemetry (utils/telemetry.py): seconds of samples per
+    # stored bucket, seconds between bulk writes, and buffered samples
+    # that force an early write
+    TELEMETRY_BUCKET_SECONDS = int(os.getenv("TELEMETRY_BUCKET_SECONDS", "60"))
+    TELEMETRY_FLUSH_INTERVAL = float(os.getenv("TELEMETRY_FLUSH_INTERVAL", "10"))
+    TELEMETRY_MAX_BUFFER     = int(os.getenv("TELEMETRY_MAX_BUFFER", "2000"))
+
+    # Proctoring summary (utils/proctoring.py): heatmap cells per side,
+    # and the gaze window length / max dispersion (px) of a fixation
+    PROCTORING_HEATMAP_GRID       = int(os.getenv("PROCTORING_HEATMAP_GRID", "16"))
+    PROCTORING_FIXATION_WINDOW_MS = int(os.getenv("PROCTORING_FIXATION_WINDOW_MS", "500"))
+    PROCTORING_FIXATION_PX        = float(os.getenv("PROCTORING_FIXATION_PX", "100"))
+
+    # Chunk embeddings: texts per embedding request, and the on-disk cache
+    EMBED_BATCH_SIZE        = int(os.getenv("EMBED_BATCH_SIZE", "100"))
+    EMBED_CACHE_PATH        = os.getenv("EMBED_CACHE_PATH", ".cache/embeddings.sqlite3")
+    EMBED_CACHE_MAX_ENTRIES = int(os.getenv("EMBED_CACHE_MAX_ENTRIES", "200000"))
+
+    # Uploads are streamed into GridFS in chunks; larger files are rejected
+    MAX_UPLOAD_BYTES   = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+    UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(255 * 1024)))
+
+    # PDF parsing worker processes and per-document time limit (seconds)
+    PDF_PARSE_WORKERS = int(os.getenv("PDF_PARSE_WORKERS", str(os.cpu_count() or 2)))
+    PDF_PARSE_TIMEOUT = float(os.getenv("PDF_PARSE_TIMEOUT", "30"))
+
+    # LLM resume-scoring cache: in-process LRU entries, and TTL (seconds)
+    # shared by the LRU and the Mongo-backed store
+    SCORE_CACHE_SIZE = int(os.getenv("SCORE_CACHE_SIZE", "2048"))
+    SCORE_CACHE_TTL  = int(os.getenv("SCORE_CACHE_TTL", str(30 * 24 * 3600)))
+
+    # Batched scoring: prompt token budget per request and resumes per batch
+    LLM_BATCH_TOKEN_BUDGET = int(os.getenv("LLM_BATCH_TOKEN_BUDGET", "24000"))
+    LLM_BATCH_MAX_SIZE     = int(os.getenv("LLM_BATCH_MAX_SIZE", "10"))
+
+    # Cascade scoring defaults for jobs that do not set their own: only the
+    # top-K candidates by vector similarity (and at or above the threshold)
+    # are LLM-scored. Unset means no limit.
+    CASCADE_TOP_K     = int(os.environ["CASCADE_TOP_K"]) if os.getenv("CASCADE_TOP_K") else None
+    CASCADE_THRESHOLD = float(os.environ["CASCADE_THRESHOLD"]) if os.getenv("CASCADE_THRESHOLD") else None
+
+    # Resume ingestion pipeline: queue depth between stages and the number
+    # of concurrent workers per stage.
+    INGEST_QUEUE_SIZE        = int(os.getenv("INGEST_QUEUE_SIZE", "16"))
+    INGEST_PARSE_CONCURRENCY = int(os.getenv("INGEST_PARSE_CONCURRENCY", "4"))
+    INGEST_STORE_CONCURRENCY = int(os.getenv("INGEST_STORE_CONCURRENCY", "8"))
+    INGEST_EMBED_CONCURRENCY = int(os.getenv("INGEST_EMBED_CONCURRENCY", "4"))
+    # resumes whose chunks are embedded and upserted together
+    INGEST_EMBED_BATCH       = int(os.getenv("INGEST_EMBED_BATCH", "25"))
+    INGEST_EMBED_LINGER      = float(os.getenv("INGEST_EMBED_LINGER", "0.2"))
+    INGEST_SCORE_CONCURRENCY = int(os.getenv("INGEST_SCORE_CONCURRENCY", "4"))
+    # how long (seconds) the scoring stage waits to fill a batch
+    INGEST_SCORE_LINGER      = float(os.getenv("INGEST_SCORE_LINGER", "0.2"))
+
+    # Listing endpoints: default and maximum page size
+    PAGE_SIZE     = int(os.getenv("PAGE_SIZE", "50"))
+    MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "200"))
+
+    # Background ingestion queue (db/ingest_queue.py, utils/ingest_worker.py)
+    INGEST_WORKER_IN_PROCESS = os.getenv("INGEST_WORKER_IN_PROCESS", "1") == "1"
+    INGEST_CLAIM_LIMIT       = int(os.getenv("INGEST_CLAIM_LIMIT", "50"))
+    INGEST_LEASE_SECONDS     = int(os.getenv("INGEST_LEASE_SECONDS", "120"))
+    INGEST_MAX_ATTEMPTS      = int(os.getenv("INGEST_MAX_ATTEMPTS", "3"))
+    INGEST_POLL_INTERVAL     = float(os.getenv("INGEST_POLL_INTERVAL", "2"))
+    INGEST_PROGRESS_INTERVAL = float(os.getenv("INGEST_PROGRESS_INTERVAL", "1"))
 
 settings = Settings()
@@ -0,0 +1,46 @@
+# db/content_index.py
+
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from db.database import resume_contents
+
+def content_hash(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+async def find_by_hash(sha256: str) -> Optional[dict]:
+    """Return the stored content entry for these PDF bytes, if any."""
+    return await resume_contents.find_one({"sha256": sha256})
+
+
+async def register_content(resume_id: str, sha256: str, file_id, filename: str,
+                     text: str, email: Optional[str], page_count: int) -> dict:
+    """
+    Record a newly stored PDF under its content hash. If another request
+    registered the same bytes first, that entry is returned instead and
+    the caller should drop its own copy.
+    """
+    doc = {
+        "_id":       resume_id,
+        "sha256":    sha256,
+        "fileId":    file_id,
+        "filename":  filename,
+        "text":      text,
+        "email":     email,
+        "pageCount": page_count,
+        "indexed":   False,
+        "createdAt": datetime.utcnow(),
+    }
+    try:
+        await resume_contents.insert_one(doc)
+        return doc
+    except DuplicateKeyError:
+        return await resume_contents.find_one({"sha256": sha256})
+
+
+async def mark_indexed(resume_id: str) -> None:
+    await resume_contents.update_one({"_id": resume_id}, {"$set": {"indexed": True}})
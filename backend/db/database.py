@@ -1,10 +1,26 @@
 # db/database.py
+#
+# The app's only MongoDB client: async (motor) collections and the GridFS
+# bucket. Every query goes through these; nothing opens its own client.
+#
+# Nothing here may touch the event loop at import time: motor binds the
+# client to the loop of its first operation, and entry points such as
+# `python app.py` or `python -m utils.ingest_worker` import this module
+# before asyncio.run() starts theirs. Hence get_fs() instead of a bucket.
 
-from pymongo import MongoClient
-from gridfs import GridFS
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
 from config import settings
 
-_client           = MongoClient(settings.MONGODB_URL)
+_client           = AsyncIOMotorClient(
+    settings.MONGODB_URL,
+    maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+    minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+    maxIdleTimeMS=settings.MONGO_MAX_IDLE_MS,
+    waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+)
 auth_db           = _client[settings.AUTH_DB_NAME]
 app_db            = _client[settings.APP_DB_NAME]
 
@@ -15,6 +31,24 @@ tokens_collection = auth_db["refresh_tokens"]
 # Domain collections
 job_profiles      = app_db["job_profiles"]        # ← add this
 resume_coll       = app_db["resume_submissions"]
-fs                = GridFS(app_db)
+resume_contents   = app_db["resume_contents"]     # one doc per unique PDF, keyed by resume id
 interview_scores  = app_db["interview_scores"] 
 interview_sessions = app_db["interview_sessions"]
+llm_score_cache   = app_db["llm_score_cache"]
+ingest_tasks      = app_db["ingest_tasks"]        # durable resume-ingestion queue
+resume_evaluations = app_db["resume_evaluations"] # per-job LLM reasoning, keyed "<jobId>:<resumeId>"
+proctoring_telemetry = app_db["proctoring_telemetry"] # interview gaze/object/tab events, one doc per time bucket
+
+_fs: Optional[AsyncIOMotorGridFSBucket] = None
+
+
+def get_fs() -> AsyncIOMotorGridFSBucket:
+    """The GridFS bucket, created on first use inside the running loop."""
+    global _fs
+    if _fs is None:
+        _fs = AsyncIOMotorGridFSBucket(app_db)
+    return _fs
+
+
+def close_client() -> None:
+    _client.close()
@@ -0,0 +1,85 @@
+# db/indexes.py
+#
+# Every secondary index the app relies on, in one place. Applied at
+# startup by ensure_indexes(); creating an index that already exists with
+# the same spec is a no-op, so any number of processes can run it.
+
+import logging
+from typing import List, Tuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import OperationFailure
+
+from db.database import (
+    users_collection, tokens_collection, job_profiles, interview_sessions,
+    resume_contents, llm_score_cache, ingest_tasks, interview_scores, proctoring_telemetry,
+)
+
+logger = logging.getLogger(__name__)
+
+INDEXES: List[Tuple[AsyncIOMotorCollection, List[IndexModel]]] = [
+    (users_collection, [
+        IndexModel([("email", ASCENDING)], unique=True),
+    ]),
+    (tokens_collection, [
+        IndexModel([("token", ASCENDING)], unique=True),
+        # Mongo drops refresh tokens once they expire
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ]),
+    (job_profiles, [
+        # GET /jobs keyset pagination
+        IndexModel([("recruiterId", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("scoredResumes.resumeId", ASCENDING)]),
+        IndexModel([("scoredResumes.sessionId", ASCENDING)], sparse=True),
+    ]),
+    (interview_sessions, [
+        IndexModel([("resume_id", ASCENDING), ("started_at", DESCENDING)]),
+        IndexModel([("job_id", ASCENDING)]),
+    ]),
+    (resume_contents, [
+        # Resumes migrated from job documents may have no hash.
+        IndexModel(
+            [("sha256", ASCENDING)], unique=True,
+            partialFilterExpression={"sha256": {"$type": "string"}},
+        ),
+    ]),
+    (llm_score_cache, [
+        IndexModel([("expiresAt", ASCENDING)], expireAfterSeconds=0),
+    ]),
+    (ingest_tasks, [
+        # claim_batch: oldest claimable task overall, then within one job
+        IndexModel([("status", ASCENDING), ("createdAt", ASCENDING)]),
+        IndexModel([("jobId", ASCENDING), ("status", ASCENDING), ("createdAt", ASCENDING)]),
+        # job_progress
+        IndexModel([("jobId", ASCENDING), ("kind", ASCENDING), ("createdAt", ASCENDING)]),
+    ]),
+    (interview_scores, [
+        # SessionWriter upserts one row per turn; rows written before the
+        # per-turn flush carry no session_id
+        IndexModel(
+            [("session_id", ASCENDING), ("question_number", ASCENDING)], unique=True,
+            partialFilterExpression={"session_id": {"$exists": True}},
+        ),
+    ]),
+    (proctoring_telemetry, [
+        # one bucket per (session, start); concurrent flushes upsert into it
+        IndexModel([("sessionId", ASCENDING), ("start", ASCENDING)], unique=True),
+    ]),
+]
+
+
+async def ensure_indexes() -> None:
+    """
+    Create every registered index. An index that conflicts with an
+    existing one (same name, different options) or cannot be built over
+    the current data is logged and skipped rather than failing startup.
+    """
+    for collection, models in INDEXES:
+        for model in models:
+            try:
+                await collection.create_indexes([model])
+            except OperationFailure as e:
+                logger.error(
+                    f"Index {model.document['name']} on {collection.name} not created: {e}"
+                )
@@ -0,0 +1,284 @@
+# db/ingest_queue.py
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from config import settings
+from db.database import ingest_tasks, job_profiles
+from db.resume_store import save_evaluation
+
+# Task kinds
+RESUME      = "resume"
+DESCRIPTION = "description"
+
+# Task states
+QUEUED     = "queued"
+PROCESSING = "processing"
+DONE       = "done"
+FAILED     = "failed"
+
+
+async def enqueue_resumes(job_id: str, staged: List[Dict[str, Any]]) -> List[Any]:
+    """Queue one task per staged GridFS file (see utils.ingest.stage_upload)."""
+    now  = datetime.utcnow()
+    docs = [
+        {
+            "jobId":       job_id,
+            "kind":        RESUME,
+            "fileId":      f["fileId"],
+            "filename":    f["filename"],
+            "contentType": f["contentType"],
+            "sha256":      f.get("sha256"),
+            "size":        f.get("size"),
+            "status":      QUEUED,
+            "attempts":    0,
+            "createdAt":   now,
+            "updatedAt":   now,
+        }
+        for f in staged
+    ]
+    if not docs:
+        return []
+    return (await ingest_tasks.insert_many(docs)).inserted_ids
+
+
+async def enqueue_description(job_id: str) -> None:
+    now = datetime.utcnow()
+    await ingest_tasks.insert_one({
+        "jobId":     job_id,
+        "kind":      DESCRIPTION,
+        "status":    QUEUED,
+        "attempts":  0,
+        "createdAt": now,
+        "updatedAt": now,
+    })
+
+
+def _claimable(now: datetime) -> dict:
+    # queued work, or work whose worker died without renewing its lease
+    return {"$or": [
+        {"status": QUEUED},
+        {"status": PROCESSING, "leaseUntil": {"$lt": now}},
+    ]}
+
+
+async def claim_batch(worker_id: str, limit: int) -> Tuple[Optional[str], List[dict]]:
+    """
+    Atomically lease up to `limit` tasks of the oldest job with pending
+    work. Tasks stay leased for INGEST_LEASE_SECONDS unless renewed.
+    """
+    tasks: List[dict] = []
+    job_id = None
+    while len(tasks) < limit:
+        now   = datetime.utcnow()
+        query = _claimable(now)
+        if job_id:
+            query["jobId"] = job_id
+        task = await ingest_tasks.find_one_and_update(
+            query,
+            {
+                "$set": {
+                    "status":     PROCESSING,
+                    "worker":     worker_id,
+                    "leaseUntil": now + timedelta(seconds=settings.INGEST_LEASE_SECONDS),
+                    "updatedAt":  now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("createdAt", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if not task:
+            break
+        if task["attempts"] > settings.INGEST_MAX_ATTEMPTS:
+            # Its worker keeps dying on it; stop handing it out.
+            await fail_task(task["_id"], "worker", f"Gave up after {settings.INGEST_MAX_ATTEMPTS} attempts")
+            continue
+        job_id = task["jobId"]
+        tasks.append(task)
+    return job_id, tasks
+
+
+async def renew_lease(task_ids: List[Any]) -> None:
+    now = datetime.utcnow()
+    await ingest_tasks.update_many(
+        {"_id": {"$in": task_ids}, "status": PROCESSING},
+        {"$set": {
+            "leaseUntil": now + timedelta(seconds=settings.INGEST_LEASE_SECONDS),
+            "updatedAt":  now,
+        }},
+    )
+
+
+async def complete_task(task_id, resume_id: Optional[str] = None) -> None:
+    await ingest_tasks.update_one(
+        {"_id": task_id},
+        {"$set": {"status": DONE, "resumeId": resume_id, "updatedAt": datetime.utcnow()},
+         "$unset": {"leaseUntil": ""}},
+    )
+
+
+async def fail_task(task_id, stage: str, error: str) -> None:
+    await ingest_tasks.update_one(
+        {"_id": task_id},
+        {"$set": {
+            "status":      FAILED,
+            "failedStage": stage,
+            "error":       error,
+            "updatedAt":   datetime.utcnow(),
+        }, "$unset": {"leaseUntil": ""}},
+    )
+
+
+async def append_resume(job_id: str, file_entry: dict, scored_entry: dict, reasoning: str,
+                        count_llm: bool = False) -> None:
+    """
+    Attach an ingested resume to its job. The guard on files.taskId makes
+    the write idempotent when a task is retried after a crash. With
+    `count_llm` the resume is charged to the job's cascade LLM budget.
+    """
+    await save_evaluation(job_id, scored_entry["resumeId"], reasoning)
+    update: Dict[str, Any] = {"$push": {"files": file_entry, "scoredResumes": scored_entry}}
+    if count_llm:
+        update["$inc"] = {"cascade.llmScored": 1}
+    await job_profiles.update_one(
+        {"_id": ObjectId(job_id), "files.taskId": {"$ne": file_entry["taskId"]}},
+        update,
+    )
+
+
+async def has_pending_resumes(job_id: str) -> bool:
+    return await ingest_tasks.count_documents(
+        {"jobId": job_id, "kind": RESUME, "status": {"$in": [QUEUED, PROCESSING]}}, limit=1
+    ) > 0
+
+
+async def init_llm_budget(job_id: str, llm_scored: int) -> None:
+    """Start the job's cascade.llmScored counter, unless it already runs."""
+    await job_profiles.update_one(
+        {"_id": ObjectId(job_id), "cascade.llmScored": {"$exists": False}},
+        {"$set": {"cascade.llmScored": llm_scored}},
+    )
+
+
+async def reserve_llm_budget(job_id: str, top_k: int, wanted: int) -> int:
+    """
+    Take up to `wanted` of the job's remaining top-K LLM slots and return
+    how many were taken. A compare-and-set on cascade.llmScored, so
+    concurrent rankers can never hand out more than `top_k` in total.
+    """
+    while wanted > 0:
+        job = await job_profiles.find_one({"_id": ObjectId(job_id)}, {"cascade.llmScored": 1})
+        if not job:
+            return 0
+        taken = (job.get("cascade") or {}).get("llmScored", 0)
+        count = min(wanted, top_k - taken)
+        if count <= 0:
+            return 0
+        result = await job_profiles.update_one(
+            {"_id": ObjectId(job_id), "cascade.llmScored": taken},
+            {"$inc": {"cascade.llmScored": count}},
+        )
+        if result.modified_count == 1:
+            return count
+    return 0
+
+
+async def release_llm_budget(job_id: str, count: int) -> None:
+    """Give back slots reserved for resumes that were not LLM-scored after all."""
+    if count > 0:
+        await job_profiles.update_one(
+            {"_id": ObjectId(job_id)}, {"$inc": {"cascade.llmScored": -count}},
+        )
+
+
+async def claim_ranking(job_id: str, worker_id: str) -> bool:
+    """
+    Lease the job-wide cascade ranking to `worker_id`. If another worker
+    holds it, flag the ranking stale so the holder runs it again when done.
+    """
+    now    = datetime.utcnow()
+    result = await job_profiles.update_one(
+        {"_id": ObjectId(job_id), "$or": [
+            {"cascade.rankLease": {"$exists": False}},
+            {"cascade.rankLease.until": {"$lt": now}},
+        ]},
+        {"$set": {"cascade.rankLease": {
+            "worker": worker_id,
+            "until":  now + timedelta(seconds=settings.INGEST_LEASE_SECONDS),
+        }}, "$unset": {"cascade.rankStale": ""}},
+    )
+    if result.modified_count == 1:
+        return True
+    await job_profiles.update_one({"_id": ObjectId(job_id)}, {"$set": {"cascade.rankStale": True}})
+    return False
+
+
+async def release_ranking(job_id: str, worker_id: str) -> bool:
+    """Drop the ranking lease; True if the ranking went stale meanwhile."""
+    job = await job_profiles.find_one_and_update(
+        {"_id": ObjectId(job_id), "cascade.rankLease.worker": worker_id},
+        {"$unset": {"cascade.rankLease": "", "cascade.rankStale": ""}},
+        projection={"cascade.rankStale": 1},
+    )
+    return bool(job and (job.get("cascade") or {}).get("rankStale"))
+
+
+async def promote_resume(job_id: str, resume_id: str, result: dict) -> bool:
+    """
+    Replace a pre-screened resume's similarity score with its LLM score.
+    False if it was not (or no longer) pre-screened.
+    """
+    updated = await job_profiles.update_one(
+        {"_id": ObjectId(job_id),
+         "scoredResumes": {"$elemMatch": {"resumeId": resume_id, "preScreened": True}}},
+        {"$set": {
+            "scoredResumes.$.name":        result["name"],
+            "scoredResumes.$.email":       result["email"],
+            "scoredResumes.$.score":       result["score"],
+            "scoredResumes.$.preScreened": False,
+        }},
+    )
+    if updated.modified_count != 1:
+        return False
+    await save_evaluation(job_id, resume_id, result["reasoning"])
+    return True
+
+
+async def job_progress(job_id: str) -> Dict[str, Any]:
+    tasks = await ingest_tasks.find(
+        {"jobId": job_id, "kind": RESUME},
+        {"filename": 1, "status": 1, "attempts": 1, "resumeId": 1, "error": 1, "failedStage": 1},
+    ).sort("createdAt", 1).to_list(None)
+    counts = {QUEUED: 0, PROCESSING: 0, DONE: 0, FAILED: 0}
+    for t in tasks:
+        counts[t["status"]] += 1
+    pending = await ingest_tasks.count_documents(
+        {"jobId": job_id, "status": {"$in": [QUEUED, PROCESSING]}}, limit=1
+    )
+    # the job-wide cascade ranking still has to promote candidates
+    ranking = await job_profiles.count_documents(
+        {"_id": ObjectId(job_id), "cascade.rankLease": {"$exists": True}}, limit=1
+    )
+    return {
+        "jobId":    job_id,
+        "total":    len(tasks),
+        **counts,
+        "ranking":  ranking > 0,
+        "finished": pending == 0 and ranking == 0,
+        "files": [
+            {
+                "taskId":      str(t["_id"]),
+                "filename":    t["filename"],
+                "status":      t["status"],
+                "attempts":    t.get("attempts", 0),
+                "resumeId":    t.get("resumeId"),
+                "error":       t.get("error"),
+                "failedStage": t.get("failedStage"),
+            }
+            for t in tasks
+        ],
+    }
@@ -0,0 +1,102 @@
+# db/migrate_resume_store.py
+#
+# One-shot migration: move resume `text` and `reasoning` out of
+# job_profiles.scoredResumes into resume_contents / resume_evaluations.
+# Safe to re-run; jobs already migrated are skipped.
+#
+#     python -m db.migrate_resume_store
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+
+from bson import ObjectId
+from gridfs.errors import NoFile
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from db.database import get_fs, job_profiles, resume_contents
+from db.content_index import content_hash
+from db.resume_store import save_evaluation
+from db.indexes import ensure_indexes
+
+logger = logging.getLogger(__name__)
+
+
+async def _fix_hash_index() -> None:
+    """Migrated resumes may lack a hash; the unique index has to be partial."""
+    index = (await resume_contents.index_information()).get("sha256_1")
+    if index and "partialFilterExpression" not in index:
+        await resume_contents.drop_index("sha256_1")
+    await ensure_indexes()
+
+
+async def _legacy_hash(resume_id: str) -> Optional[str]:
+    try:
+        grid_out = await get_fs().open_download_stream(ObjectId(resume_id))
+        return content_hash(await grid_out.read())
+    except (NoFile, ValueError):
+        return None
+
+
+async def _store_text(entry: dict) -> bool:
+    resume_id = entry["resumeId"]
+    if await resume_contents.count_documents({"_id": resume_id}, limit=1):
+        return False
+    doc = {
+        "_id":       resume_id,
+        "fileId":    ObjectId(resume_id) if ObjectId.is_valid(resume_id) else None,
+        "filename":  entry.get("filename"),
+        "text":      entry["text"],
+        "email":     entry.get("email"),
+        "pageCount": None,
+        "indexed":   True,     # the old upload path indexed every resume inline
+        "createdAt": datetime.utcnow(),
+    }
+    # Hash the stored PDF so later uploads of the same bytes dedupe onto
+    # it; if those bytes are already registered under another id, the
+    # legacy entry keeps its text unhashed.
+    sha256 = await _legacy_hash(resume_id)
+    if sha256:
+        doc["sha256"] = sha256
+    try:
+        await resume_contents.insert_one(doc)
+    except DuplicateKeyError:
+        doc.pop("sha256")
+        await resume_contents.insert_one(doc)
+    return True
+
+
+async def migrate() -> dict:
+    await _fix_hash_index()
+    counts = {"jobs": 0, "texts": 0, "evaluations": 0}
+    legacy = job_profiles.find(
+        {"$or": [
+            {"scoredResumes.text": {"$exists": True}},
+            {"scoredResumes.reasoning": {"$exists": True}},
+        ]},
+        {"scoredResumes": 1},
+    )
+    async for job in legacy:
+        job_id = str(job["_id"])
+        for entry in job.get("scoredResumes", []):
+            if entry.get("text") is not None and await _store_text(entry):
+                counts["texts"] += 1
+            if "reasoning" in entry:
+                await save_evaluation(job_id, entry["resumeId"], entry["reasoning"])
+                counts["evaluations"] += 1
+        await job_profiles.update_one(
+            {"_id": job["_id"]},
+            {"$unset": {"scoredResumes.$[].text": "", "scoredResumes.$[].reasoning": ""}},
+        )
+        counts["jobs"] += 1
+        logger.info(f"Migrated job {job_id}")
+    return counts
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        print(asyncio.run(migrate()))
+    except OperationFailure as e:
+        raise SystemExit(f"Migration failed: {e}")
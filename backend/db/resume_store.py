@@ -0,0 +1,42 @@
+# db/resume_store.py
+#
+# Resume bodies live in `resume_contents` (one doc per resume id) and the
+# LLM's per-job reasoning in `resume_evaluations`, so job documents only
+# carry the compact `scoredResumes` summaries.
+
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from db.database import resume_contents, resume_evaluations
+
+
+def evaluation_id(job_id: str, resume_id: str) -> str:
+    return f"{job_id}:{resume_id}"
+
+
+async def get_resume_text(resume_id: str) -> Optional[str]:
+    doc = await resume_contents.find_one({"_id": resume_id}, {"text": 1})
+    return doc.get("text") if doc else None
+
+
+async def save_evaluation(job_id: str, resume_id: str, reasoning: str) -> None:
+    """Store (or replace) the scoring explanation of a resume for a job."""
+    await resume_evaluations.update_one(
+        {"_id": evaluation_id(job_id, resume_id)},
+        {"$set": {
+            "jobId":     job_id,
+            "resumeId":  resume_id,
+            "reasoning": reasoning,
+            "updatedAt": datetime.utcnow(),
+        }},
+        upsert=True,
+    )
+
+
+async def get_evaluations(job_id: str, resume_ids: Iterable[str]) -> Dict[str, str]:
+    """resume id → reasoning for the given resumes of a job."""
+    ids = [evaluation_id(job_id, rid) for rid in resume_ids]
+    return {
+        doc["resumeId"]: doc.get("reasoning", "")
+        async for doc in resume_evaluations.find({"_id": {"$in": ids}}, {"resumeId": 1, "reasoning": 1})
+    }
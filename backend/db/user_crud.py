@@ -1,13 +1,17 @@
-from db.database import users_collection
+from db.database import users_collection, tokens_collection
+from utils.auth_cache import auth_cache
 
-def get_user_by_email(email: str):
-    return users_collection.find_one({"email": email})
+async def get_user_by_email(email: str):
+    return await users_collection.find_one({"email": email})
 
-def create_user(user_data: dict):
-    result = users_collection.insert_one(user_data)
+async def create_user(user_data: dict):
+    result = await users_collection.insert_one(user_data)
+    auth_cache.invalidate_user(user_data["email"])
     return result.inserted_id
 
-def delete_refresh_token(token: str):
-    from db.database import tokens_collection
-    tokens_collection.delete_one({"token": token})
+async def update_password_hash(email: str, hashed_password: str):
+    await users_collection.update_one({"email": email}, {"$set": {"hashed_password": hashed_password}})
+    auth_cache.invalidate_user(email)
 
+async def delete_refresh_token(token: str):
+    await tokens_collection.delete_one({"token": token})
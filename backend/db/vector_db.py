@@ -1,83 +1,311 @@
 # db/vector_db.py
-import os
-from typing import List
+import uuid
+import hashlib
+import numpy as np
+from typing import Dict, List, Optional, Set, Tuple
 
 from config import settings
 
 from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams
+from qdrant_client.http.models import (
+    Distance, VectorParams, PointStruct, PayloadSchemaType,
+    Filter, FieldCondition, MatchValue, MatchAny, PointIdsList,
+)
+from qdrant_client.http.exceptions import UnexpectedResponse
 
-from langchain_qdrant import Qdrant as QdrantVectorStore
-from langchain.schema import Document
 from langchain.text_splitter import CharacterTextSplitter
 
+from db.embedding_cache import EmbeddingCache, embedding_key
+
 # ── Qdrant Cloud client ─────────────────────────────────────────────
-_client = QdrantClient(
-    url=settings.QDRANT_URL,        # e.g. "https://<your-cluster>.us-west-2-0.aws.cloud.qdrant.io"
-    api_key=settings.QDRANT_API_KEY,
-    prefer_grpc=False,              # force REST over HTTPS
-)
+_client: Optional[QdrantClient] = None
+_collection_ready = False
 
-# ── Ensure your 'resumes' collection exists ────────────────────────
-_client.recreate_collection(
-    collection_name=settings.QDRANT_COLLECTION,
-    vectors_config=VectorParams(
-        size=768,    
-        distance=Distance.COSINE
-    ),
-)
+# payload fields filtered on by resume/job queries
+_PAYLOAD_INDEXES = ("metadata.resume_id", "metadata.job_id", "metadata.type")
+
+
+def get_client() -> QdrantClient:
+    global _client
+    if _client is None:
+        _client = QdrantClient(
+            url=settings.QDRANT_URL,        # e.g. "https://<your-cluster>.us-west-2-0.aws.cloud.qdrant.io"
+            api_key=settings.QDRANT_API_KEY,
+            prefer_grpc=False,              # force REST over HTTPS
+        )
+    return _client
+
+
+def ensure_collection() -> None:
+    """
+    Create the collection if it is missing, otherwise check that its vector
+    size and distance match what we write. Never drops data, so any number
+    of workers can run this at startup. Also creates keyword payload
+    indexes for the fields we filter on.
+    """
+    global _collection_ready
+    if _collection_ready:
+        return
+
+    client = get_client()
+    name   = settings.QDRANT_COLLECTION
+    if client.collection_exists(name):
+        vectors = client.get_collection(name).config.params.vectors
+        if (not isinstance(vectors, VectorParams)
+                or vectors.size != settings.QDRANT_VECTOR_SIZE
+                or vectors.distance != Distance.COSINE):
+            raise RuntimeError(
+                f"Qdrant collection '{name}' has vectors {vectors}, "
+                f"expected size={settings.QDRANT_VECTOR_SIZE} distance=Cosine"
+            )
+    else:
+        try:
+            client.create_collection(
+                collection_name=name,
+                vectors_config=VectorParams(
+                    size=settings.QDRANT_VECTOR_SIZE,
+                    distance=Distance.COSINE
+                ),
+            )
+        except UnexpectedResponse as e:
+            # another worker created it between our check and create
+            if e.status_code != 409:
+                raise
+
+    existing = client.get_collection(name).payload_schema or {}
+    for field in _PAYLOAD_INDEXES:
+        if field not in existing:
+            client.create_payload_index(
+                collection_name=name,
+                field_name=field,
+                field_schema=PayloadSchemaType.KEYWORD,
+            )
+
+    _collection_ready = True
 
-# ── LangChain wrapper around that collection ───────────────────────
-_vector_store = QdrantVectorStore.from_existing_collection(
-    embedding=settings.embeddings,
-    collection_name=settings.QDRANT_COLLECTION,
-    url=settings.QDRANT_URL,
-    api_key=settings.QDRANT_API_KEY,
-    prefer_grpc=False,              # again, use REST
-)
 
 # ── Chunker ────────────────────────────────────────────────────────
 _splitter = CharacterTextSplitter(chunk_size=800, chunk_overlap=100)
 
+# ── Embedding cache ────────────────────────────────────────────────
+_embedding_cache = EmbeddingCache(settings.EMBED_CACHE_PATH, settings.EMBED_CACHE_MAX_ENTRIES)
+
+embedding_stats = {"chunks": 0, "embedded": 0, "embedCalls": 0, "upserts": 0, "deletes": 0}
+
+# Point ids are uuid5(namespace, "<owner>:<sha256 of chunk text>")
+_POINT_NAMESPACE = uuid.UUID("6f1c9a52-2d0e-4b8e-9a57-3c1f0d7e8b21")
+
+
+def embed_texts(texts: List[str]) -> List[List[float]]:
+    """
+    Embed `texts`, serving repeats and previously seen chunks from the
+    on-disk cache and sending the rest in EMBED_BATCH_SIZE requests.
+    """
+    model = settings.embeddings.model
+    keys  = [embedding_key(model, t) for t in texts]
+    found = _embedding_cache.get_many(list(dict.fromkeys(keys)))
+
+    missing: Dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if key not in found:
+            missing.setdefault(key, text)
+
+    pending = list(missing.items())
+    for i in range(0, len(pending), settings.EMBED_BATCH_SIZE):
+        part    = pending[i:i + settings.EMBED_BATCH_SIZE]
+        vectors = settings.embeddings.embed_documents([text for _, text in part])
+        embedding_stats["embedCalls"] += 1
+        fresh = [(key, vector) for (key, _), vector in zip(part, vectors)]
+        _embedding_cache.put_many(fresh)
+        found.update(fresh)
+
+    embedding_stats["chunks"]   += len(texts)
+    embedding_stats["embedded"] += len(pending)
+    return [found[key] for key in keys]
+
+
+def _chunk_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _point_id(owner: str, text: str) -> str:
+    """Stable point id for a chunk of `owner` ("job:<id>" / "resume:<id>")."""
+    return str(uuid.uuid5(_POINT_NAMESPACE, f"{owner}:{_chunk_hash(text)}"))
+
+
+def _chunk_id(owner_id: str, text: str) -> str:
+    """
+    `chunk_id` payload of a chunk. Derived from its content like the point
+    id, not its position: unchanged chunks are never rewritten, so a
+    positional id would go stale once an edit shifts them.
+    """
+    return f"{owner_id}_{_chunk_hash(text)[:16]}"
+
+
+def _existing_ids(query: Filter) -> Set[str]:
+    client = get_client()
+    found, offset = set(), None
+    while True:
+        points, offset = client.scroll(
+            collection_name=settings.QDRANT_COLLECTION,
+            scroll_filter=query,
+            limit=1024,
+            offset=offset,
+            with_payload=False,
+            with_vectors=False,
+        )
+        found.update(str(p.id) for p in points)
+        if offset is None:
+            return found
+
+
+def _sync_points(query: Filter, desired: Dict[str, Tuple[str, dict]]) -> None:
+    """
+    Make the points matching `query` equal to `desired` (point id →
+    (chunk text, metadata)): embed and upsert only the chunks that are not
+    stored yet, and delete the ones that disappeared. Payloads use
+    LangChain's page_content/metadata layout.
+    """
+    ensure_collection()
+    client   = get_client()
+    existing = _existing_ids(query)
+
+    added = [pid for pid in desired if pid not in existing]
+    stale = [pid for pid in existing if pid not in desired]
+
+    if added:
+        vectors = embed_texts([desired[pid][0] for pid in added])
+        points  = [
+            PointStruct(
+                id=pid,
+                vector=vector,
+                payload={"page_content": desired[pid][0], "metadata": desired[pid][1]},
+            )
+            for pid, vector in zip(added, vectors)
+        ]
+        for i in range(0, len(points), settings.QDRANT_UPSERT_BATCH):
+            client.upsert(
+                collection_name=settings.QDRANT_COLLECTION,
+                points=points[i:i + settings.QDRANT_UPSERT_BATCH],
+            )
+            embedding_stats["upserts"] += 1
+
+    for i in range(0, len(stale), settings.QDRANT_UPSERT_BATCH):
+        client.delete(
+            collection_name=settings.QDRANT_COLLECTION,
+            points_selector=PointIdsList(points=stale[i:i + settings.QDRANT_UPSERT_BATCH]),
+        )
+        embedding_stats["deletes"] += 1
+
+
+def index_resume_batch(resumes: List[Tuple[str, str]]) -> None:
+    """
+    Split every (resume_id, text) into ~800-token chunks tagged with
+    resume_id, and bring the whole batch up to date with a few embedding
+    requests and bulk upserts. Chunks already stored are left alone.
+    """
+    if not resumes:
+        return
+    desired: Dict[str, Tuple[str, dict]] = {}
+    for resume_id, text in resumes:
+        for chunk in _splitter.split_text(text):
+            desired[_point_id(f"resume:{resume_id}", chunk)] = (chunk, {
+                "resume_id": resume_id,
+                "chunk_id":  _chunk_id(resume_id, chunk)
+            })
+    _sync_points(
+        Filter(must=[FieldCondition(
+            key="metadata.resume_id",
+            match=MatchAny(any=[resume_id for resume_id, _ in resumes]),
+        )]),
+        desired,
+    )
+
 
 def index_resume_chunks(resume_id: str, text: str) -> None:
     """
     Split the resume text into ~800-token chunks, tag each with resume_id,
     and upsert them into your Qdrant Cloud 'resumes' collection.
     """
-    docs: List[Document] = []
-    for i, chunk in enumerate(_splitter.split_text(text)):
-        docs.append(Document(
-            page_content=chunk,
-            metadata={
-                "resume_id": resume_id,
-                "chunk_id":  f"{resume_id}_{i}"
-            }
-        ))
-    _vector_store.add_documents(documents=docs)
+    index_resume_batch([(resume_id, text)])
 
 
 def index_job_description_chunks(job_id: str, description: str) -> List[str]:
     """
-    Split the job description into chunks, tag with job_id/type,
-    upsert into the same Qdrant collection, and return the raw chunks.
-    """
-    print(f"Raw Job Description: {repr(description)}")
-    docs: List[Document] = []
-    chunk_texts: List[str] = []
-
-    for i, chunk in enumerate(_splitter.split_text(description)):
-        print(f"Chunk {i}: {repr(chunk)}")  
-        docs.append(Document(
-            
-            page_content=chunk,
-            metadata={
-                "job_id":    job_id,
-                "chunk_id":  f"{job_id}_{i}",
-                "type":      "job_description"
-            }
-        ))
-        chunk_texts.append(chunk)
-
-    _vector_store.add_documents(documents=docs)
+    Split the job description into chunks, tag with job_id/type, sync them
+    into the same Qdrant collection, and return the raw chunks. On an edit
+    only new chunks are embedded and chunks no longer present are deleted.
+    """
+    chunk_texts = _splitter.split_text(description)
+    desired = {
+        _point_id(f"job:{job_id}", chunk): (chunk, {
+            "job_id":    job_id,
+            "chunk_id":  _chunk_id(job_id, chunk),
+            "type":      "job_description"
+        })
+        for chunk in chunk_texts
+    }
+    _sync_points(
+        Filter(must=[
+            FieldCondition(key="metadata.job_id", match=MatchValue(value=job_id)),
+            FieldCondition(key="metadata.type", match=MatchValue(value="job_description")),
+        ]),
+        desired,
+    )
     return chunk_texts
+
+
+# ── Similarity ─────────────────────────────────────────────────────
+
+def _scroll_vectors(query: Filter) -> List[Tuple[dict, List[float]]]:
+    """All (metadata, vector) pairs of points matching `query`."""
+    client = get_client()
+    found, offset = [], None
+    while True:
+        points, offset = client.scroll(
+            collection_name=settings.QDRANT_COLLECTION,
+            scroll_filter=query,
+            limit=256,
+            offset=offset,
+            with_payload=["metadata"],
+            with_vectors=True,
+        )
+        found.extend((p.payload.get("metadata", {}), p.vector) for p in points)
+        if offset is None:
+            return found
+
+
+def _normalize(vectors: List[List[float]]) -> np.ndarray:
+    m = np.asarray(vectors, dtype=np.float32)
+    return m / np.maximum(np.linalg.norm(m, axis=1, keepdims=True), 1e-12)
+
+
+def similarity_scores(job_id: str, resume_ids: List[str]) -> Dict[str, float]:
+    """
+    Cheap JD-to-resume similarity from the stored chunk vectors. For each
+    resume: the mean over JD chunks of their best-matching resume chunk
+    (how much of the JD is covered), averaged with the single best chunk
+    pair. Returns {} when the job description has no vectors yet.
+    """
+    ensure_collection()
+    jd = _scroll_vectors(Filter(must=[
+        FieldCondition(key="metadata.job_id", match=MatchValue(value=job_id)),
+        FieldCondition(key="metadata.type", match=MatchValue(value="job_description")),
+    ]))
+    if not jd or not resume_ids:
+        return {}
+    jd_matrix = _normalize([vector for _, vector in jd])
+
+    by_resume: Dict[str, List[List[float]]] = {}
+    for metadata, vector in _scroll_vectors(Filter(must=[
+        FieldCondition(key="metadata.resume_id", match=MatchAny(any=list(resume_ids))),
+    ])):
+        by_resume.setdefault(metadata["resume_id"], []).append(vector)
+
+    scores = {}
+    for resume_id, vectors in by_resume.items():
+        sims = jd_matrix @ _normalize(vectors).T        # jd chunks × resume chunks
+        coverage = float(sims.max(axis=1).mean())
+        peak     = float(sims.max())
+        scores[resume_id] = (coverage + peak) / 2
+    return scores
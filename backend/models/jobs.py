@@ -8,7 +8,9 @@ class ResumeSummary(BaseModel):
     filename: str
     name: str
     email: str
-    score: float
+    score: Optional[float] = None   # None until LLM-scored (pre-screened)
+    similarity:    Optional[float] = None
+    preScreened:   bool = False
     interviewDone: bool = False
     sessionId:     Optional[str] = None
 
@@ -16,4 +18,16 @@ class JobSummary(BaseModel):
     jobId: str
     description: str
     createdAt: datetime
-    scoredResumes: List[ResumeSummary]
+    resumeCount: int = 0
+    averageScore: Optional[float] = None
+    scoredResumes: List[ResumeSummary] = []
+
+class CandidateSummary(ResumeSummary):
+    reasoning: Optional[str] = None
+
+class CandidatePage(BaseModel):
+    jobId: str
+    resumeCount: int = 0
+    averageScore: Optional[float] = None
+    candidates: List[CandidateSummary]
+    nextCursor: Optional[str] = None
@@ -1,9 +1,94 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from config import settings
+
+# Hashes whose work factor differs from BCRYPT_ROUNDS count as outdated and
+# are re-hashed on the next successful login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt burns 100+ ms of CPU per call; it runs on these threads, never on
+# the event loop. At most BCRYPT_WORKERS calls run at once and at most
+# BCRYPT_MAX_PENDING wait for a slot, each for up to BCRYPT_QUEUE_TIMEOUT
+# seconds; beyond that the request gets a 503.
+_executor = ThreadPoolExecutor(max_workers=settings.BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+_slots: Optional[asyncio.Semaphore] = None
+_waiting = 0
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        "Too many sign-ins in progress, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def _acquire(slots: asyncio.Semaphore, timeout: float) -> bool:
+    """
+    Wait up to `timeout` seconds for a slot; True once it is held. A slot
+    granted just as the wait times out or is cancelled is handed back:
+    wait_for() before Python 3.11 can drop it, shrinking the pool for good.
+    """
+    acquire = asyncio.ensure_future(slots.acquire())
+    try:
+        await asyncio.wait({acquire}, timeout=timeout)
+    except BaseException:
+        if acquire.done() and not acquire.cancelled():
+            slots.release()
+        else:
+            acquire.cancel()
+        raise
+    if acquire.done():
+        return True
+    # Semaphore.acquire() passes a slot it was just woken for on to the next waiter
+    acquire.cancel()
+    return False
+
+
+async def _run(fn: Callable[..., Any], *args) -> Any:
+    global _slots, _waiting
+    if _slots is None:
+        _slots = asyncio.Semaphore(settings.BCRYPT_WORKERS)
+    if _waiting >= settings.BCRYPT_MAX_PENDING:
+        raise _busy()
+
+    _waiting += 1
+    try:
+        acquired = await _acquire(_slots, settings.BCRYPT_QUEUE_TIMEOUT)
+    finally:
+        _waiting -= 1
+    if not acquired:
+        raise _busy()
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+    finally:
+        _slots.release()
+
+
+async def verify_password(plain_password, hashed_password) -> bool:
+    return await _run(pwd_context.verify, plain_password, hashed_password)
+
+
+async def verify_and_update_password(plain_password, hashed_password) -> Tuple[bool, Optional[str]]:
+    """Verify; also returns a fresh hash when the stored one uses an outdated work factor."""
+    return await _run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
+async def get_password_hash(password) -> str:
+    return await _run(pwd_context.hash, password)
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+def shutdown_password_pool() -> None:
+    _executor.shutdown(wait=False, cancel_futures=True)
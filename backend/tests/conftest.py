@@ -0,0 +1,113 @@
+# tests/conftest.py
+#
+# Run from backend/:  python -m pytest -q
+#
+# No test needs network access or API keys. The LLM is replaced through
+# utils.llm_provider.set_backend(); tests that need MongoDB skip unless a
+# server answers at MONGODB_URL. They only write to the *_test databases
+# and drop them afterwards.
+
+import os
+import sys
+import asyncio
+from typing import Callable, Dict, List, Optional
+
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_SERVER_SELECTION_TIMEOUT_MS", "1000")
+os.environ.setdefault("AUTH_DB_NAME", "auth_db_test")
+os.environ.setdefault("APP_DB_NAME", "app_db_test")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from utils import llm_provider
+from utils.score_cache import score_cache
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model answering each prompt with `reply(prompt text)`; records the prompts."""
+
+    reply: Callable[[str], str]
+    prompts: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        text = "\n".join(str(m.content) for m in messages)
+        self.prompts.append(text)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.reply(text)))])
+
+
+@pytest.fixture(scope="session")
+def loop():
+    # One loop for the whole run: the shared motor client binds to the
+    # loop of its first operation.
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def run(loop):
+    return loop.run_until_complete
+
+
+@pytest.fixture(scope="session")
+def mongo(loop):
+    """The app database; skips the test when MongoDB is not reachable."""
+    from config import settings
+    from db.database import app_db, auth_db
+
+    if not all(db.name.endswith("_test") for db in (app_db, auth_db)):
+        pytest.skip("MongoDB tests only run against *_test databases")
+    async def ping():
+        await app_db.command("ping")
+
+    async def drop():
+        for db in (app_db, auth_db):
+            await db.client.drop_database(db.name)
+
+    try:
+        loop.run_until_complete(ping())
+    except Exception as e:
+        pytest.skip(f"MongoDB not reachable at {settings.MONGODB_URL}: {e}")
+
+    yield app_db
+    loop.run_until_complete(drop())
+
+
+@pytest.fixture
+def scripted_llm():
+    """Install a ScriptedChatModel backend: scripted_llm(reply) -> model."""
+    def install(reply: Callable[[str], str]) -> ScriptedChatModel:
+        model = ScriptedChatModel(reply=reply)
+        llm_provider.set_backend(lambda name, temperature: model)
+        return model
+
+    yield install
+    llm_provider.set_backend(llm_provider._BACKENDS["fake"])
+
+
+@pytest.fixture
+def memory_score_cache(monkeypatch):
+    """Keep the score cache's Mongo tier in a dict for the test."""
+    store: Dict[str, dict] = {}
+
+    async def load(key: str) -> Optional[dict]:
+        return store.get(key)
+
+    async def save(key: str, result: dict) -> bool:
+        store[key] = result
+        return True
+
+    monkeypatch.setattr(score_cache, "_load", load)
+    monkeypatch.setattr(score_cache, "_save", save)
+    score_cache._memory.clear()
+    return store
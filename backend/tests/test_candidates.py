@@ -0,0 +1,56 @@
+# tests/test_candidates.py
+
+from datetime import datetime
+
+from bson import ObjectId
+
+from api.jobs_route import list_candidates
+from db.database import job_profiles
+
+RECRUITER = {"_id": "recruiter"}
+
+
+def _resume(n: int, score=None, similarity=None) -> dict:
+    return {
+        "resumeId":    f"r{n}",
+        "filename":    f"cv{n}.pdf",
+        "name":        "",
+        "email":       "",
+        "score":       score,
+        "similarity":  similarity,
+        "preScreened": score is None,
+    }
+
+
+def test_pre_screened_candidates_page_after_the_scored_ones(mongo, run):
+    job_id = ObjectId()
+    run(job_profiles.insert_one({
+        "_id":         job_id,
+        "recruiterId": RECRUITER["_id"],
+        "createdAt":   datetime.utcnow(),
+        "scoredResumes": [
+            _resume(1, similarity=0.91),    # would outrank every score as 91
+            _resume(2, score=6.0, similarity=0.4),
+            _resume(3, similarity=0.55),
+            _resume(4, score=8.5),
+            _resume(5, score=6.0),
+        ],
+    }))
+
+    async def every_page():
+        pages, cursor = [], None
+        while True:
+            page = await list_candidates(str(job_id), limit=2, cursor=cursor,
+                                         include_reasoning=False, current_user=RECRUITER)
+            pages.append(page)
+            cursor = page.nextCursor
+            if not cursor:
+                return pages
+
+    pages = run(every_page())
+    order = [c.resumeId for page in pages for c in page.candidates]
+
+    assert order == ["r4", "r2", "r5", "r1", "r3"]
+    # the mean covers LLM scores only
+    assert pages[0].averageScore == (8.5 + 6.0 + 6.0) / 3
+    assert pages[0].resumeCount == 5
@@ -0,0 +1,64 @@
+# tests/test_interview_prompt_size.py
+#
+# Drives whole interviews against a scripted LLM and reads the prompt
+# size of every question (InterviewContext.prompt_tokens). Run with -s to
+# see the per-turn report.
+
+import pytest
+
+from api.interview_route import InterviewSession
+from config import settings
+from utils.llm import estimate_tokens
+
+JD     = "We need a backend engineer to own our Python services and data pipelines. " * 200
+RESUME = "Built and ran FastAPI services on MongoDB and Kafka for five years. " * 200
+ANSWER = "In that project I designed the ingestion service, measured it and cut latency in half. " * 12
+
+# what one verbatim Q&A turn adds to a prompt
+TURN_TOKENS = estimate_tokens(ANSWER) + estimate_tokens("Question 20 of 20?") + 40
+
+
+def _reply(prompt: str) -> str:
+    if "You are keeping notes on a job interview" in prompt:
+        return "The candidate described several backend projects in detail. " * 100
+    if "Respond with only the number." in prompt:
+        return "7"
+    return "Can you walk me through how you would scale that service?"
+
+
+async def _interview(questions: int) -> list:
+    session  = InterviewSession(JD, RESUME, max_questions=questions)
+    question = await session.get_response()
+    for n in range(questions):
+        session.add_to_history(question, ANSWER, 7)
+        # the candidate's think time: let the summary fold catch up
+        await session.context.settle()
+        if n < questions - 1:
+            question = await session.get_response(ANSWER)
+    await session.context.aclose()
+    return session.context.prompt_tokens
+
+
+@pytest.mark.parametrize("questions", [8, 20])
+def test_prompt_size_stays_flat_per_turn(run, scripted_llm, questions):
+    scripted_llm(_reply)
+
+    tokens = run(_interview(questions))
+    print(f"\n{questions} questions, prompt tokens per turn: {tokens}")
+
+    # the opening question is canned, every later one is generated
+    assert len(tokens) == questions - 1
+    assert max(tokens) <= settings.INTERVIEW_PROMPT_BUDGET
+    # once the verbatim window is full, older turns only add to the
+    # (bounded) summary: no turn grows the prompt by another Q&A
+    steady = tokens[settings.INTERVIEW_VERBATIM_TURNS:]
+    assert max(steady) - min(steady) < TURN_TOKENS, steady
+
+
+def test_long_interview_prompts_are_no_larger_than_short_ones(run, scripted_llm):
+    scripted_llm(_reply)
+
+    short = run(_interview(8))
+    long  = run(_interview(20))
+
+    assert max(long) < max(short) + TURN_TOKENS
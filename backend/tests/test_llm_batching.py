@@ -0,0 +1,117 @@
+# tests/test_llm_batching.py
+
+import re
+import json
+
+import pytest
+
+from config import settings
+from utils import llm
+from utils.llm import estimate_tokens, llm_score_batch, plan_batches, _PROMPT_OVERHEAD_TOKENS
+
+JD = "Backend engineer: Python, FastAPI, MongoDB. " * 10
+
+
+def _item(n: int, size: int = 40) -> dict:
+    # the score each fake reply gives is encoded in the resume text
+    return {
+        "resume_id":   f"res-{n}",
+        "filename":    f"{n}.pdf",
+        "resume_text": f"SCORE={n} " + "x" * size,
+    }
+
+
+def _batch_reply(prompt: str, skip=()) -> str:
+    """JSON reply covering every resume of a batch prompt, in reverse order."""
+    entries = []
+    for rid, body in re.findall(r"--- Resume id: (r\d+) ---\n(.*?)(?=\n\n--- Resume id:|\n\s*Output Format)", prompt, re.S):
+        score = int(re.search(r"SCORE=(\d+)", body).group(1))
+        if score not in skip:
+            entries.append({"id": rid, "score": score, "name": f"N{score}", "email": f"{score}@x.io", "reason": "ok"})
+    return json.dumps(entries[::-1])
+
+
+def _single_reply(prompt: str) -> str:
+    score = int(re.search(r"SCORE=(\d+)", prompt).group(1))
+    return f"Score: {score}\nName: N{score}\nEmail: {score}@x.io\nReason: single"
+
+
+def _is_batch(prompt: str) -> bool:
+    return "--- Resume id:" in prompt
+
+
+@pytest.fixture(autouse=True)
+def _reset_stats(memory_score_cache):
+    for key in llm.batch_stats:
+        llm.batch_stats[key] = 0.0 if key == "seconds" else 0
+
+
+def test_plan_batches_respects_token_budget_and_size(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_BATCH_TOKEN_BUDGET", estimate_tokens(JD) + _PROMPT_OVERHEAD_TOKENS + 100)
+    monkeypatch.setattr(settings, "LLM_BATCH_MAX_SIZE", 3)
+    items = [_item(n, size=120) for n in range(7)] + [_item(7, size=2000)]
+
+    batches = plan_batches(items, JD)
+
+    # every input is packed exactly once, in order
+    assert [i["resume_id"] for b in batches for i in b] == [i["resume_id"] for i in items]
+    for batch in batches:
+        assert len(batch) <= 3
+        if len(batch) > 1:
+            assert sum(estimate_tokens(i["resume_text"]) for i in batch) <= 100
+    # a resume over the whole budget still goes out, alone
+    assert batches[-1] == [items[-1]]
+
+
+def test_results_map_back_by_id_in_input_order(run, scripted_llm):
+    model = scripted_llm(lambda p: _batch_reply(p) if _is_batch(p) else _single_reply(p))
+    items = [_item(n) for n in range(5)]
+
+    results = run(llm_score_batch(items, JD))
+
+    assert [r["resumeId"] for r in results] == [i["resume_id"] for i in items]
+    assert [r["score"] for r in results] == [0, 1, 2, 3, 4]
+    assert [r["email"] for r in results] == [f"{n}@x.io" for n in range(5)]
+    assert len(model.prompts) == 1 and _is_batch(model.prompts[0])
+
+
+def test_unparseable_batch_falls_back_alone(run, scripted_llm, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_BATCH_MAX_SIZE", 2)
+
+    def reply(prompt: str) -> str:
+        if not _is_batch(prompt):
+            return _single_reply(prompt)
+        return "not json" if "SCORE=2 " in prompt else _batch_reply(prompt)
+
+    model = scripted_llm(reply)
+    results = run(llm_score_batch([_item(n) for n in range(6)], JD))
+
+    assert [r["score"] for r in results] == [0, 1, 2, 3, 4, 5]
+    singles = [p for p in model.prompts if not _is_batch(p)]
+    assert sorted(re.search(r"SCORE=(\d+)", p).group(1) for p in singles) == ["2", "3"]
+    assert llm.batch_stats["batches"] == 3
+    assert llm.batch_stats["fallbacks"] == 2
+
+
+def test_ids_missing_from_reply_are_scored_singly(run, scripted_llm):
+    model = scripted_llm(lambda p: _batch_reply(p, skip={1, 3}) if _is_batch(p) else _single_reply(p))
+
+    results = run(llm_score_batch([_item(n) for n in range(4)], JD))
+
+    assert [r["score"] for r in results] == [0, 1, 2, 3]
+    assert [r["reasoning"] for r in results] == ["ok", "single", "ok", "single"]
+    assert len([p for p in model.prompts if not _is_batch(p)]) == 2
+
+
+def test_cached_results_skip_the_llm_and_savings_are_counted(run, scripted_llm):
+    model = scripted_llm(lambda p: _batch_reply(p) if _is_batch(p) else _single_reply(p))
+    items = [_item(n) for n in range(4)]
+
+    run(llm_score_batch(items, JD))
+    # the JD went out once instead of four times
+    jd_tokens = estimate_tokens(JD) + _PROMPT_OVERHEAD_TOKENS
+    assert llm.batch_stats["promptTokensSaved"] == jd_tokens * 3
+
+    again = run(llm_score_batch(items, JD))
+    assert [r["score"] for r in again] == [0, 1, 2, 3]
+    assert len(model.prompts) == 1
@@ -0,0 +1,158 @@
+# tests/test_query_plans.py
+#
+# explain() every hot query against the registered indexes (db/indexes.py)
+# and fail if its winning plan scans a whole collection. Needs MongoDB;
+# skipped otherwise (see the `mongo` fixture).
+
+from datetime import datetime
+from typing import Any, Iterator
+
+import pytest
+from bson import ObjectId
+
+from db.database import (
+    users_collection, tokens_collection, job_profiles, interview_sessions,
+    resume_contents, ingest_tasks, interview_scores, proctoring_telemetry,
+)
+from db.indexes import ensure_indexes
+from db.ingest_queue import QUEUED, PROCESSING, RESUME
+
+JOB_ID     = ObjectId()
+SESSION_ID = ObjectId()
+NOW        = datetime.utcnow()
+
+
+@pytest.fixture(scope="module")
+def seeded(mongo, loop):
+    # A few documents per collection: explain() of an empty or missing
+    # collection reports EOF, which would hide a missing index.
+    async def seed():
+        await ensure_indexes()
+        await users_collection.insert_many([{"email": f"u{n}@x.io"} for n in range(3)])
+        await tokens_collection.insert_many([{"token": f"t{n}", "expires_at": NOW} for n in range(3)])
+        await job_profiles.insert_many([
+            {
+                "_id":         JOB_ID if n == 0 else ObjectId(),
+                "recruiterId": f"rec{n % 2}",
+                "createdAt":   NOW,
+                "scoredResumes": [{"resumeId": f"r{n}", "score": n, "sessionId": SESSION_ID if n == 0 else None}],
+            }
+            for n in range(3)
+        ])
+        await interview_sessions.insert_many([
+            {"resume_id": f"r{n}", "job_id": str(JOB_ID), "started_at": NOW} for n in range(3)
+        ])
+        await resume_contents.insert_many([{"_id": f"r{n}", "sha256": f"h{n}"} for n in range(3)])
+        await ingest_tasks.insert_many([
+            {"jobId": str(JOB_ID), "kind": RESUME, "status": QUEUED, "createdAt": NOW} for _ in range(3)
+        ])
+        await interview_scores.insert_many([
+            {"session_id": SESSION_ID, "question_number": n} for n in range(3)
+        ])
+        await proctoring_telemetry.insert_many([
+            {"sessionId": SESSION_ID, "start": datetime.utcfromtimestamp(n * 60)} for n in range(3)
+        ])
+
+    loop.run_until_complete(seed())
+    return mongo
+
+
+def _stages(plan: Any) -> Iterator[str]:
+    """Every `stage` of an explain document, skipping rejected plans."""
+    if isinstance(plan, dict):
+        for key, value in plan.items():
+            if key == "stage":
+                yield value
+            elif key != "rejectedPlans":
+                yield from _stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from _stages(value)
+
+
+def _explain(run, db, command: dict) -> list:
+    async def explain():
+        return await db.command("explain", command, verbosity="queryPlanner")
+
+    plan   = run(explain())
+    stages = list(_stages(plan))
+    assert stages, plan
+    return stages
+
+
+QUERIES = {
+    "user by email": (
+        users_collection, {"find": "users", "filter": {"email": "u1@x.io"}},
+    ),
+    "refresh token": (
+        tokens_collection, {"find": "refresh_tokens", "filter": {"token": "t1"}},
+    ),
+    "jobs keyset page": (
+        job_profiles, {"aggregate": "job_profiles", "cursor": {}, "pipeline": [
+            {"$match": {"recruiterId": "rec0", "$or": [
+                {"createdAt": {"$lt": NOW}},
+                {"createdAt": NOW, "_id": {"$lt": JOB_ID}},
+            ]}},
+            {"$sort": {"createdAt": -1, "_id": -1}},
+            {"$limit": 21},
+        ]},
+    ),
+    "job by resume": (
+        job_profiles, {"find": "job_profiles", "filter": {"scoredResumes.resumeId": "r1"}},
+    ),
+    "job by session": (
+        job_profiles, {"update": "job_profiles", "updates": [{
+            "q": {"scoredResumes.sessionId": SESSION_ID},
+            "u": {"$set": {"scoredResumes.$.interviewDone": True}},
+        }]},
+    ),
+    "latest session of a resume": (
+        interview_sessions, {"find": "interview_sessions",
+                             "filter": {"resume_id": "r1", "job_id": str(JOB_ID)},
+                             "sort": {"started_at": -1}, "limit": 1},
+    ),
+    "job analytics": (
+        interview_sessions, {"aggregate": "interview_sessions", "cursor": {}, "pipeline": [
+            {"$match": {"job_id": str(JOB_ID)}},
+            {"$group": {"_id": None, "n": {"$sum": 1}}},
+        ]},
+    ),
+    "content by hash": (
+        resume_contents, {"find": "resume_contents", "filter": {"sha256": "h1"}},
+    ),
+    "claim a task": (
+        ingest_tasks, {"find": "ingest_tasks", "sort": {"createdAt": 1}, "limit": 1, "filter": {"$or": [
+            {"status": QUEUED},
+            {"status": PROCESSING, "leaseUntil": {"$lt": NOW}},
+        ]}},
+    ),
+    "claim within a job": (
+        ingest_tasks, {"find": "ingest_tasks", "sort": {"createdAt": 1}, "limit": 1, "filter": {
+            "jobId": str(JOB_ID),
+            "$or": [{"status": QUEUED}, {"status": PROCESSING, "leaseUntil": {"$lt": NOW}}],
+        }},
+    ),
+    "job progress": (
+        ingest_tasks, {"find": "ingest_tasks", "filter": {"jobId": str(JOB_ID), "kind": RESUME},
+                       "sort": {"createdAt": 1}},
+    ),
+    "turn score upsert": (
+        interview_scores, {"update": "interview_scores", "updates": [{
+            "q": {"session_id": SESSION_ID, "question_number": 1},
+            "u": {"session_id": SESSION_ID, "question_number": 1, "score": 7}, "upsert": True,
+        }]},
+    ),
+    "telemetry bucket upsert": (
+        proctoring_telemetry, {"update": "proctoring_telemetry", "updates": [{
+            "q": {"sessionId": SESSION_ID, "start": datetime.utcfromtimestamp(0)},
+            "u": {"$inc": {"count": 1}}, "upsert": True,
+        }]},
+    ),
+}
+
+
+@pytest.mark.parametrize("name", QUERIES)
+def test_hot_query_uses_an_index(seeded, run, name):
+    collection, command = QUERIES[name]
+    stages = _explain(run, collection.database, command)
+    assert "COLLSCAN" not in stages, f"{name}: {stages}"
@@ -0,0 +1,173 @@
+# tests/test_security.py
+
+import time
+import asyncio
+import threading
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+
+import security
+from config import settings
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool(monkeypatch):
+    # the slot semaphore binds to the loop that first waits on it
+    monkeypatch.setattr(security, "_slots", None)
+    monkeypatch.setattr(security, "_waiting", 0)
+
+
+@pytest.fixture
+def slow_verify(monkeypatch):
+    """pwd_context.verify blocks until the returned event is set."""
+    release = threading.Event()
+
+    def verify(plain, hashed):
+        release.wait(5)
+        return True
+
+    monkeypatch.setattr(security.pwd_context, "verify", verify)
+    yield release
+    release.set()
+
+
+def test_503_once_max_pending_is_exceeded(run, slow_verify, monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_MAX_PENDING", 3)
+
+    async def storm():
+        # every worker busy, then three callers queued behind them
+        calls = []
+        for _ in range(settings.BCRYPT_WORKERS + 3):
+            calls.append(asyncio.create_task(security.verify_password("pw", "hash")))
+            await asyncio.sleep(0.01)
+        try:
+            assert security._waiting == 3
+            with pytest.raises(HTTPException) as busy:
+                await security.verify_password("pw", "hash")
+        finally:
+            slow_verify.set()
+            results = await asyncio.gather(*calls)
+        return busy.value, results
+
+    busy, results = run(storm())
+
+    assert busy.status_code == 503
+    assert busy.headers["Retry-After"] == "1"
+    # the admitted ones all complete once the workers free up
+    assert all(results)
+    assert security._waiting == 0
+
+
+def test_503_after_waiting_queue_timeout(run, slow_verify, monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_QUEUE_TIMEOUT", 0.1)
+
+    async def storm():
+        held = [asyncio.create_task(security.verify_password("pw", "hash"))
+                for _ in range(settings.BCRYPT_WORKERS)]
+        await asyncio.sleep(0.05)
+        try:
+            with pytest.raises(HTTPException) as busy:
+                await security.verify_password("pw", "hash")
+        finally:
+            slow_verify.set()
+            await asyncio.gather(*held)
+        return busy.value
+
+    assert run(storm()).status_code == 503
+
+
+def test_a_slot_granted_to_a_cancelled_waiter_is_not_lost(run, monkeypatch):
+    slots = asyncio.Semaphore(1)
+    monkeypatch.setattr(security, "_slots", slots)
+
+    async def race():
+        await slots.acquire()
+        waiter = asyncio.create_task(security.verify_password("pw", "hash"))
+        await asyncio.sleep(0.01)
+        # the slot is handed to the waiter in the same step it is cancelled
+        slots.release()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.wait_for(slots.acquire(), 1)
+        slots.release()
+
+    run(race())
+    assert security._waiting == 0
+
+
+def test_503_storms_do_not_shrink_the_pool(run, slow_verify, monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_QUEUE_TIMEOUT", 0.01)
+
+    async def storms():
+        for _ in range(5):
+            held = [asyncio.create_task(security.verify_password("pw", "hash"))
+                    for _ in range(settings.BCRYPT_WORKERS)]
+            queued = [asyncio.create_task(security.verify_password("pw", "hash"))
+                      for _ in range(3)]
+            await asyncio.sleep(0.02)
+            slow_verify.set()
+            await asyncio.gather(*held, *queued, return_exceptions=True)
+            slow_verify.clear()
+
+    run(storms())
+    assert security._slots._value == settings.BCRYPT_WORKERS
+
+
+def test_outdated_work_factor_is_rehashed_on_login(run):
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("s3cret")
+
+    ok, new_hash = run(security.verify_and_update_password("s3cret", old_hash))
+    assert ok
+    assert new_hash and new_hash.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+
+    # the fresh hash is current: verified, nothing to update
+    assert run(security.verify_and_update_password("s3cret", new_hash)) == (True, None)
+    # a wrong password is never rehashed
+    assert run(security.verify_and_update_password("wrong", old_hash)) == (False, None)
+
+
+def test_websocket_latency_during_login_storm():
+    password = "s3cret"
+    hashed   = security.pwd_context.hash(password)
+    app      = FastAPI()
+
+    @app.post("/login")
+    async def login():
+        try:
+            return {"ok": await security.verify_password(password, hashed)}
+        except HTTPException as e:
+            return {"ok": False, "status": e.status_code}
+
+    @app.websocket("/ws")
+    async def echo(websocket: WebSocket):
+        await websocket.accept()
+        try:
+            while True:
+                await websocket.send_text(await websocket.receive_text())
+        except WebSocketDisconnect:
+            pass
+
+    logins = settings.BCRYPT_WORKERS * 8
+    with TestClient(app) as client, client.websocket_connect("/ws") as ws:
+        with ThreadPoolExecutor(max_workers=logins) as pool:
+            storm = [pool.submit(client.post, "/login") for _ in range(logins)]
+            latencies = []
+            while not all(f.done() for f in storm):
+                started = time.perf_counter()
+                ws.send_text("ping")
+                assert ws.receive_text() == "ping"
+                latencies.append(time.perf_counter() - started)
+                time.sleep(0.01)
+            results = [f.result().json() for f in storm]
+
+    assert all(r["ok"] for r in results)
+    # bcrypt on the event loop would stall every echo for 100+ ms per hash
+    assert len(latencies) >= 10
+    assert statistics.median(latencies) < 0.05, latencies
+    assert max(latencies) < 0.25, latencies
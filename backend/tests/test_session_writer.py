@@ -0,0 +1,65 @@
+# tests/test_session_writer.py
+
+from datetime import datetime
+
+from bson import ObjectId
+
+from db.database import interview_scores, interview_sessions
+from utils.session_writer import SessionWriter
+
+
+def _turn(n: int) -> dict:
+    return {
+        "question_number": n,
+        "question":        f"Q{n}?",
+        "answer":          f"A{n}",
+        "score":           n,
+        "stage":           "introduction",
+        "timestamp":       datetime.utcnow(),
+    }
+
+
+def test_each_flush_is_one_session_write(mongo, run, monkeypatch):
+    session_id = ObjectId()
+    run(interview_sessions.insert_one({"_id": session_id, "history": [], "stage_progression": []}))
+    writer = SessionWriter(session_id, "job", "resume", interval=60)
+
+    writes = []
+    update_one = interview_sessions.update_one
+
+    def counted(*args, **kwargs):
+        writes.append(args)
+        return update_one(*args, **kwargs)
+
+    monkeypatch.setattr(interview_sessions, "update_one", counted)
+
+    async def turns():
+        for n in (1, 2):
+            writer.add_turn(_turn(n))
+            await writer.flush()
+        await writer.close()
+        doc  = await interview_sessions.find_one({"_id": session_id})
+        rows = await interview_scores.count_documents({"session_id": session_id})
+        return doc, rows
+
+    doc, rows = run(turns())
+    # one round trip per turn, nothing left for close(), no score rows yet
+    assert len(writes) == 2
+    assert [h["question_number"] for h in doc["history"]] == [1, 2]
+    assert [s["question_number"] for s in doc["stage_progression"]] == [1, 2]
+    assert rows == 0
+
+
+def test_score_rows_come_from_the_final_history_once(mongo, run):
+    session_id = ObjectId()
+    writer  = SessionWriter(session_id, "job", "resume", interval=60)
+    history = [_turn(1), _turn(2)]
+
+    async def finalized():
+        # e.g. a finalization retried after its claim was released
+        for _ in range(2):
+            await writer.write_scores(history)
+        return await interview_scores.find({"session_id": session_id}).sort("question_number", 1).to_list(None)
+
+    rows = run(finalized())
+    assert [(r["question_number"], r["score"], r["job_id"]) for r in rows] == [(1, 1, "job"), (2, 2, "job")]
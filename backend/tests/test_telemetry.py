@@ -0,0 +1,52 @@
+# tests/test_telemetry.py
+
+import pytest
+
+from utils.proctoring import ProctoringAggregator
+from utils.telemetry import TelemetryBuffer
+
+
+@pytest.fixture
+def buffer() -> TelemetryBuffer:
+    aggregator = ProctoringAggregator(grid=4, window_ms=500, fixation_px=100)
+    return TelemetryBuffer("session", bucket_seconds=60, interval=10, max_samples=100, aggregator=aggregator)
+
+
+def _buffered(buffer: TelemetryBuffer, stream: str, column: str) -> list:
+    return [v for bucket in buffer._buckets.values() for v in bucket[stream][column]]
+
+
+@pytest.mark.parametrize("msg", [
+    {"type": "gaze", "x": None, "y": 10},
+    {"type": "gaze", "x": "left", "y": 10},
+    {"type": "object-detect", "people": None},
+    {"type": "telemetry", "events": [{"type": "tab-switch", "t": "soon"}]},
+    {"type": "telemetry", "events": ["tab-switch"]},
+    {"type": "telemetry", "gaze": {"t": [1000], "x": [None], "y": [5]}},
+    {"type": "telemetry", "gaze": {"t": [1000], "x": "12", "y": [5]}},
+    {"type": "telemetry", "gaze": [1, 2, 3]},
+])
+def test_malformed_samples_are_dropped_not_raised(buffer, msg):
+    buffer.add(msg)
+
+    assert buffer.stats["dropped"] >= 1
+    assert buffer.stats["samples"] == 0
+    assert buffer.pending == 0
+    assert buffer.aggregator.summary()["gazeSamples"] == 0
+
+
+def test_good_samples_of_a_frame_survive_bad_ones(buffer):
+    buffer.add({
+        "type":     "telemetry",
+        "sentAt":   "not a time",
+        "viewport": {"w": "wide", "h": 800},
+        "gaze":     {"t": [1000, 1100, 1200], "x": [10, None, "30.4"], "y": [20, 25, 30]},
+        "objects":  {"t": [1000], "people": [1], "phones": [0]},
+        "events":   [{"type": "tab-switch", "t": 1150}, {"type": "warning", "t": None}],
+    })
+
+    assert buffer.stats["dropped"] == 2
+    assert buffer.stats["samples"] == 4
+    assert sorted(_buffered(buffer, "gaze", "x")) == [10, 30]
+    assert buffer.aggregator.viewport is None
+    assert buffer.aggregator.summary()["eventTotals"]["tab-switch"] == 1
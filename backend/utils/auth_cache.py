@@ -0,0 +1,72 @@
+# utils/auth_cache.py
+
+from datetime import datetime
+from typing import Optional
+
+from cachetools import TTLCache
+
+from config import settings
+
+_TOKEN_TTL = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+
+class AuthCache:
+    """
+    In-process caches behind get_current_user: verified access tokens
+    (subject and expiry, kept until the token expires) and user records by
+    subject. User entries are short-lived so changes made by another
+    process show up within AUTH_USER_CACHE_TTL; changes made here
+    invalidate them explicitly.
+    """
+
+    def __init__(self, token_size: int, user_size: int, user_ttl: int):
+        self._tokens  = TTLCache(maxsize=token_size, ttl=_TOKEN_TTL)
+        self._revoked = TTLCache(maxsize=token_size, ttl=_TOKEN_TTL)
+        self._users   = TTLCache(maxsize=user_size, ttl=user_ttl)
+        self.stats = {
+            "tokenHits": 0, "tokenMisses": 0,
+            "userHits": 0, "userMisses": 0,
+            "invalidations": 0, "revocations": 0,
+        }
+
+    def get_subject(self, token: str) -> Optional[str]:
+        entry = self._tokens.get(token)
+        if entry is not None and entry[1] > datetime.utcnow().timestamp():
+            self.stats["tokenHits"] += 1
+            return entry[0]
+        self.stats["tokenMisses"] += 1
+        return None
+
+    def put_subject(self, token: str, subject: str, expires_at: float) -> None:
+        self._tokens[token] = (subject, expires_at)
+
+    def is_revoked(self, token: str) -> bool:
+        return token in self._revoked
+
+    def revoke(self, token: str) -> None:
+        """Reject this access token from now on (logout)."""
+        entry = self._tokens.pop(token, None)
+        self._revoked[token] = True
+        if entry:
+            self.invalidate_user(entry[0])
+        self.stats["revocations"] += 1
+
+    def get_user(self, subject: str) -> Optional[dict]:
+        user = self._users.get(subject)
+        self.stats["userHits" if user is not None else "userMisses"] += 1
+        return user
+
+    def put_user(self, subject: str, user: dict) -> dict:
+        # never keep password hashes around in memory
+        user = {k: v for k, v in user.items() if k != "hashed_password"}
+        self._users[subject] = user
+        return user
+
+    def invalidate_user(self, subject: str) -> None:
+        if self._users.pop(subject, None) is not None:
+            self.stats["invalidations"] += 1
+
+
+auth_cache = AuthCache(
+    settings.AUTH_TOKEN_CACHE_SIZE, settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL
+)
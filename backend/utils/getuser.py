@@ -1,24 +1,38 @@
-from fastapi import Depends, HTTPException, Request
+from fastapi import HTTPException, Request
 from jose import jwt, JWTError
 from db.user_crud import get_user_by_email
 from config import settings
+from utils.auth_cache import auth_cache
 
 
-def get_current_user(request: Request):
+async def get_current_user(request: Request) -> dict:
+    """
+    The shared auth dependency: resolves the access_token cookie to the
+    user record. Verified tokens and user records are served from
+    auth_cache, so a warm request makes no database round trip.
+    """
     token = request.cookies.get("access_token")
     if not token:
         raise HTTPException(status_code=401, detail="Not authenticated")  # Fixed typo
+    if auth_cache.is_revoked(token):
+        raise HTTPException(status_code=401, detail="Invalid token")
 
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        email = payload.get("sub")
-        if email is None:
+    email = auth_cache.get_subject(token)
+    if email is None:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            email = payload.get("sub")
+            if email is None:
+                raise HTTPException(status_code=401, detail="Invalid token")
+        except JWTError:
             raise HTTPException(status_code=401, detail="Invalid token")
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+        auth_cache.put_subject(token, email, payload["exp"])
 
-    user = get_user_by_email(email)
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
+    user = auth_cache.get_user(email)
+    if user is None:
+        user = await get_user_by_email(email)
+        if not user:
+            raise HTTPException(status_code=401, detail="User not found")
+        user = auth_cache.put_user(email, user)
 
-    return user
\ No newline at end of file
+    return user
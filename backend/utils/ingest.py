@@ -0,0 +1,356 @@
+# utils/ingest.py
+
+import asyncio
+import hashlib
+import logging
+from typing   import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from fastapi  import UploadFile, HTTPException, status
+from gridfs.errors import NoFile
+
+from config           import settings
+from utils.pdf_parser import extract_pdf
+from utils.llm        import llm_score_batch
+from db.vector_db     import index_resume_batch, similarity_scores
+from db.database      import get_fs
+from db.content_index import content_hash, find_by_hash, register_content, mark_indexed
+
+logger = logging.getLogger(__name__)
+
+
+async def stage_upload(file: UploadFile) -> Dict[str, Any]:
+    """
+    Stream an uploaded PDF into GridFS chunk by chunk, hashing it on the
+    way, so the whole file is never held in memory. Files larger than
+    MAX_UPLOAD_BYTES are rejected as soon as the cap is crossed.
+    """
+    grid_in = get_fs().open_upload_stream(
+        file.filename,
+        metadata={"contentType": file.content_type},
+    )
+    hasher, size = hashlib.sha256(), 0
+    try:
+        while True:
+            chunk = await file.read(settings.UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > settings.MAX_UPLOAD_BYTES:
+                raise HTTPException(
+                    status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    f"'{file.filename}' exceeds the {settings.MAX_UPLOAD_BYTES} byte limit"
+                )
+            hasher.update(chunk)
+            await grid_in.write(chunk)
+        if not size:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, f"'{file.filename}' is empty")
+        await grid_in.close()
+    except BaseException:
+        await grid_in.abort()
+        raise
+
+    return {
+        "fileId":      grid_in._id,
+        "filename":    file.filename,
+        "contentType": file.content_type,
+        "sha256":      hasher.hexdigest(),
+        "size":        size,
+    }
+
+
+async def _read_file(file_id) -> bytes:
+    grid_out = await get_fs().open_download_stream(file_id)
+    return await grid_out.read()
+
+
+# ── Pipeline engine ────────────────────────────────────────────────
+
+_DONE = object()
+
+
+class Stage:
+    """
+    One step of a pipeline, run by `concurrency` workers.
+
+    With `batch_size` set, the handler receives a list of up to that many
+    items: a worker waits at most `linger` seconds for a batch to fill.
+    """
+
+    def __init__(self, name: str, handler: Callable[[Any], Awaitable[None]], concurrency: int,
+                 batch_size: Optional[int] = None, linger: float = 0.0):
+        self.name        = name
+        self.handler     = handler
+        self.concurrency = max(1, concurrency)
+        self.batch_size  = batch_size
+        self.linger      = linger
+
+
+async def _next_batch(queue: asyncio.Queue, stage: Stage) -> Tuple[List[dict], bool]:
+    """Take up to `stage.batch_size` items; the flag is True once _DONE was seen."""
+    first = await queue.get()
+    if first is _DONE:
+        return [], True
+    batch    = [first]
+    loop     = asyncio.get_running_loop()
+    deadline = loop.time() + stage.linger
+    while len(batch) < stage.batch_size:
+        try:
+            item = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            if loop.time() >= deadline:
+                break
+            await asyncio.sleep(0.01)
+            continue
+        if item is _DONE:
+            return batch, True
+        batch.append(item)
+    return batch, False
+
+
+async def run_pipeline(items: List[dict], stages: List[Stage], queue_size: int) -> List[dict]:
+    """
+    Push every item through `stages` in order. Stages are connected by
+    bounded queues so a slow stage applies back-pressure upstream instead
+    of letting work pile up in memory. Handlers mutate the item in place.
+
+    If a handler raises, the item is tagged with `error` and `failedStage`
+    and skips the remaining stages; the rest of the batch carries on.
+    Items are returned in input order.
+    """
+    if not items:
+        return []
+
+    queues   = [asyncio.Queue(maxsize=max(1, queue_size)) for _ in stages]
+    finished: List[dict] = []
+
+    async def feed():
+        for item in items:
+            await queues[0].put(item)
+        for _ in range(stages[0].concurrency):
+            await queues[0].put(_DONE)
+
+    async def work(i: int, stage: Stage):
+        last = i == len(stages) - 1
+        done = False
+        while not done:
+            if stage.batch_size:
+                batch, done = await _next_batch(queues[i], stage)
+            else:
+                item = await queues[i].get()
+                batch, done = ([], True) if item is _DONE else ([item], False)
+            if not batch:
+                continue
+            try:
+                await stage.handler(batch if stage.batch_size else batch[0])
+            except Exception as e:
+                detail = getattr(e, "detail", None) or str(e)
+                for item in batch:
+                    logger.warning(f"Ingestion stage '{stage.name}' failed for {item.get('filename')}: {detail}")
+                    item["error"]       = detail
+                    item["failedStage"] = stage.name
+            for item in batch:
+                if last or "error" in item:
+                    finished.append(item)
+                else:
+                    await queues[i + 1].put(item)
+
+    async def run_stage(i: int, stage: Stage):
+        await asyncio.gather(*(work(i, stage) for _ in range(stage.concurrency)))
+        if i + 1 < len(stages):
+            for _ in range(stages[i + 1].concurrency):
+                await queues[i + 1].put(_DONE)
+
+    await asyncio.gather(feed(), *(run_stage(i, s) for i, s in enumerate(stages)))
+
+    order = {id(item): n for n, item in enumerate(items)}
+    finished.sort(key=lambda item: order[id(item)])
+    return finished
+
+
+# ── Resume ingestion ───────────────────────────────────────────────
+
+def file_entry(item: dict) -> Dict[str, Any]:
+    """`files` entry of the job document for an ingested item."""
+    return {
+        "fileId":   item["fileId"],
+        "filename": item["filename"],
+        "fileType": item["contentType"],
+        "taskId":   item.get("taskId"),
+    }
+
+
+def scored_entry(item: dict) -> Dict[str, Any]:
+    """
+    `scoredResumes` entry of the job document for an ingested item. The
+    resume text and the LLM's reasoning are stored outside the job (see
+    db.resume_store).
+    """
+    score_result = item["scoreResult"]
+    return {
+        "resumeId":  item["resumeId"],
+        "filename":  item["filename"],
+        "name":      score_result["name"],
+        "email":     score_result["email"],
+        "score":     score_result["score"],
+        "similarity":  item.get("similarity"),
+        "preScreened": item.get("preScreened", False),
+        "interviewDone": False,
+        "sessionId":     None,
+    }
+
+
+async def ingest_resumes(
+    items: List[dict],
+    job_desc: str,
+    existing_ids: Iterable[str] = (),
+    commit: Optional[Callable[[dict], Awaitable[None]]] = None,
+    cascade: Optional[Dict[str, Any]] = None,
+) -> List[dict]:
+    """
+    Parse, register, vector-index and score staged resumes through a
+    bounded-parallel pipeline. Each item carries the staged GridFS
+    `fileId`, `filename`, `contentType` and, when known, `sha256`; `commit`, if given, runs as
+    the last stage for every item that made it through.
+
+    Uploads are content-addressed: a PDF whose bytes were ingested before
+    (for any job) reuses the stored GridFS file, text, email and vectors,
+    and only goes through job-specific scoring; the staged copy is
+    dropped. A resume already attached to the job (`existing_ids`) or
+    repeated in the batch is failed instead of being scored twice.
+
+    With `cascade` ({jobId, topK, threshold}) resumes are not LLM-scored
+    here: each is scored by vector similarity to the job description and
+    flagged `preScreened`. Which of them reach the LLM is decided across
+    the whole job once all its resumes are in (see
+    utils.ingest_worker.rank_job). If the JD has no vectors, the batch is
+    LLM-scored as without cascade.
+
+    Returns the items in input order; failed ones carry `error` and
+    `failedStage`.
+    """
+    seen = set(existing_ids)
+
+    def reuse(item: dict, content: dict):
+        item.update(
+            fileId=content["fileId"],
+            resumeId=content["_id"],
+            text=content["text"],
+            embeddedEmail=content.get("email"),
+            needsIndex=False,
+        )
+
+    async def drop_staged(item: dict, content: dict):
+        # A retried task may find its own staged file already registered,
+        # or already dropped by the attempt that crashed before committing.
+        if content["fileId"] != item["fileId"]:
+            try:
+                await get_fs().delete(item["fileId"])
+            except NoFile:
+                pass
+        reuse(item, content)
+
+    async def parse(item: dict):
+        # The upload path hashes while streaming; only re-read to hash
+        # files staged without one.
+        raw = None
+        if not item.get("sha256"):
+            raw = await _read_file(item["fileId"])
+            if not raw:
+                raise HTTPException(status.HTTP_400_BAD_REQUEST, f"'{item['filename']}' is empty")
+            item["sha256"] = content_hash(raw)
+
+        content = await find_by_hash(item["sha256"])
+        if content:
+            await drop_staged(item, content)
+            item["needsIndex"] = not content.get("indexed")
+            return
+
+        if raw is None:
+            raw = await _read_file(item["fileId"])
+        parsed = await extract_pdf(raw, item["filename"])
+        item.update(
+            text=parsed["text"],
+            embeddedEmail=parsed["email"],
+            pageCount=parsed["pageCount"],
+            needsIndex=True,
+        )
+
+    async def register(item: dict):
+        if "resumeId" not in item:
+            content = await register_content(
+                str(item["fileId"]), item["sha256"], item["fileId"],
+                item["filename"], item["text"], item["embeddedEmail"], item["pageCount"],
+            )
+            if content["fileId"] != item["fileId"]:
+                # Same bytes were registered concurrently; keep theirs.
+                await drop_staged(item, content)
+            else:
+                item["resumeId"] = str(item["fileId"])
+
+        if item["resumeId"] in seen:
+            raise Exception(f"'{item['filename']}' duplicates a resume already in this job")
+        seen.add(item["resumeId"])
+
+    async def index(batch: List[dict]):
+        todo = [item for item in batch if item["needsIndex"]]
+        if todo:
+            await asyncio.to_thread(
+                index_resume_batch, [(item["resumeId"], item["text"]) for item in todo]
+            )
+            for item in todo:
+                await mark_indexed(item["resumeId"])
+
+    async def rank(batch: List[dict]):
+        try:
+            sims = await asyncio.to_thread(
+                similarity_scores, cascade["jobId"], [item["resumeId"] for item in batch]
+            )
+        except Exception as e:
+            logger.warning(f"Ranking job {cascade['jobId']} failed: {e}")
+            sims = {}
+        if not sims:
+            logger.warning(f"No vectors to rank job {cascade['jobId']}; LLM-scoring every resume")
+            return
+
+        for item in batch:
+            item["similarity"]  = round(sims.get(item["resumeId"], 0.0), 4)
+            item["preScreened"] = True
+            item["scoreResult"] = {
+                "name":      "",
+                "email":     item["embeddedEmail"] or "",
+                "score":     None,      # similarity is another scale; see `similarity`
+                "reasoning": f"Pre-screened by vector similarity ({item['similarity']:.2f}); not LLM-scored.",
+            }
+
+    async def score(batch: List[dict]):
+        batch = [item for item in batch if not item.get("preScreened")]
+        if not batch:
+            return
+        results = await llm_score_batch([
+            {
+                "resume_id":      item["resumeId"],
+                "filename":       item["filename"],
+                "resume_text":    item["text"],
+                "override_email": item["embeddedEmail"],
+            }
+            for item in batch
+        ], job_desc)
+        for item, result in zip(batch, results):
+            item["scoreResult"] = result
+
+    stages = [
+        Stage("parse",    parse,    settings.INGEST_PARSE_CONCURRENCY),
+        Stage("register", register, settings.INGEST_STORE_CONCURRENCY),
+        Stage("index",    index,    settings.INGEST_EMBED_CONCURRENCY,
+              batch_size=settings.INGEST_EMBED_BATCH, linger=settings.INGEST_EMBED_LINGER),
+    ]
+    if cascade:
+        # A barrier: ranking needs every resume of the batch indexed first.
+        stages.append(Stage("rank", rank, 1, batch_size=len(items), linger=float("inf")))
+    stages += [
+        Stage("score",    score,    settings.INGEST_SCORE_CONCURRENCY,
+              batch_size=settings.LLM_BATCH_MAX_SIZE, linger=settings.INGEST_SCORE_LINGER),
+    ]
+    if commit:
+        stages.append(Stage("commit", commit, settings.INGEST_STORE_CONCURRENCY))
+
+    return await run_pipeline(items, stages, settings.INGEST_QUEUE_SIZE)
@@ -0,0 +1,224 @@
+# utils/ingest_worker.py
+#
+# Background consumer of the `ingest_tasks` queue. Runs inside the API
+# process (see app.py lifespan) or standalone:
+#
+#     python -m utils.ingest_worker
+
+import os
+import socket
+import asyncio
+import logging
+from typing import List, Optional
+
+from bson import ObjectId
+
+from config import settings
+from db import ingest_queue
+from db.database import job_profiles
+from db.resume_store import get_resume_text
+from db.vector_db import index_job_description_chunks
+from utils.ingest import ingest_resumes, file_entry, scored_entry
+from utils.llm import llm_score_batch
+
+logger = logging.getLogger(__name__)
+
+_wakeup: Optional[asyncio.Event] = None
+
+
+def wake_worker() -> None:
+    """Nudge an in-process worker to poll the queue right away."""
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+async def _keep_leases(task_ids: List) -> None:
+    while True:
+        await asyncio.sleep(settings.INGEST_LEASE_SECONDS / 3)
+        await ingest_queue.renew_lease(task_ids)
+
+
+def job_cascade(job: dict) -> Optional[dict]:
+    """The job's cascade settings, falling back to CASCADE_* defaults; None if off."""
+    config    = job.get("cascade") or {}
+    top_k     = config.get("topK", settings.CASCADE_TOP_K)
+    threshold = config.get("threshold", settings.CASCADE_THRESHOLD)
+    if top_k is None and threshold is None:
+        return None
+    return {"jobId": str(job["_id"]), "topK": top_k, "threshold": threshold}
+
+
+async def process_batch(job_id: str, tasks: List[dict], worker_id: str) -> None:
+    job = await job_profiles.find_one({"_id": ObjectId(job_id)}, {
+        "description":               1,
+        "cascade":                   1,
+        "files.taskId":              1,
+        "files.fileId":              1,
+        "scoredResumes.resumeId":    1,
+        "scoredResumes.preScreened": 1,
+    })
+    if not job:
+        for t in tasks:
+            await ingest_queue.fail_task(t["_id"], "job", "Job no longer exists")
+        return
+
+    # Description tasks: (re-)index the current JD.
+    for t in (t for t in tasks if t["kind"] == ingest_queue.DESCRIPTION):
+        try:
+            await asyncio.to_thread(index_job_description_chunks, job_id, job["description"])
+            await ingest_queue.complete_task(t["_id"])
+        except Exception as e:
+            logger.warning(f"Indexing description of job {job_id} failed: {e}")
+            await ingest_queue.fail_task(t["_id"], "index", str(e))
+
+    # Resume tasks whose result reached the job before a crash are done.
+    committed = {f.get("taskId"): str(f["fileId"]) for f in job.get("files", [])}
+    items = []
+    for t in (t for t in tasks if t["kind"] == ingest_queue.RESUME):
+        if t["_id"] in committed:
+            await ingest_queue.complete_task(t["_id"], committed[t["_id"]])
+            continue
+        items.append({
+            "taskId":      t["_id"],
+            "fileId":      t["fileId"],
+            "filename":    t["filename"],
+            "contentType": t["contentType"],
+            "sha256":      t.get("sha256"),
+        })
+
+    cascade = job_cascade(job)
+    if cascade:
+        await ingest_queue.init_llm_budget(
+            job_id, sum(1 for r in job.get("scoredResumes", []) if not r.get("preScreened"))
+        )
+
+    async def commit(item: dict):
+        await ingest_queue.append_resume(
+            job_id, file_entry(item), scored_entry(item), item["scoreResult"]["reasoning"],
+            count_llm=cascade is not None and not item.get("preScreened"),
+        )
+        await ingest_queue.complete_task(item["taskId"], item["resumeId"])
+
+    results = await ingest_resumes(
+        items,
+        job["description"],
+        existing_ids=[r["resumeId"] for r in job.get("scoredResumes", [])],
+        commit=commit,
+        cascade=cascade,
+    )
+    for item in results:
+        if "error" in item:
+            await ingest_queue.fail_task(item["taskId"], item["failedStage"], item["error"])
+
+    if cascade and any(t["kind"] == ingest_queue.RESUME for t in tasks):
+        await rank_job(job_id, worker_id)
+
+
+async def rank_job(job_id: str, worker_id: str) -> None:
+    """
+    Cascade ranking across the whole job, run by whichever worker sees the
+    job's last resume task finish: the pre-screened resumes with the best
+    similarity (at or above the threshold) are LLM-scored, up to the
+    job's remaining top-K budget. Later uploads rank again, so a better
+    resume arriving late is still promoted while budget is left.
+    """
+    while not await ingest_queue.has_pending_resumes(job_id):
+        if not await ingest_queue.claim_ranking(job_id, worker_id):
+            return      # the holder re-runs it
+        try:
+            await _promote_top_k(job_id)
+        finally:
+            stale = await ingest_queue.release_ranking(job_id, worker_id)
+        if not stale:
+            return
+
+
+async def _promote_top_k(job_id: str) -> None:
+    job = await job_profiles.find_one({"_id": ObjectId(job_id)}, {
+        "description":               1,
+        "cascade":                   1,
+        "scoredResumes.resumeId":    1,
+        "scoredResumes.filename":    1,
+        "scoredResumes.email":       1,
+        "scoredResumes.similarity":  1,
+        "scoredResumes.preScreened": 1,
+    })
+    cascade = job_cascade(job) if job else None
+    if not cascade:
+        return
+
+    threshold  = cascade["threshold"]
+    candidates = sorted(
+        (r for r in job.get("scoredResumes", [])
+         if r.get("preScreened") and r.get("similarity") is not None
+         and (threshold is None or r["similarity"] >= threshold)),
+        key=lambda r: r["similarity"], reverse=True,
+    )
+    if cascade["topK"] is not None:
+        reserved   = await ingest_queue.reserve_llm_budget(job_id, cascade["topK"], len(candidates))
+        candidates = candidates[:reserved]
+    if not candidates:
+        return
+
+    items = []
+    for r in candidates:
+        text = await get_resume_text(r["resumeId"])
+        if text is not None:
+            items.append({
+                "resume_id":      r["resumeId"],
+                "filename":       r["filename"],
+                "resume_text":    text,
+                "override_email": r.get("email") or None,
+            })
+    results  = await llm_score_batch(items, job["description"]) if items else []
+    promoted = 0
+    for item, result in zip(items, results):
+        promoted += await ingest_queue.promote_resume(job_id, item["resume_id"], result)
+    if cascade["topK"] is not None:
+        await ingest_queue.release_llm_budget(job_id, len(candidates) - promoted)
+    logger.info(f"Cascade ranking of job {job_id} promoted {promoted} resume(s) to LLM scoring")
+
+
+async def run_worker(stop: Optional[asyncio.Event] = None) -> None:
+    """Claim and process queued work until `stop` is set."""
+    global _wakeup
+    _wakeup   = asyncio.Event()
+    stop      = stop or asyncio.Event()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    logger.info(f"Ingestion worker {worker_id} started")
+
+    while not stop.is_set():
+        try:
+            job_id, tasks = await ingest_queue.claim_batch(worker_id, settings.INGEST_CLAIM_LIMIT)
+        except Exception as e:
+            logger.error(f"Claiming ingestion tasks failed: {e}")
+            job_id, tasks = None, []
+
+        if not tasks:
+            _wakeup.clear()
+            try:
+                await asyncio.wait_for(_wakeup.wait(), timeout=settings.INGEST_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        leases = asyncio.create_task(_keep_leases([t["_id"] for t in tasks]))
+        try:
+            await process_batch(job_id, tasks, worker_id)
+        except Exception as e:
+            # Leases lapse and another attempt picks the tasks up again.
+            logger.error(f"Ingestion batch for job {job_id} crashed: {e}")
+        finally:
+            leases.cancel()
+
+
+async def _main() -> None:
+    from db.indexes import ensure_indexes
+
+    await ensure_indexes()
+    await run_worker()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main())
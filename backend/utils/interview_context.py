@@ -0,0 +1,104 @@
+# utils/interview_context.py
+
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+from utils.llm import estimate_tokens
+from utils.llm_provider import get_chat_model
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PROMPT = """
+You are keeping notes on a job interview in progress.
+
+Notes so far:
+{summary}
+
+New questions and answers:
+{transcript}
+
+Rewrite the notes to include the new answers. Keep concrete facts the candidate
+stated (projects, technologies, numbers, decisions), strengths and weak spots.
+At most {max_words} words, plain text, no preamble.
+"""
+
+
+def clip_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` to roughly `max_tokens` tokens (same estimate as estimate_tokens)."""
+    max_chars = max(0, max_tokens) * 4
+    return text if len(text) <= max_chars else text[:max_chars].rstrip() + " …"
+
+
+class InterviewContext:
+    """
+    Keeps the conversation part of interview prompts within a token
+    budget. Recent Q&A turns go in verbatim; turns that fall out of the
+    `keep_turns` window are folded into a running summary by a background
+    task, so generating the next question never waits for it.
+    """
+
+    def __init__(self, budget: int, keep_turns: int, summary_tokens: int):
+        self.budget         = budget
+        self.keep_turns     = keep_turns
+        self.summary_tokens = summary_tokens
+        self.summary        = ""
+        self.summarized     = 0          # leading turns already folded into the summary
+        self.prompt_tokens: List[int] = []
+        self._history: List[dict] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def update(self, history: List[dict]) -> None:
+        """Start folding turns older than the verbatim window, unless a fold is running."""
+        self._history = history
+        if self._task and not self._task.done():
+            return          # picked up when the running fold finishes
+        upto = len(history) - self.keep_turns
+        if upto > self.summarized:
+            self._task = asyncio.create_task(self._fold(upto))
+
+    async def _fold(self, upto: int) -> None:
+        turns = self._history[self.summarized:upto]
+        transcript = "\n".join(f"Q: {t['question']}\nA: {t['answer']}" for t in turns)
+        try:
+            res = await get_chat_model().ainvoke(SUMMARY_PROMPT.format(
+                summary=self.summary or "(none yet)",
+                transcript=transcript,
+                max_words=self.summary_tokens * 3 // 4,
+            ))
+            self.summary    = clip_tokens(res.content.strip(), self.summary_tokens)
+            self.summarized = upto
+        except Exception as e:
+            logger.warning(f"Interview summary update failed: {e}")
+            return
+        self._task = None
+        self.update(self._history)
+
+    def compose(self, history: List[dict], used_tokens: int) -> Tuple[str, List[dict]]:
+        """
+        Pick the summary and the verbatim turns for the next prompt, given
+        `used_tokens` already spent on the rest of it. Newest turns win;
+        turns not yet summarized stay verbatim while they fit.
+        """
+        room  = self.budget - used_tokens
+        turns: List[dict] = []
+        for turn in reversed(history[self.summarized:]):
+            cost = estimate_tokens(turn["question"]) + estimate_tokens(turn["answer"]) + 10
+            if turns and cost > room:
+                break
+            turns.insert(0, turn)
+            room -= cost
+        summary = clip_tokens(self.summary, room) if self.summary and room > 0 else ""
+        return summary, turns
+
+    def record(self, prompt_tokens: int) -> None:
+        self.prompt_tokens.append(prompt_tokens)
+
+    async def settle(self) -> None:
+        """Wait for the running fold and any fold it starts on finishing."""
+        while self._task and not self._task.done():
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def aclose(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
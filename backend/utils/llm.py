@@ -1,87 +1,278 @@
 # utils/llm.py
 
-from typing import Optional
-from langchain_google_genai import ChatGoogleGenerativeAI
+import json
+import time
+import asyncio
+import logging
+from typing import Dict, List, Optional
 from langchain_core.prompts import ChatPromptTemplate
 
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash")
+from config import settings
+from utils.llm_provider import get_chat_model
+from utils.score_cache import score_cache
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever SCORE_PROMPT or its parsing changes so cached scores
+# produced by the old prompt are no longer served.
+PROMPT_VERSION = "1"
+
+SCORE_PROMPT = ChatPromptTemplate.from_template(
+    """
+    You are an AI hiring assistant. Compare the following resume to the job description.
+
+    Provide:
+    - A match score from 0 to 100.
+    - The candidate’s full name.
+    - The candidate’s email address.
+    - A brief explanation highlighting key matches and gaps.
+
+    Job Description:
+    {job_description}
+
+    Resume:
+    {resume_text}
+
+    Output Format:
+    Score: <number>
+    Name: <full name>
+    Email: <email>
+    Reason: <short explanation>
+    """
+)
+
+
+def _parse_score_response(content: str) -> dict:
+    """Pull score/name/email/reason out of the line-based LLM reply."""
+    lines = [l.strip() for l in content.splitlines() if l.strip()]
+
+    def get_field(prefix: str) -> str:
+        return (next(l for l in lines if l.lower().startswith(prefix))
+                .split(":", 1)[1]
+                .strip())
+
+    try:
+        email = get_field("email")
+    except StopIteration:
+        email = ""
+
+    return {
+        "score":     float(get_field("score")),
+        "name":      get_field("name"),
+        "email":     email,
+        "reasoning": get_field("reason"),
+    }
+
 
 async def llm_score(
     resume_id: str,
     filename: str,
     resume_text: str,
     job_desc: str,
-    override_email: Optional[str] = None
+    override_email: Optional[str] = None,
+    use_cache: bool = True,
 ) -> dict:
     """
     Uses Gemini to score a resume against a job description,
     plus extract name/email. If override_email is provided,
     it will be used instead of the LLM's extracted email.
+
+    Results are cached by (resume text, job description, PROMPT_VERSION).
+    With use_cache=False the cache is not consulted, but the fresh result
+    still replaces the cached one.
     """
+    key    = score_cache.make_key(resume_text, job_desc, PROMPT_VERSION)
+    fields = await score_cache.get(key) if use_cache else None
+
+    if fields is None:
+        messages = SCORE_PROMPT.format_messages(
+            job_description=job_desc,
+            resume_text=resume_text
+        )
+        try:
+            response = await get_chat_model().ainvoke(messages)
+            fields   = _parse_score_response(response.content)
+        except Exception as e:
+            fields = {
+                "score":     0.0,
+                "name":      "",
+                "email":     "",
+                "reasoning": f"Unable to parse LLM response: {e}",
+            }
+        else:
+            await score_cache.put(key, fields)
 
-    prompt = ChatPromptTemplate.from_template(
-        """
-        You are an AI hiring assistant. Compare the following resume to the job description.
+    return {
+        "resumeId":  resume_id,
+        "filename":  filename,
+        "name":      fields["name"],
+        # use override if provided, otherwise the LLM's extraction
+        "email":     override_email or fields["email"],
+        "score":     fields["score"],
+        "reasoning": fields["reasoning"],
+    }
 
-        Provide:
-        - A match score from 0 to 100.
-        - The candidate’s full name.
-        - The candidate’s email address.
-        - A brief explanation highlighting key matches and gaps.
 
-        Job Description:
-        {job_description}
+# ── Batched scoring ────────────────────────────────────────────────
 
-        Resume:
-        {resume_text}
+BATCH_SCORE_PROMPT = ChatPromptTemplate.from_template(
+    """
+    You are an AI hiring assistant. Compare each of the following resumes to the job description.
 
-        Output Format:
-        Score: <number>
-        Name: <full name>
-        Email: <email>
-        Reason: <short explanation>
-        """
-    )
+    For every resume provide:
+    - A match score from 0 to 100.
+    - The candidate’s full name.
+    - The candidate’s email address.
+    - A brief explanation highlighting key matches and gaps.
+
+    Job Description:
+    {job_description}
 
-    messages = prompt.format_messages(
-        job_description=job_desc,
-        resume_text=resume_text
+    Resumes:
+    {resumes}
+
+    Output Format:
+    A JSON array with exactly one object per resume, and nothing else:
+    [{{"id": "<resume id>", "score": <number>, "name": "<full name>", "email": "<email>", "reason": "<short explanation>"}}]
+    """
+)
+
+# Rough per-prompt overhead of the instructions around the JD and resumes.
+_PROMPT_OVERHEAD_TOKENS = 150
+
+batch_stats = {
+    "batches":           0,
+    "resumes":           0,
+    "fallbacks":         0,
+    "promptTokens":      0,
+    "promptTokensSaved": 0,
+    "seconds":           0.0,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) for batch packing."""
+    return len(text) // 4 + 1
+
+
+def plan_batches(items: List[dict], job_desc: str) -> List[List[dict]]:
+    """
+    Greedily pack resumes into batches whose prompt (one copy of the JD
+    plus the resumes) stays within LLM_BATCH_TOKEN_BUDGET, with at most
+    LLM_BATCH_MAX_SIZE resumes per batch.
+    """
+    room = settings.LLM_BATCH_TOKEN_BUDGET - estimate_tokens(job_desc) - _PROMPT_OVERHEAD_TOKENS
+    batches: List[List[dict]] = []
+    current, used = [], 0
+    for item in items:
+        cost = estimate_tokens(item["resume_text"])
+        if current and (used + cost > room or len(current) >= settings.LLM_BATCH_MAX_SIZE):
+            batches.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _parse_batch_response(content: str) -> Dict[str, dict]:
+    """Map resume id → parsed fields from the JSON array reply."""
+    body = content.strip()
+    if body.startswith("```"):
+        body = body.split("\n", 1)[1].rsplit("```", 1)[0]
+    parsed = {}
+    for entry in json.loads(body):
+        parsed[str(entry["id"])] = {
+            "score":     float(entry["score"]),
+            "name":      str(entry.get("name") or ""),
+            "email":     str(entry.get("email") or ""),
+            "reasoning": str(entry.get("reason") or ""),
+        }
+    return parsed
+
+
+async def _score_batch(batch: List[dict], job_desc: str) -> List[Optional[dict]]:
+    """
+    Score one packed batch with a single prompt. Returns parsed fields per
+    item, or None for items the reply did not cover.
+    """
+    resumes = "\n\n".join(
+        f"--- Resume id: r{i} ---\n{item['resume_text']}" for i, item in enumerate(batch)
     )
+    messages = BATCH_SCORE_PROMPT.format_messages(job_description=job_desc, resumes=resumes)
+
+    jd_tokens = estimate_tokens(job_desc) + _PROMPT_OVERHEAD_TOKENS
+    batch_stats["batches"]           += 1
+    batch_stats["resumes"]           += len(batch)
+    batch_stats["promptTokens"]      += estimate_tokens(resumes) + jd_tokens
+    batch_stats["promptTokensSaved"] += jd_tokens * (len(batch) - 1)
 
+    started = time.monotonic()
     try:
-        response = await llm.ainvoke(messages)
-        lines = [l.strip() for l in response.content.splitlines() if l.strip()]
+        response = await get_chat_model().ainvoke(messages)
+        parsed   = _parse_batch_response(response.content)
+    except Exception as e:
+        logger.warning(f"Batch of {len(batch)} resumes could not be parsed, scoring individually: {e}")
+        parsed = {}
+    finally:
+        batch_stats["seconds"] += time.monotonic() - started
+
+    return [parsed.get(f"r{i}") for i in range(len(batch))]
 
-        def get_field(prefix: str) -> str:
-            return (next(l for l in lines if l.lower().startswith(prefix))
-                    .split(":", 1)[1]
-                    .strip())
 
-        score = float(get_field("score"))
-        name  = get_field("name")
+async def llm_score_batch(items: List[dict], job_desc: str, use_cache: bool = True) -> List[dict]:
+    """
+    Score many resumes against one job description, packing several
+    resumes into each LLM request so the JD is sent once per batch
+    instead of once per resume.
+
+    Each item has the keyword arguments of `llm_score` (resume_id,
+    filename, resume_text, override_email). Cached results are served
+    without an LLM call. Resumes a batch reply does not cover, or every
+    resume of a batch whose reply fails to parse, fall back to `llm_score`.
+    Results are returned in input order.
+    """
+    results: List[Optional[dict]] = [None] * len(items)
+    keys = [score_cache.make_key(i["resume_text"], job_desc, PROMPT_VERSION) for i in items]
 
-        # use override if provided, otherwise ask LLM
-        if override_email:
-            email = override_email
+    pending = []
+    for n, item in enumerate(items):
+        fields = await score_cache.get(keys[n]) if use_cache else None
+        if fields is None:
+            pending.append(n)
         else:
-            try:
-                email = get_field("email")
-            except StopIteration:
-                email = ""
+            results[n] = fields
 
-        reasoning = get_field("reason")
+    batches = plan_batches([dict(items[n], _n=n) for n in pending], job_desc)
+    scored  = await asyncio.gather(*(_score_batch(b, job_desc) for b in batches))
 
-    except Exception as e:
-        score     = 0.0
-        name      = ""
-        email     = override_email or ""
-        reasoning = f"Unable to parse LLM response: {e}"
+    fallbacks = []
+    for batch, batch_fields in zip(batches, scored):
+        for item, fields in zip(batch, batch_fields):
+            n = item["_n"]
+            if fields is None:
+                fallbacks.append(n)
+            else:
+                results[n] = fields
+                await score_cache.put(keys[n], fields)
 
-    return {
-        "resumeId":  resume_id,
-        "filename":  filename,
-        "name":      name,
-        "email":     email,
-        "score":     score,
-        "reasoning": reasoning,
-    }
+    if fallbacks:
+        batch_stats["fallbacks"] += len(fallbacks)
+        singles = await asyncio.gather(*(
+            llm_score(**items[n], job_desc=job_desc, use_cache=False) for n in fallbacks
+        ))
+        for n, result in zip(fallbacks, singles):
+            results[n] = result
+
+    return [
+        result if "resumeId" in result else {
+            "resumeId":  item["resume_id"],
+            "filename":  item["filename"],
+            "name":      result["name"],
+            "email":     item.get("override_email") or result["email"],
+            "score":     result["score"],
+            "reasoning": result["reasoning"],
+        }
+        for item, result in zip(items, results)
+    ]
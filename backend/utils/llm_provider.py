@@ -0,0 +1,105 @@
+# utils/llm_provider.py
+#
+# One place that builds chat models. Clients are shared per (model,
+# temperature) profile, so every interview and scoring call reuses the
+# same connection pool instead of opening its own.
+#
+# LLM_BACKEND=fake swaps in langchain's FakeListChatModel (no network);
+# tests and benchmarks can also install their own factory with
+# set_backend().
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from config import settings
+
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+BackendFactory = Callable[[str, Optional[float]], BaseChatModel]
+
+
+def _gemini(model: str, temperature: Optional[float]) -> BaseChatModel:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    options: Dict[str, Any] = {
+        "model":       model,
+        "timeout":     settings.LLM_TIMEOUT,
+        "max_retries": settings.LLM_MAX_RETRIES,
+    }
+    if temperature is not None:
+        options["temperature"] = temperature
+    if settings.LLM_TRANSPORT:
+        options["transport"] = settings.LLM_TRANSPORT
+    return ChatGoogleGenerativeAI(**options)
+
+
+def _fake(model: str, temperature: Optional[float]) -> BaseChatModel:
+    return FakeListChatModel(responses=json.loads(settings.LLM_FAKE_RESPONSES))
+
+
+_BACKENDS: Dict[str, BackendFactory] = {"gemini": _gemini, "fake": _fake}
+
+
+class PooledChatModel:
+    """
+    A shared chat model whose calls are capped at LLM_MAX_CONCURRENCY in
+    flight; further calls wait for a slot instead of opening more
+    connections.
+    """
+
+    def __init__(self, model: BaseChatModel, limit: int):
+        self.model  = model
+        self._limit = limit
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.stats  = {"calls": 0, "inFlight": 0}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._limit)
+        return self._slots
+
+    async def ainvoke(self, input: Any, **kwargs) -> Any:
+        async with self._semaphore():
+            self.stats["calls"]    += 1
+            self.stats["inFlight"] += 1
+            try:
+                return await self.model.ainvoke(input, **kwargs)
+            finally:
+                self.stats["inFlight"] -= 1
+
+    async def astream(self, input: Any, **kwargs) -> AsyncIterator[Any]:
+        async with self._semaphore():
+            self.stats["calls"]    += 1
+            self.stats["inFlight"] += 1
+            try:
+                async for chunk in self.model.astream(input, **kwargs):
+                    yield chunk
+            finally:
+                self.stats["inFlight"] -= 1
+
+
+_factory: BackendFactory = _BACKENDS[settings.LLM_BACKEND]
+_models: Dict[Tuple[str, Optional[float]], PooledChatModel] = {}
+
+
+def get_chat_model(model: str = DEFAULT_MODEL, temperature: Optional[float] = None) -> PooledChatModel:
+    """The shared client for this (model, temperature) profile."""
+    key = (model, temperature)
+    if key not in _models:
+        _models[key] = PooledChatModel(_factory(model, temperature), settings.LLM_MAX_CONCURRENCY)
+    return _models[key]
+
+
+def set_backend(factory: BackendFactory) -> None:
+    """Build every model with `factory` from now on (e.g. a fake for tests)."""
+    global _factory
+    _factory = factory
+    _models.clear()
+
+
+def provider_stats() -> Dict[str, dict]:
+    return {f"{model}@{temperature}": m.stats for (model, temperature), m in _models.items()}
@@ -1,37 +1,110 @@
-import os
-from tempfile import NamedTemporaryFile
-from langchain_community.document_loaders import PyPDFLoader
+import re
+import asyncio
+import logging
+import fitz                      # PyMuPDF
+from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
-async def extract_pdf_text(content: bytes, filename: str) -> str:
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# plain-text email regex
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def parse_pdf(content: bytes) -> dict:
     """
-    Extract text content from a PDF file using PyPDFLoader.
-    
-    Args:
-        content (bytes): The raw PDF file content.
-        filename (str): For error messages only.
-    
+    Single pass over an in-memory PDF. Runs inside a worker process.
+
     Returns:
-        str: The extracted text content.
-    
-    Raises:
-        Exception: If PDF parsing fails.
+      text:       visible text of every page, space-joined
+      links:      every link URI found in the page annotations
+      email:      first mailto: link, else first email in the text, else None
+      pageCount:  number of pages
     """
-    tmp_path = None
-    try:
-        with NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-            tmp.write(content)
-            tmp_path = tmp.name
+    pages, links = [], []
+    email = None
+    with fitz.open(stream=content, filetype="pdf") as doc:
+        for page in doc:
+            pages.append(page.get_text())
+            for link in page.get_links():
+                uri = link.get("uri")
+                if not uri:
+                    continue
+                links.append(uri)
+                if not email and uri.lower().startswith("mailto:"):
+                    email = uri.split(":", 1)[1]
+        page_count = doc.page_count
+
+    text = " ".join(pages)
+    if not email:
+        m = EMAIL_RE.search(text)
+        if m:
+            email = m.group(0)
+
+    return {"text": text, "links": links, "email": email, "pageCount": page_count}
+
 
-        loader = PyPDFLoader(tmp_path)
-        text_pages = []
-        async for page in loader.alazy_load():
-            text_pages.append(page.page_content)
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.PDF_PARSE_WORKERS)
+    return _pool
 
-        return " ".join(text_pages)
 
-    except Exception as e:
-        raise Exception(f"Error parsing PDF '{filename}': {e}")
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Kill every worker of `pool`; the next parse starts a fresh pool."""
+    global _pool
+    if _pool is pool:
+        _pool = None
+    for proc in list((pool._processes or {}).values()):
+        proc.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
 
-    finally:
-        if tmp_path and os.path.exists(tmp_path):
-            os.remove(tmp_path)
+
+def shutdown_pdf_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def extract_pdf(content: bytes, filename: str) -> dict:
+    """
+    Parse a PDF in the worker process pool without touching the disk.
+
+    Args:
+        content (bytes): The raw PDF file content.
+        filename (str): For error messages only.
+
+    Returns:
+        dict: see `parse_pdf`.
+
+    Raises:
+        Exception: If parsing fails or takes longer than PDF_PARSE_TIMEOUT.
+    """
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        pool = _get_pool()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(pool, parse_pdf, content),
+                timeout=settings.PDF_PARSE_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            # A worker stuck on a pathological PDF cannot be cancelled, only
+            # killed; recycle the pool so it does not hold a slot forever.
+            logger.warning(f"Parsing '{filename}' exceeded {settings.PDF_PARSE_TIMEOUT}s, recycling PDF pool")
+            _discard_pool(pool)
+            raise Exception(f"Error parsing PDF '{filename}': timed out")
+        except BrokenProcessPool:
+            # The pool was recycled under us because of another document.
+            _discard_pool(pool)
+            if attempt:
+                raise Exception(f"Error parsing PDF '{filename}': worker pool unavailable")
+        except Exception as e:
+            raise Exception(f"Error parsing PDF '{filename}': {e}")
@@ -0,0 +1,136 @@
+# utils/proctoring.py
+
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class ProctoringAggregator:
+    """
+    Running proctoring statistics for one interview, updated from each
+    telemetry frame as it arrives so a review never has to scan raw
+    samples:
+
+    - off-screen ratio: share of gaze samples outside the viewport
+    - fixation dispersion: I-DT dispersion ((max-min) x + (max-min) y,
+      in px) of consecutive `window_ms` gaze windows; windows at or under
+      `fixation_px` count as fixations
+    - events per minute, per type (gaze/object samples, tab switches,
+      warnings, and object-detect frames with a phone, no person or more
+      than one person)
+    - a `grid` × `grid` heatmap of on-screen gaze, in viewport fractions
+    """
+
+    def __init__(self, grid: int, window_ms: int, fixation_px: float):
+        self.grid        = grid
+        self.window_ms   = window_ms
+        self.fixation_px = fixation_px
+        self.started_ms  = int(time.time() * 1000)
+        self.viewport: Optional[Tuple[int, int]] = None
+
+        self.samples    = 0
+        self.off_screen = 0
+        self.heatmap    = np.zeros((grid, grid), dtype=np.int64)
+        self.windows    = 0
+        self.fixations  = 0
+        self.dispersion = 0.0          # sum over closed windows
+        self.per_minute: Dict[str, np.ndarray] = defaultdict(lambda: np.zeros(0, dtype=np.int64))
+
+        # gaze samples of the window still open at the end of the last frame
+        self._open = np.zeros((0, 3), dtype=np.float64)
+
+    def set_viewport(self, width: int, height: int) -> None:
+        if width > 0 and height > 0:
+            self.viewport = (int(width), int(height))
+
+    def _count(self, kind: str, t: np.ndarray) -> None:
+        if not len(t):
+            return
+        minutes = np.maximum((t - self.started_ms) // 60000, 0).astype(np.int64)
+        counts  = np.bincount(minutes)
+        current = self.per_minute[kind]
+        if len(counts) > len(current):
+            current = np.pad(current, (0, len(counts) - len(current)))
+        current[:len(counts)] += counts
+        self.per_minute[kind] = current
+
+    def add_gaze(self, t: Sequence[int], x: Sequence[float], y: Sequence[float]) -> None:
+        if not len(t):
+            return
+        t  = np.asarray(t, dtype=np.int64)
+        xy = np.column_stack([np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)])
+        self.samples += len(t)
+        self._count("gaze", t)
+
+        # Off-screen share and heatmap
+        width, height = self.viewport or (np.inf, np.inf)
+        on = (xy[:, 0] >= 0) & (xy[:, 1] >= 0) & (xy[:, 0] < width) & (xy[:, 1] < height)
+        self.off_screen += int(len(on) - on.sum())
+        if self.viewport and on.any():
+            cells = np.floor(xy[on] / (width, height) * self.grid).astype(np.int64)
+            np.add.at(self.heatmap, (cells[:, 1], cells[:, 0]), 1)
+
+        # Fixation dispersion over closed windows; the last one stays open
+        points = np.concatenate([self._open, np.column_stack([t, xy])])
+        points = points[np.argsort(points[:, 0], kind="stable")]
+        window = (points[:, 0] // self.window_ms).astype(np.int64)
+        closed = window < window[-1]
+        self._open = points[~closed]
+        if closed.any():
+            self._close_windows(window[closed], points[closed, 1:])
+
+    def _close_windows(self, window: np.ndarray, xy: np.ndarray) -> None:
+        starts = np.flatnonzero(np.r_[True, window[1:] != window[:-1]])
+        spread = (np.maximum.reduceat(xy, starts) - np.minimum.reduceat(xy, starts)).sum(axis=1)
+        self.windows    += len(spread)
+        self.fixations  += int((spread <= self.fixation_px).sum())
+        self.dispersion += float(spread.sum())
+
+    def add_objects(self, t: Sequence[int], people: Sequence[int], phones: Sequence[int]) -> None:
+        if not len(t):
+            return
+        t      = np.asarray(t, dtype=np.int64)
+        people = np.asarray(people, dtype=np.int64)
+        phones = np.asarray(phones, dtype=np.int64)
+        self._count("object-detect", t)
+        self._count("phone", t[phones > 0])
+        self._count("no-person", t[people == 0])
+        self._count("extra-person", t[people > 1])
+
+    def add_events(self, events: List[Tuple[str, int]]) -> None:
+        by_kind: Dict[str, List[int]] = defaultdict(list)
+        for kind, t in events:
+            by_kind[kind].append(t)
+        for kind, times in by_kind.items():
+            self._count(kind, np.asarray(times, dtype=np.int64))
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-ready snapshot; the open window is included as if closed."""
+        windows, fixations, dispersion = self.windows, self.fixations, self.dispersion
+        if len(self._open):
+            spread = float((self._open[:, 1:].max(axis=0) - self._open[:, 1:].min(axis=0)).sum())
+            windows    += 1
+            fixations  += int(spread <= self.fixation_px)
+            dispersion += spread
+
+        total = int(self.heatmap.sum())
+        return {
+            "gazeSamples":    self.samples,
+            "offScreenRatio": round(self.off_screen / self.samples, 4) if self.samples else None,
+            "fixation": {
+                "windowMs":         self.window_ms,
+                "windows":          windows,
+                "fixationRatio":    round(fixations / windows, 4) if windows else None,
+                "meanDispersionPx": round(dispersion / windows, 1) if windows else None,
+            },
+            "eventsPerMinute": {kind: counts.tolist() for kind, counts in self.per_minute.items()},
+            "eventTotals":     {kind: int(counts.sum()) for kind, counts in self.per_minute.items()},
+            "heatmap": {
+                "grid":     self.grid,
+                "viewport": list(self.viewport) if self.viewport else None,
+                # share of on-screen samples per cell, rows top to bottom
+                "cells":    (np.round(self.heatmap / total, 4) if total else self.heatmap).tolist(),
+            },
+        }
@@ -0,0 +1,81 @@
+# utils/score_cache.py
+
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from cachetools import TTLCache
+
+from config import settings
+from db.database import llm_score_cache
+
+logger = logging.getLogger(__name__)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ScoreCache:
+    """
+    Two-tier cache for LLM scoring results: an in-process LRU (with TTL)
+    in front of the `llm_score_cache` Mongo collection, which expires
+    entries through a TTL index on `expiresAt`. The store is best-effort:
+    errors reading or writing it are logged and counted, never raised, so
+    a Mongo outage costs cache hits but not the scores themselves.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.ttl     = ttl
+        self._memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.stats = {"memoryHits": 0, "storeHits": 0, "misses": 0, "writes": 0, "storeErrors": 0}
+
+    @staticmethod
+    def make_key(resume_text: str, job_desc: str, prompt_version: str) -> str:
+        return f"{_sha256(resume_text)}:{_sha256(job_desc)}:{prompt_version}"
+
+    async def _load(self, key: str) -> Optional[dict]:
+        try:
+            doc = await llm_score_cache.find_one({"_id": key, "expiresAt": {"$gt": datetime.utcnow()}})
+        except Exception as e:
+            self.stats["storeErrors"] += 1
+            logger.warning(f"Reading the score cache failed: {e}")
+            return None
+        return doc["result"] if doc else None
+
+    async def _save(self, key: str, result: dict) -> bool:
+        try:
+            await llm_score_cache.replace_one(
+                {"_id": key},
+                {"result": result, "expiresAt": datetime.utcnow() + timedelta(seconds=self.ttl)},
+                upsert=True,
+            )
+        except Exception as e:
+            self.stats["storeErrors"] += 1
+            logger.warning(f"Writing the score cache failed: {e}")
+            return False
+        return True
+
+    async def get(self, key: str) -> Optional[dict]:
+        result = self._memory.get(key)
+        if result is not None:
+            self.stats["memoryHits"] += 1
+            return result
+
+        result = await self._load(key)
+        if result is not None:
+            self.stats["storeHits"] += 1
+            self._memory[key] = result
+            return result
+
+        self.stats["misses"] += 1
+        return None
+
+    async def put(self, key: str, result: dict) -> None:
+        self._memory[key] = result
+        if await self._save(key, result):
+            self.stats["writes"] += 1
+
+
+score_cache = ScoreCache(settings.SCORE_CACHE_SIZE, settings.SCORE_CACHE_TTL)
@@ -0,0 +1,111 @@
+# utils/session_writer.py
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from pymongo import ReplaceOne
+
+from db.database import interview_sessions, interview_scores
+
+logger = logging.getLogger(__name__)
+
+
+class SessionWriter:
+    """
+    Write-behind buffer for one interview session. Records pushed onto
+    the session document are queued in memory and written as a single
+    update ($push with $each per array) at turn boundaries, or every
+    `interval` seconds for anything else; a crash loses at most one
+    interval. A turn therefore costs one round trip; its
+    `interview_scores` row is derived from the history at finalization
+    (write_scores).
+    """
+
+    def __init__(self, session_id, job_id: str, resume_id: str, interval: float):
+        self.session_id = session_id
+        self.job_id     = job_id
+        self.resume_id  = resume_id
+        self.interval   = interval
+        self._pushes: Dict[str, List[Any]] = {}
+        self._lock  = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._timer = asyncio.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Flushing interview session {self.session_id} failed: {e}")
+
+    def push(self, field: str, entry: Any) -> None:
+        self._pushes.setdefault(field, []).append(entry)
+
+    def add_turn(self, turn: dict) -> None:
+        """Queue a scored Q&A turn (history + stage_progression entries)."""
+        self.push("history", {
+            "question_number":turn["question_number"],
+            "question":       turn["question"],
+            "answer":         turn["answer"],
+            "score":          turn["score"],
+            "timestamp":      turn["timestamp"],
+            "stage":          turn["stage"]
+        })
+        self.push("stage_progression", {
+            "stage":          turn["stage"],
+            "question_number":turn["question_number"],
+            "timestamp":      turn["timestamp"]
+        })
+
+    async def flush(self) -> None:
+        async with self._lock:
+            pushes, self._pushes = self._pushes, {}
+            if not pushes:
+                return
+            try:
+                await interview_sessions.update_one(
+                    {"_id": self.session_id},
+                    {"$push": {field: {"$each": entries} for field, entries in pushes.items()}}
+                )
+            except Exception:
+                # keep them, ahead of anything queued meanwhile, for the next flush
+                for field, entries in pushes.items():
+                    self._pushes[field] = entries + self._pushes.get(field, [])
+                raise
+
+    async def write_scores(self, history: List[dict]) -> None:
+        """
+        One `interview_scores` row per turn of the final history, upserted
+        on (session_id, question_number) so a retried finalization cannot
+        duplicate them.
+        """
+        if not history:
+            return
+        await interview_scores.bulk_write([
+            ReplaceOne(
+                {"session_id": self.session_id, "question_number": turn["question_number"]},
+                {
+                    "session_id":     self.session_id,
+                    "job_id":         self.job_id,
+                    "resume_id":      self.resume_id,
+                    "question_number":turn["question_number"],
+                    "question":       turn["question"],
+                    "answer":         turn["answer"],
+                    "score":          turn["score"],
+                    "timestamp":      turn.get("timestamp"),
+                    "stage":          turn["stage"]
+                },
+                upsert=True,
+            )
+            for turn in history
+        ], ordered=False)
+
+    async def close(self) -> None:
+        """Stop the timer and flush what is left."""
+        if self._timer:
+            self._timer.cancel()
+        await self.flush()
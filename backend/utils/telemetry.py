@@ -0,0 +1,244 @@
+# utils/telemetry.py
+
+import math
+import time
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from db.database import proctoring_telemetry
+from utils.proctoring import ProctoringAggregator
+
+logger = logging.getLogger(__name__)
+
+# Batched frames, plus the legacy one-event-per-message types.
+TELEMETRY_TYPES = {"telemetry", "tab-switch", "gaze", "object-detect", "not-looking"}
+
+# Sampled streams stored as packed columns; everything else is a discrete event.
+_COLUMNS = {
+    "gaze":    ("t", "x", "y"),
+    "objects": ("t", "people", "phones"),
+}
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _empty_bucket() -> Dict[str, Any]:
+    return {
+        **{stream: {c: [] for c in cols} for stream, cols in _COLUMNS.items()},
+        "events": [],
+    }
+
+
+class TelemetryBuffer:
+    """
+    Server-side buffer of one interview's proctoring telemetry. Samples
+    are grouped into `bucket_seconds` buckets and written to
+    `proctoring_telemetry` as one document per (session, bucket):
+
+        {sessionId, start, gaze: {t, x, y}, objects: {t, people, phones},
+         events: [{type, t, ...}], count}
+
+    Sampled streams are packed columnar arrays with `t` in milliseconds
+    from the bucket start. Buffered buckets are upserted with one
+    bulk_write every `interval` seconds, or sooner once `max_samples`
+    samples are waiting. Samples are also handed to `aggregator` as they
+    arrive, so its summary is ready without reading the buckets back.
+    """
+
+    def __init__(self, session_id, bucket_seconds: int, interval: float, max_samples: int,
+                 aggregator: Optional[ProctoringAggregator] = None):
+        self.session_id  = session_id
+        self.aggregator  = aggregator
+        self.bucket_ms   = bucket_seconds * 1000
+        self.interval    = interval
+        self.max_samples = max_samples
+        self.pending     = 0
+        self.stats       = {"samples": 0, "frames": 0, "writes": 0, "dropped": 0}
+        self._buckets: Dict[int, Dict[str, Any]] = {}
+        self._lock  = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._timer = asyncio.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Flushing telemetry of session {self.session_id} failed: {e}")
+
+    @property
+    def full(self) -> bool:
+        return self.pending >= self.max_samples
+
+    def _bucket(self, t: int) -> Dict[str, Any]:
+        start = t - t % self.bucket_ms
+        return self._buckets.setdefault(start, _empty_bucket())
+
+    def _samples(self, stream: str, t: List[int], *values: List[int]) -> None:
+        for row in zip(t, *values):
+            columns = self._bucket(row[0])[stream]
+            columns["t"].append(row[0] % self.bucket_ms)
+            for name, value in zip(_COLUMNS[stream][1:], row[1:]):
+                columns[name].append(value)
+        self.pending += len(t)
+
+    def _events(self, events: List[Tuple[str, int, dict]]) -> None:
+        for kind, t, fields in events:
+            self._bucket(t)["events"].append({"type": kind, "t": t % self.bucket_ms, **fields})
+        self.pending += len(events)
+
+    def add(self, msg: dict) -> None:
+        """
+        Buffer one client message: a batched "telemetry" frame, or one of
+        the legacy single-event messages (stamped with the arrival time).
+        Samples are also fed to the aggregator, if any. Malformed samples
+        (missing or non-numeric values) are dropped with a warning rather
+        than raised, so one bad frame cannot end the interview.
+        """
+        now = _now_ms()
+        gaze: Tuple[List[int], ...]    = ([], [], [])
+        objects: Tuple[List[int], ...] = ([], [], [])
+        events: List[Tuple[str, int, dict]] = []
+        dropped = 0
+
+        if msg.get("type") == "telemetry":
+            # Shift client timestamps onto the server clock.
+            sent_at = _number(msg.get("sentAt"))
+            skew    = now - int(sent_at) if sent_at is not None else 0
+            gaze, bad    = _columns(msg.get("gaze"), _COLUMNS["gaze"], skew)
+            dropped     += bad
+            objects, bad = _columns(msg.get("objects"), _COLUMNS["objects"], skew)
+            dropped     += bad
+            raw_events   = msg.get("events") or []
+            for event in raw_events if isinstance(raw_events, list) else [raw_events]:
+                t = _number(event.get("t", now - skew)) if isinstance(event, dict) else None
+                if t is None or not event.get("type"):
+                    dropped += 1
+                    continue
+                fields = {k: v for k, v in event.items() if k not in ("type", "t")}
+                events.append((str(event["type"]), int(t) + skew, fields))
+        elif msg.get("type") == "gaze":
+            x, y = _number(msg.get("x", 0)), _number(msg.get("y", 0))
+            if x is None or y is None:
+                dropped += 1
+            else:
+                gaze = ([now], [round(x)], [round(y)])
+        elif msg.get("type") == "object-detect":
+            people, phones = _number(msg.get("people", 0)), _number(msg.get("phones", 0))
+            if people is None or phones is None:
+                dropped += 1
+            else:
+                objects = ([now], [int(people)], [int(phones)])
+        else:
+            events.append((msg["type"], now, {}))
+
+        self._samples("gaze", *gaze)
+        self._samples("objects", *objects)
+        self._events(events)
+        self.stats["frames"]  += 1
+        self.stats["samples"] += len(gaze[0]) + len(objects[0]) + len(events)
+        if dropped:
+            self.stats["dropped"] += dropped
+            logger.warning(f"Dropped {dropped} malformed telemetry sample(s) of session {self.session_id}")
+
+        if self.aggregator:
+            viewport = msg.get("viewport")
+            if isinstance(viewport, dict):
+                width, height = _number(viewport.get("w")), _number(viewport.get("h"))
+                if width is not None and height is not None:
+                    self.aggregator.set_viewport(width, height)
+            self.aggregator.add_gaze(*gaze)
+            self.aggregator.add_objects(*objects)
+            self.aggregator.add_events([(kind, t) for kind, t, _ in events])
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._buckets:
+                return
+            buckets, self._buckets = self._buckets, {}
+            count, self.pending = self.pending, 0
+            ops = [self._upsert(start, bucket) for start, bucket in sorted(buckets.items())]
+            try:
+                await proctoring_telemetry.bulk_write(ops, ordered=False)
+            except Exception:
+                # keep them, ahead of anything buffered meanwhile, for the next flush
+                for start, bucket in buckets.items():
+                    self._buckets[start] = _merge(bucket, self._buckets.get(start))
+                self.pending += count
+                raise
+            self.stats["writes"] += 1
+
+    def _upsert(self, start: int, bucket: Dict[str, Any]) -> UpdateOne:
+        push: Dict[str, Any] = {}
+        count = len(bucket["events"])
+        for stream, cols in _COLUMNS.items():
+            if bucket[stream]["t"]:
+                count += len(bucket[stream]["t"])
+                for c in cols:
+                    push[f"{stream}.{c}"] = {"$each": bucket[stream][c]}
+        if bucket["events"]:
+            push["events"] = {"$each": bucket["events"]}
+        return UpdateOne(
+            {"sessionId": self.session_id,
+             "start":     datetime.utcfromtimestamp(start / 1000)},
+            {"$push": push, "$inc": {"count": count}},
+            upsert=True,
+        )
+
+    async def close(self) -> None:
+        """Stop the timer and write what is left."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        await self.flush()
+
+
+def _number(value: Any) -> Optional[float]:
+    """`value` as a finite float (numeric strings included), else None."""
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _columns(frame: Any, names: Tuple[str, ...], skew: int) -> Tuple[Tuple[List[int], ...], int]:
+    """
+    Columns of a packed client stream, `t` shifted by `skew` and values as
+    ints, plus the number of rows dropped as malformed.
+    """
+    empty = tuple([] for _ in names)
+    if frame is None:
+        return empty, 0
+    columns = [frame.get(n) or [] for n in names] if isinstance(frame, dict) else None
+    if columns is None or not all(isinstance(c, list) for c in columns):
+        return empty, 1
+    rows = [[_number(v) for v in row] for row in zip(*columns)]
+    good = [row for row in rows if None not in row]
+    dropped = max(map(len, columns)) - len(good)
+    if not good:
+        return empty, dropped
+    t, *values = zip(*good)
+    return ([int(v) + skew for v in t], *([round(v) for v in col] for col in values)), dropped
+
+
+def _merge(first: Dict[str, Any], then: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if then is None:
+        return first
+    for stream, cols in _COLUMNS.items():
+        for c in cols:
+            first[stream][c].extend(then[stream][c])
+    first["events"].extend(then["events"])
+    return first
+
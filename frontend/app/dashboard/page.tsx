@@ -1,11 +1,11 @@
 'use client'
 
-import React, { useState, useEffect, useContext } from 'react'
+import React, { useState, useEffect, useContext, useRef } from 'react'
 import { Users, Sparkles, Shield, Clock } from 'lucide-react'
 import { AuthContext } from '@/context/AuthContext'
 import JobsGrid from '@/components/ui/dashboard/Jobsgrid'
 import UploadResume from '@/components/ui/dashboard/UploadResume'
-import ResumeResults from '@/components/ui/dashboard/ResumeResult'
+import ResumeResults, { IngestProgress } from '@/components/ui/dashboard/ResumeResult'
 
 const API_BASE = process.env.NEXT_PUBLIC_API_BASE_URL
 
@@ -25,9 +25,21 @@ interface Job {
   jobId: string
   description: string
   createdAt: string
+  resumeCount: number
+  averageScore?: number | null
+  // the job grid leaves this empty; the selected job's candidates are
+  // loaded page by page from /jobs/{id}/candidates
   scoredResumes: Resume[]
 }
 
+interface CandidatePage {
+  jobId: string
+  resumeCount: number
+  averageScore: number | null
+  candidates: Resume[]
+  nextCursor: string | null
+}
+
 type AppState = 'jobs' | 'upload' | 'results'
 
 const HRInterviewApp = () => {
@@ -38,6 +50,25 @@ const HRInterviewApp = () => {
   const [isUploading, setIsUploading] = useState(false)
   const [isProcessing, setIsProcessing] = useState(false)
   const [loading, setLoading] = useState(true)
+  const [progress, setProgress] = useState<IngestProgress | null>(null)
+  const progressSource = useRef<EventSource | null>(null)
+  const [jobsCursor, setJobsCursor] = useState<string | null>(null)
+  const [candidatesCursor, setCandidatesCursor] = useState<string | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
+
+  // One page of the job grid: summaries only (resume count and average
+  // score), no candidate arrays. Further pages load on demand.
+  const fetchJobsPage = async (cursor: string | null) => {
+    const url = cursor
+      ? `${API_BASE}/jobs?include_resumes=false&cursor=${encodeURIComponent(cursor)}`
+      : `${API_BASE}/jobs?include_resumes=false`
+    const response = await fetch(url, {
+      credentials: 'include',
+    })
+    if (!response.ok) throw new Error('Failed to fetch jobs')
+    const page: Job[] = await response.json()
+    return { page, next: response.headers.get('X-Next-Cursor') }
+  }
 
   // Fetch jobs from API
   const fetchJobs = async () => {
@@ -46,22 +77,99 @@ const HRInterviewApp = () => {
     try {
       console.log('🔄 fetchJobs start')
       setLoading(true)
-      const response = await fetch(`${API_BASE}/jobs`, {
-        credentials: 'include',
-      })
-      if (!response.ok) throw new Error('Failed to fetch jobs')
-      const data = await response.json()
-      console.log('✅ fetchJobs got data', data)
-      setJobs(data)
+      const { page, next } = await fetchJobsPage(null)
+      console.log('✅ fetchJobs got data', page)
+      setJobs(page)
+      setJobsCursor(next)
     } catch (error) {
       console.error('❌ fetchJobs error', error)
       setJobs([])
+      setJobsCursor(null)
     } finally {
       console.log('🏁 fetchJobs done, clearing loading')
       setLoading(false)
     }
   }
 
+  const loadMoreJobs = async () => {
+    if (!jobsCursor) return
+    try {
+      setLoadingMore(true)
+      const { page, next } = await fetchJobsPage(jobsCursor)
+      setJobs(prev => [...prev, ...page])
+      setJobsCursor(next)
+    } catch (error) {
+      console.error('❌ loadMoreJobs error', error)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
+  // Candidates of one job, best score first. Without a cursor the list
+  // restarts from the first page; with one, the next page is appended.
+  const fetchCandidates = async (jobId: string, cursor: string | null = null) => {
+    try {
+      setLoadingMore(true)
+      const url = cursor
+        ? `${API_BASE}/jobs/${jobId}/candidates?cursor=${encodeURIComponent(cursor)}`
+        : `${API_BASE}/jobs/${jobId}/candidates`
+      const response = await fetch(url, {
+        credentials: 'include',
+      })
+      if (!response.ok) throw new Error('Failed to fetch candidates')
+      const page: CandidatePage = await response.json()
+      setSelectedJob(prev =>
+        prev && prev.jobId === jobId
+          ? {
+              ...prev,
+              resumeCount: page.resumeCount,
+              averageScore: page.averageScore,
+              scoredResumes: cursor ? [...prev.scoredResumes, ...page.candidates] : page.candidates,
+            }
+          : prev
+      )
+      setCandidatesCursor(page.nextCursor)
+    } catch (error) {
+      console.error('❌ fetchCandidates error', error)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
+  // Follow background ingestion of a job's uploads (SSE from
+  // /jobs/{id}/progress/stream) and reload its candidates as resumes land
+  const watchProgress = (jobId: string) => {
+    progressSource.current?.close()
+    setIsProcessing(true)
+    setProgress(null)
+
+    const source = new EventSource(`${API_BASE}/jobs/${jobId}/progress/stream`, {
+      withCredentials: true,
+    })
+    progressSource.current = source
+    let landed = -1
+
+    source.onmessage = (ev) => {
+      const next: IngestProgress = JSON.parse(ev.data)
+      setProgress(next)
+      if (next.done !== landed) {
+        landed = next.done
+        fetchCandidates(jobId)
+      }
+    }
+    const finish = () => {
+      source.close()
+      if (progressSource.current === source) progressSource.current = null
+      setIsProcessing(false)
+      fetchCandidates(jobId)
+      fetchJobs()
+    }
+    source.addEventListener('done', finish)
+    source.onerror = finish
+  }
+
+  useEffect(() => () => progressSource.current?.close(), [])
+
   // Create new job with resumes
   const createJob = async (description: string, files: File[]) => {
     if (!user) return
@@ -81,18 +189,12 @@ const HRInterviewApp = () => {
 
       const newJob = await response.json()
       
-      // Set the new job as selected and show processing state
-      setSelectedJob(newJob)
+      // Set the new job as selected and follow its ingestion
+      setSelectedJob({ ...newJob, resumeCount: 0, averageScore: null })
+      setCandidatesCursor(null)
       setCurrentState('results')
-      setIsProcessing(true)
-      
-      // Fetch updated jobs list
       await fetchJobs()
-      
-      // Simulate processing time and then stop processing indicator
-      setTimeout(() => {
-        setIsProcessing(false)
-      }, 3000)
+      watchProgress(newJob.jobId)
       
       return newJob
     } catch (error) {
@@ -136,16 +238,12 @@ const HRInterviewApp = () => {
       const updateResult = await response.json()
       console.log('✅ Job updated successfully', updateResult)
 
-      setIsProcessing(true)
+      if (description !== selectedJob.description) {
+        setSelectedJob(prev => (prev ? { ...prev, description } : prev))
+      }
       setCurrentState('results')
-      
-      // Fetch updated jobs list to get the latest data
       await fetchJobs()
-      
-      // Simulate processing time
-      setTimeout(() => {
-        setIsProcessing(false)
-      }, 3000)
+      watchProgress(jobId)
       
       return updateResult
     } catch (error) {
@@ -173,8 +271,10 @@ const HRInterviewApp = () => {
 
   // Navigation handlers
   const handleJobSelect = (job: Job) => {
-    setSelectedJob(job)
+    setSelectedJob({ ...job, scoredResumes: [] })
+    setCandidatesCursor(null)
     setCurrentState('results')
+    fetchCandidates(job.jobId)
   }
 
   const handleNewJobClick = () => {
@@ -183,9 +283,13 @@ const HRInterviewApp = () => {
   }
 
   const handleBackToJobs = () => {
+    progressSource.current?.close()
+    progressSource.current = null
     setSelectedJob(null)
+    setCandidatesCursor(null)
     setCurrentState('jobs')
     setIsProcessing(false)
+    setProgress(null)
   }
 
   const handleAddMoreResumes = () => {
@@ -200,16 +304,6 @@ const HRInterviewApp = () => {
     }
   }, [ready, user])
 
-  // Update selected job when jobs list changes
-  useEffect(() => {
-    if (selectedJob && jobs.length > 0) {
-      const updatedJob = jobs.find(j => j.jobId === selectedJob.jobId)
-      if (updatedJob) {
-        setSelectedJob(updatedJob)
-      }
-    }
-  }, [jobs, selectedJob])
-
   // Enhanced Loading state with modern design
   if (!ready) {
     return (
@@ -284,6 +378,9 @@ const HRInterviewApp = () => {
           jobs={jobs}
           user={user}
           loading={loading}
+          hasMore={jobsCursor !== null}
+          loadingMore={loadingMore}
+          onLoadMore={loadMoreJobs}
           onJobSelect={handleJobSelect}
           onNewJobClick={handleNewJobClick}
         />
@@ -312,6 +409,10 @@ const HRInterviewApp = () => {
           user={user}
           job={selectedJob}
           isProcessing={isProcessing}
+          progress={progress}
+          hasMore={candidatesCursor !== null}
+          loadingMore={loadingMore}
+          onLoadMore={() => fetchCandidates(selectedJob.jobId, candidatesCursor)}
           onBack={handleBackToJobs}
           onAddMoreResumes={handleAddMoreResumes}
         />
@@ -7,6 +7,7 @@ interface Message {
   sender: "ai" | "you";
   text: string;
   timestamp?: Date;
+  streaming?: boolean;
 }
 
 interface InterviewStatus {
@@ -234,7 +235,7 @@ const startVoice = () => {
   useEffect(() => {
     if (!jobId || !resumeId || !screenStream) return;
     const socket = new WebSocket(
-      `${process.env.NEXT_PUBLIC_WS_URL}/ws/interview/${jobId}/${resumeId}`
+      `${process.env.NEXT_PUBLIC_WS_URL}/ws/interview/${jobId}/${resumeId}?stream=1`
     );
     socket.onopen = () => {
       setIsConnected(true);
@@ -248,6 +249,32 @@ const startVoice = () => {
           setIsLoading(false);
           return;
         }
+        // Streamed fragments of the next question; the final frame below
+        // replaces them with the full text
+        if (data.type === "question_delta") {
+          setMessages((ms) => {
+            const last = ms[ms.length - 1];
+            if (last?.sender === "ai" && last.streaming) {
+              return [...ms.slice(0, -1), { ...last, text: last.text + data.delta }];
+            }
+            return [
+              ...ms,
+              { sender: "ai", text: data.delta, timestamp: new Date(), streaming: true },
+            ];
+          });
+          setIsLoading(false);
+          return;
+        }
+        // End of the interview; the assessment frame follows once computed
+        if (data.type === "complete" || data.type === "assessment") {
+          setStatus((s) => ({ ...s, is_complete: true }));
+          setMessages((ms) => [
+            ...ms,
+            { sender: "ai", text: data.text, timestamp: new Date() },
+          ]);
+          setIsLoading(false);
+          return;
+        }
         const { text, question_count, max_questions } = data;
         setStatus({
           question_count,
@@ -255,10 +282,13 @@ const startVoice = () => {
           is_complete:
             question_count >= (max_questions || status.max_questions),
         });
-        setMessages((ms) => [
-          ...ms,
-          { sender: "ai", text, timestamp: new Date() },
-        ]);
+        setMessages((ms) => {
+          const final: Message = { sender: "ai", text, timestamp: new Date() };
+          const last = ms[ms.length - 1];
+          return last?.sender === "ai" && last.streaming
+            ? [...ms.slice(0, -1), final]
+            : [...ms, final];
+        });
         setIsLoading(false);
       } catch {
         setError("Invalid response from server");
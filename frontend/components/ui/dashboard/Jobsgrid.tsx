@@ -26,6 +26,9 @@ interface JobsGridProps {
   jobs: Job[]
   user: { name: string }
   loading: boolean
+  hasMore: boolean
+  loadingMore: boolean
+  onLoadMore: () => void
   onJobSelect: (job: Job) => void
   onNewJobClick: () => void
 }
@@ -34,6 +37,9 @@ const JobsGrid: React.FC<JobsGridProps> = ({
   jobs, 
   user, 
   loading, 
+  hasMore,
+  loadingMore,
+  onLoadMore,
   onJobSelect, 
   onNewJobClick 
 }) => {
@@ -128,13 +134,13 @@ const JobsGrid: React.FC<JobsGridProps> = ({
                     <div className="flex items-center space-x-4">
                       <div className="flex items-center space-x-1">
                         <Users className="w-4 h-4 text-gray-400" />
-                        <span className="text-sm text-gray-600">{job.scoredResumes.length} resumes</span>
+                        <span className="text-sm text-gray-600">{job.resumeCount} resumes</span>
                       </div>
-                      {job.scoredResumes.length > 0 && (
+                      {job.resumeCount > 0 && job.averageScore != null && (
                         <div className="flex items-center space-x-1">
                           <Star className="w-4 h-4 text-yellow-500" />
                           <span className="text-sm text-gray-600">
-                            {(job.scoredResumes.reduce((sum, r) => sum + r.score, 0) / job.scoredResumes.length).toFixed(1)}
+                            {job.averageScore.toFixed(1)}
                           </span>
                         </div>
                       )}
@@ -149,6 +155,18 @@ const JobsGrid: React.FC<JobsGridProps> = ({
           </div>
         )}
 
+        {!loading && hasMore && (
+          <div className="flex justify-center mt-8">
+            <button
+              onClick={onLoadMore}
+              disabled={loadingMore}
+              className="px-4 py-2 border border-gray-300 rounded-lg text-sm text-gray-700 hover:bg-gray-50 disabled:opacity-50"
+            >
+              {loadingMore ? 'Loading...' : 'Load more jobs'}
+            </button>
+          </div>
+        )}
+
         {!loading && filteredJobs.length === 0 && (
           <div className="text-center py-12">
             <FileText className="w-12 h-12 text-gray-400 mx-auto mb-4" />
@@ -22,7 +22,10 @@ interface Resume {
   name: string
   email: string
   filename: string
-  score: number
+  // null for pre-screened candidates, ranked by `similarity` instead
+  score: number | null
+  similarity?: number | null
+  preScreened?: boolean
   feedback?: string
   resumeId: string
   interviewDone?: boolean
@@ -33,13 +36,26 @@ interface Job {
   jobId: string
   description: string
   createdAt: string
+  resumeCount: number
+  averageScore?: number | null
+  // the candidates loaded so far, best score first
   scoredResumes: Resume[]
 }
 
+export interface IngestProgress {
+  total: number
+  done: number
+  failed: number
+}
+
 interface ResumeResultsProps {
   user: { name: string }
   job: Job
   isProcessing: boolean
+  progress?: IngestProgress | null
+  hasMore: boolean
+  loadingMore: boolean
+  onLoadMore: () => void
   onBack: () => void
   onAddMoreResumes: () => void
 }
@@ -50,6 +66,10 @@ const ResumeResults: React.FC<ResumeResultsProps> = ({
   user,
   job,
   isProcessing,
+  progress,
+  hasMore,
+  loadingMore,
+  onLoadMore,
   onBack,
   onAddMoreResumes
 }) => {
@@ -85,6 +105,8 @@ const ResumeResults: React.FC<ResumeResultsProps> = ({
     return 'Needs Review'
   }
 
+  const isScored = (r: Resume): r is Resume & { score: number } => r.score != null
+
   const filteredAndSortedResumes = job.scoredResumes
     .filter(resume => {
       const matchesSearch =
@@ -93,28 +115,33 @@ const ResumeResults: React.FC<ResumeResultsProps> = ({
 
       const matchesFilter =
         scoreFilter === 'all' ||
-        (scoreFilter === 'high' && resume.score >= 8) ||
-        (scoreFilter === 'medium' && resume.score >= 6 && resume.score < 8) ||
-        (scoreFilter === 'low' && resume.score < 6)
+        (isScored(resume) &&
+          ((scoreFilter === 'high' && resume.score >= 8) ||
+            (scoreFilter === 'medium' && resume.score >= 6 && resume.score < 8) ||
+            (scoreFilter === 'low' && resume.score < 6)))
 
       return matchesSearch && matchesFilter
     })
     .sort((a, b) => {
       if (sortBy === 'score') {
-        return b.score - a.score
+        // scores and similarities are different scales: pre-screened last
+        if (isScored(a) !== isScored(b)) return isScored(a) ? -1 : 1
+        return isScored(a) && isScored(b)
+          ? b.score - a.score
+          : (b.similarity ?? 0) - (a.similarity ?? 0)
       }
       return a.name.localeCompare(b.name)
     })
 
-  const averageScore =
-    job.scoredResumes.length > 0
-      ? job.scoredResumes.reduce((sum, r) => sum + r.score, 0) / job.scoredResumes.length
-      : 0
+  // over every candidate of the job, not just the loaded pages
+  const averageScore = job.averageScore ?? 0
 
+  const scored = job.scoredResumes.filter(isScored)
   const scoreDistribution = {
-    high: job.scoredResumes.filter(r => r.score >= 8).length,
-    medium: job.scoredResumes.filter(r => r.score >= 6 && r.score < 8).length,
-    low: job.scoredResumes.filter(r => r.score < 6).length
+    high: scored.filter(r => r.score >= 8).length,
+    medium: scored.filter(r => r.score >= 6 && r.score < 8).length,
+    low: scored.filter(r => r.score < 6).length,
+    preScreened: job.scoredResumes.length - scored.length
   }
 
   const formatDate = (dateString: string) =>
@@ -342,7 +369,7 @@ const ResumeResults: React.FC<ResumeResultsProps> = ({
             <div className="space-y-3">
               <div className="flex justify-between">
                 <span className="text-sm text-gray-600">Total Resumes</span>
-                <span className="font-medium">{job.scoredResumes.length}</span>
+                <span className="font-medium">{job.resumeCount}</span>
               </div>
               <div className="flex justify-between">
                 <span className="text-sm text-gray-600">Average Score</span>
@@ -358,7 +385,11 @@ const ResumeResults: React.FC<ResumeResultsProps> = ({
               {isProcessing && (
                 <div className="flex items-center space-x-2 text-blue-600">
                   <div className="animate-spin rounded-full h-4 w-4 border-b-2 border-blue-600"></div>
-                  <span className="text-sm">Processing...</span>
+                  <span className="text-sm">
+                    {progress && progress.total > 0
+                      ? `Processing ${progress.done + progress.failed}/${progress.total}...`
+                      : 'Processing...'}
+                  </span>
                 </div>
               )}
             </div>
@@ -379,6 +410,12 @@ const ResumeResults: React.FC<ResumeResultsProps> = ({
                 <span className="text-sm text-red-600">Needs Review (&lt;6)</span>
                 <span className="font-medium">{scoreDistribution.low}</span>
               </div>
+              {scoreDistribution.preScreened > 0 && (
+                <div className="flex justify-between items-center">
+                  <span className="text-sm text-gray-500">Pre-screened (not scored)</span>
+                  <span className="font-medium">{scoreDistribution.preScreened}</span>
+                </div>
+              )}
             </div>
           </div>
         </div>
@@ -501,25 +538,39 @@ const ResumeResults: React.FC<ResumeResultsProps> = ({
                       </div>
                     </td>
                     <td className="px-6 py-4">
-                      <div className="flex items-center space-x-2">
-                        <div
-                          className={`px-2 py-1 rounded-full text-xs font-medium ${getScoreColor(
-                            resume.score
-                          )}`}
-                        >
-                          {resume.score.toFixed(1)}
+                      {isScored(resume) ? (
+                        <div className="flex items-center space-x-2">
+                          <div
+                            className={`px-2 py-1 rounded-full text-xs font-medium ${getScoreColor(
+                              resume.score
+                            )}`}
+                          >
+                            {resume.score.toFixed(1)}
+                          </div>
+                          <Star className="w-4 h-4 text-yellow-500" />
                         </div>
-                        <Star className="w-4 h-4 text-yellow-500" />
-                      </div>
+                      ) : (
+                        <div className="text-sm text-gray-500">
+                          {resume.similarity != null
+                            ? `${Math.round(resume.similarity * 100)}% match`
+                            : '—'}
+                        </div>
+                      )}
                     </td>
                     <td className="px-6 py-4">
-                      <span
-                        className={`inline-flex px-2 py-1 text-xs font-medium rounded-full ${getScoreColor(
-                          resume.score
-                        )}`}
-                      >
-                        {getScoreLabel(resume.score)}
-                      </span>
+                      {isScored(resume) ? (
+                        <span
+                          className={`inline-flex px-2 py-1 text-xs font-medium rounded-full ${getScoreColor(
+                            resume.score
+                          )}`}
+                        >
+                          {getScoreLabel(resume.score)}
+                        </span>
+                      ) : (
+                        <span className="inline-flex px-2 py-1 text-xs font-medium rounded-full text-gray-600 bg-gray-100">
+                          Pre-screened
+                        </span>
+                      )}
                     </td>
                     <td className="px-6 py-4">
                       <div className="text-sm text-gray-500">{resume.filename}</div>
@@ -566,6 +617,20 @@ const ResumeResults: React.FC<ResumeResultsProps> = ({
             </table>
           </div>
 
+          {hasMore && (
+            <div className="flex justify-center py-4 border-t border-gray-200">
+              <button
+                onClick={onLoadMore}
+                disabled={loadingMore}
+                className="px-4 py-2 border border-gray-300 rounded-lg text-sm text-gray-700 hover:bg-gray-50 disabled:opacity-50"
+              >
+                {loadingMore
+                  ? 'Loading...'
+                  : `Load more candidates (${job.scoredResumes.length} of ${job.resumeCount})`}
+              </button>
+            </div>
+          )}
+
           {filteredAndSortedResumes.length === 0 && (
             <div className="text-center py-12">
               <Users className="w-12 h-12 text-gray-400 mx-auto mb-4" />
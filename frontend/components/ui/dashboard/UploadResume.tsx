@@ -13,7 +13,7 @@ interface Job {
     name: string
     email: string
     filename: string
-    score: number
+    score: number | null
   }>
 }
 
@@ -119,9 +119,15 @@ const UploadResume: React.FC<UploadResumeProps> = ({
                               <p className="text-sm text-gray-500">{resume.email}</p>
                               <p className="text-xs text-gray-400">{resume.filename}</p>
                             </div>
-                            <div className={`px-2 py-1 rounded-full text-xs font-medium ${getScoreColor(resume.score)}`}>
-                              {resume.score.toFixed(1)}
-                            </div>
+                            {resume.score != null ? (
+                              <div className={`px-2 py-1 rounded-full text-xs font-medium ${getScoreColor(resume.score)}`}>
+                                {resume.score.toFixed(1)}
+                              </div>
+                            ) : (
+                              <div className="px-2 py-1 rounded-full text-xs font-medium text-gray-600 bg-gray-100">
+                                Pre-screened
+                              </div>
+                            )}
                           </div>
                         ))}
                       </div>
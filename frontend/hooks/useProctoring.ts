@@ -1,9 +1,25 @@
-import { useState, useEffect, useRef } from "react";
+import { useState, useEffect, useRef, useCallback } from "react";
 
 const CAL_POINTS = 3;
 const GAZE_THRESHOLD_MS = 3000;
 const WINDOW_SIZE = 5;
 
+// Telemetry is sent in batched frames rather than one message per sample
+const TELEMETRY_FLUSH_MS = 2000;
+const TELEMETRY_MAX_SAMPLES = 200;
+
+interface TelemetryFrame {
+  gaze: { t: number[]; x: number[]; y: number[] };
+  objects: { t: number[]; people: number[]; phones: number[] };
+  events: { type: string; t: number }[];
+}
+
+const emptyFrame = (): TelemetryFrame => ({
+  gaze: { t: [], x: [], y: [] },
+  objects: { t: [], people: [], phones: [] },
+  events: [],
+});
+
 export function useProctoring(ws: WebSocket | null) {
   // Streams
   const [camStream, setCamStream] = useState<MediaStream | null>(null);
@@ -30,6 +46,46 @@ export function useProctoring(ws: WebSocket | null) {
   const gazeTimes = useRef<number[]>([]);
   interface GazeData { x: number; y: number; }
 
+  // Telemetry batching
+  const wsRef = useRef<WebSocket | null>(ws);
+  const frame = useRef<TelemetryFrame>(emptyFrame());
+  const frameSize = useRef(0);
+
+  useEffect(() => { wsRef.current = ws; }, [ws]);
+
+  const flushTelemetry = useCallback(() => {
+    const socket = wsRef.current;
+    if (!frameSize.current || !socket || socket.readyState !== WebSocket.OPEN) return;
+    socket.send(JSON.stringify({
+      type: "telemetry",
+      sentAt: Date.now(),
+      viewport: { w: window.innerWidth, h: window.innerHeight },
+      ...frame.current,
+    }));
+    frame.current = emptyFrame();
+    frameSize.current = 0;
+  }, []);
+
+  const recordSample = useCallback((update: (f: TelemetryFrame) => void) => {
+    update(frame.current);
+    frameSize.current += 1;
+    if (frameSize.current >= TELEMETRY_MAX_SAMPLES) flushTelemetry();
+  }, [flushTelemetry]);
+
+  const recordEvent = useCallback((type: string) => {
+    frame.current.events.push({ type, t: Date.now() });
+    frameSize.current += 1;
+    flushTelemetry();
+  }, [flushTelemetry]);
+
+  useEffect(() => {
+    const iv = setInterval(flushTelemetry, TELEMETRY_FLUSH_MS);
+    return () => {
+      clearInterval(iv);
+      flushTelemetry();
+    };
+  }, [ws, flushTelemetry]);
+
   // Enumerate devices
   useEffect(() => {
     navigator.mediaDevices.enumerateDevices()
@@ -60,12 +116,16 @@ export function useProctoring(ws: WebSocket | null) {
         .begin();
       webgazer.showVideo(false).showFaceOutline(false).showFaceFeedbackBox(false);
 
-      webgazer.setGazeListener((data: GazeData | null, timestamp: number) => {
+      webgazer.setGazeListener((data: GazeData | null) => {
         if (!data || !calibrated) return;
         const now = Date.now();
         gazeTimes.current.unshift(now);
         if (gazeTimes.current.length > WINDOW_SIZE) gazeTimes.current.pop();
-        ws?.send(JSON.stringify({ type: "gaze", x: data.x, y: data.y, t: timestamp }));
+        recordSample(f => {
+          f.gaze.t.push(now);
+          f.gaze.x.push(Math.round(data.x));
+          f.gaze.y.push(Math.round(data.y));
+        });
       });
     } catch (e) {
       console.error("Camera+Mic error:", e);
@@ -102,26 +162,30 @@ export function useProctoring(ws: WebSocket | null) {
       const preds = await detector.detect(camRef.current!);
       const people = preds.filter((p: any) => p.class === "person").length;
       const phones = preds.filter((p: any) => p.class === "cell phone").length;
-      ws?.send(JSON.stringify({ type: "object-detect", people, phones }));
+      recordSample(f => {
+        f.objects.t.push(Date.now());
+        f.objects.people.push(people);
+        f.objects.phones.push(phones);
+      });
       if (people > 1) alert(`Please be alone on camera. Detected ${people} people.`);
       if (phones > 0) alert(`Please put away your phone.`);
       setTimeout(loop, 500);
     };
     loop();
     return () => { stop = true; };
-  }, [detector, ws]);
+  }, [detector, recordSample]);
 
   // Tab-switch detection
   useEffect(() => {
     const onVis = () => {
       if (document.hidden) {
-        ws?.send(JSON.stringify({ type: "tab-switch", count: 1 }));
+        recordEvent("tab-switch");
         alert("Please stay on the interview page.");
       }
     };
     document.addEventListener("visibilitychange", onVis);
     return () => document.removeEventListener("visibilitychange", onVis);
-  }, [ws]);
+  }, [recordEvent]);
 
   // Not-looking warning
   useEffect(() => {
@@ -131,13 +195,13 @@ export function useProctoring(ws: WebSocket | null) {
       if (times.length < WINDOW_SIZE) return;
       const oldest = times[times.length - 1];
       if (Date.now() - oldest > GAZE_THRESHOLD_MS) {
-        ws?.send(JSON.stringify({ type: "not-looking" }));
+        recordEvent("not-looking");
         alert("Please look at the camera.");
         gazeTimes.current = [];
       }
     }, GAZE_THRESHOLD_MS);
     return () => clearInterval(iv);
-  }, [calibrated, ws]);
+  }, [calibrated, recordEvent]);
 
   // Calibration recorder
   const recordCalibration = () => {
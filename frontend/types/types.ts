@@ -4,7 +4,9 @@ export interface Resume {
     name:           string
     email:          string
     filename:       string
-    score:          number
+    score:          number | null      // null while only pre-screened
+    similarity?:    number | null
+    preScreened?:   boolean
     feedback?:      string
     interviewDone?: boolean
     sessionId?:     string
@@ -14,6 +16,8 @@ export interface Resume {
     jobId:         string
     description:   string
     createdAt:     string
+    resumeCount:   number
+    averageScore?: number | null
     scoredResumes: Resume[]
   }
   
\ No newline at end of file